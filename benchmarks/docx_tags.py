@@ -0,0 +1,113 @@
+"""Сравнение замены тегов в DOCX: прежний перебор ключей и однопроходный движок
+
+Запуск из корня проекта:
+    python -m benchmarks.docx_tags [--pages 50] [--tags 40] [--repeat 5]
+"""
+import argparse
+import copy
+import io
+import time
+from docx import Document
+from utils.docx_tags import find_tag_locations, replace_tags
+
+PARAGRAPHS_PER_PAGE = 12
+FILLER = 'Текст шаблона без тегов, который занимает место на странице документа. ' * 3
+
+
+def build_template(pages, tags):
+    """Шаблон на pages страниц с tags тегами; часть тегов разбита на несколько run"""
+    document = Document()
+    document.sections[0].header.paragraphs[0].text = 'Колонтитул {{TAG_0}}'
+    paragraphs = pages * PARAGRAPHS_PER_PAGE
+    step = max(paragraphs // tags, 1)
+    for index in range(paragraphs):
+        paragraph = document.add_paragraph(FILLER)
+        if index % step == 0:
+            tag = f'TAG_{index // step % tags}'
+            if index % (step * 3) == 0:
+                # Word часто разбивает тег на run при правке
+                paragraph.add_run('{{')
+                paragraph.add_run(tag[:3])
+                paragraph.add_run(tag[3:] + '}}')
+            else:
+                paragraph.add_run(f' {{{{{tag}}}}}')
+
+    table = document.add_table(rows=20, cols=4)
+    for row_index, row in enumerate(table.rows):
+        for cell_index, cell in enumerate(row.cells):
+            cell.text = f'{{{{TAG_{(row_index * 4 + cell_index) % tags}}}}}'
+    nested = table.cell(0, 0).add_table(rows=1, cols=1)
+    nested.cell(0, 0).text = '{{TAG_1}}'
+
+    buffer = io.BytesIO()
+    document.save(buffer)
+    return buffer.getvalue()
+
+
+def legacy_replace(document, data):
+    """Прежняя реализация DocumentGenerator._replace_tags_in_document"""
+    def replace_in_paragraph(paragraph):
+        for key, value in data.items():
+            tag = f"{{{{{key}}}}}"
+            if tag in paragraph.text:
+                for run in paragraph.runs:
+                    run.text = run.text.replace(tag, str(value))
+
+    for paragraph in document.paragraphs:
+        replace_in_paragraph(paragraph)
+    for table in document.tables:
+        for row in table.rows:
+            for cell in row.cells:
+                for paragraph in cell.paragraphs:
+                    replace_in_paragraph(paragraph)
+
+
+def remaining_tags(document):
+    text = [paragraph.text for paragraph in document.paragraphs]
+    text.append(document.sections[0].header.paragraphs[0].text)
+    for table in document.tables:
+        for row in table.rows:
+            for cell in row.cells:
+                text.append(cell.text)
+    return sum(part.count('{{') for part in text)
+
+
+def measure(label, content, repeat, replace):
+    timings = []
+    document = None
+    for _ in range(repeat):
+        document = Document(io.BytesIO(content))
+        started = time.perf_counter()
+        replace(document)
+        timings.append(time.perf_counter() - started)
+    best = min(timings) * 1000
+    print(f'{label:<28} {best:9.1f} мс   осталось тегов: {remaining_tags(document)}')
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--pages', type=int, default=50)
+    parser.add_argument('--tags', type=int, default=40)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    content = build_template(args.pages, args.tags)
+    data = {f'TAG_{index}': f'значение {index}' for index in range(args.tags)}
+    print(f'Шаблон: {args.pages} стр., {args.tags} тегов, {len(content) // 1024} КБ')
+
+    legacy = measure('Перебор ключей', content, args.repeat,
+                     lambda document: legacy_replace(document, data))
+    single = measure('Один проход', content, args.repeat,
+                     lambda document: replace_tags(document, data))
+
+    # Места тегов ищутся один раз при разборе шаблона (кэш шаблонов)
+    locations = find_tag_locations(copy.deepcopy(Document(io.BytesIO(content))))
+    indexed = measure('Один проход + места тегов', content, args.repeat,
+                      lambda document: replace_tags(document, data, locations))
+
+    print(f'Ускорение: {legacy / single:.1f}x, с местами тегов {legacy / indexed:.1f}x')
+
+
+if __name__ == '__main__':
+    main()
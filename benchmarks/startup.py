@@ -0,0 +1,76 @@
+"""Холодный запуск: импорт приложения и create_app() в новом процессе
+
+Запуск из корня проекта:
+    python -m benchmarks.startup [--repeat 10] [--top 15]
+"""
+import argparse
+import json
+import os
+import re
+import statistics
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Библиотеки, которые должны загружаться при первом использовании, а не при запуске
+HEAVY_MODULES = ('docx', 'openpyxl', 'PIL.Image', 'dateutil.relativedelta')
+
+PROBE = '''
+import json, sys, time
+started = time.perf_counter()
+{statement}
+elapsed = time.perf_counter() - started
+print(json.dumps({{'ms': elapsed * 1000,
+                  'heavy': [name for name in {heavy!r} if name in sys.modules]}}))
+'''
+
+SCENARIOS = (
+    ('Приложение: create_app()', 'from app import create_app\ncreate_app()'),
+    ('Только тяжелые библиотеки', '\n'.join(f'import {name}' for name in HEAVY_MODULES)),
+)
+
+IMPORT_TIME_LINE = re.compile(r'import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)')
+
+
+def run_probe(statement):
+    code = PROBE.format(statement=statement, heavy=HEAVY_MODULES)
+    result = subprocess.run([sys.executable, '-c', code], cwd=ROOT,
+                            capture_output=True, text=True, check=True)
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def slowest_imports(top):
+    """Модули с наибольшим собственным временем импорта (python -X importtime)"""
+    result = subprocess.run([sys.executable, '-X', 'importtime', '-c',
+                             'from app import create_app\ncreate_app()'],
+                            cwd=ROOT, capture_output=True, text=True, check=True)
+    modules = [(int(match.group(1)), int(match.group(2)), match.group(4))
+               for match in map(IMPORT_TIME_LINE.match, result.stderr.splitlines()) if match]
+    return sorted(modules, reverse=True)[:top]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--repeat', type=int, default=10)
+    parser.add_argument('--top', type=int, default=15, help='Самые медленные модули; 0 - не выводить')
+    args = parser.parse_args()
+
+    for label, statement in SCENARIOS:
+        runs = [run_probe(statement) for _ in range(args.repeat)]
+        timings = [run['ms'] for run in runs]
+        print(f'{label:<28} медиана {statistics.median(timings):7.1f} мс   '
+              f'минимум {min(timings):7.1f} мс')
+    loaded = run_probe(SCENARIOS[0][1])['heavy']
+    print('Загружены при запуске: ' + (', '.join(loaded) if loaded else 'нет'))
+
+    if args.top:
+        print(f'\n{"собств., мс":>11} {"всего, мс":>10}  модуль')
+        for self_us, cumulative_us, name in slowest_imports(args.top):
+            print(f'{self_us / 1000:11.1f} {cumulative_us / 1000:10.1f}  {name}')
+    if loaded:
+        raise SystemExit(1)
+
+
+if __name__ == '__main__':
+    main()
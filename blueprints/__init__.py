@@ -0,0 +1,21 @@
+from blueprints import api, dispatcher, employees, head_of_department, main, mechanic, \
+    safety_department, storekeeper, transport
+
+# Разделы приложения: кабинеты, справочники сотрудников и транспорта, API.
+# Имя точки входа в url_for - '<раздел>.<функция>', например 'employees.employee_card'
+BLUEPRINTS = [
+    main.bp,
+    employees.bp,
+    transport.bp,
+    head_of_department.bp,
+    dispatcher.bp,
+    safety_department.bp,
+    storekeeper.bp,
+    mechanic.bp,
+    api.bp,
+]
+
+
+def register_blueprints(app):
+    for blueprint in BLUEPRINTS:
+        app.register_blueprint(blueprint)
@@ -0,0 +1,435 @@
+from database.models import *
+from flask import Blueprint, request, url_for, jsonify
+from database import db
+from database.db_utils import DBUtils
+from database.dictionary_cache import dictionary_cache
+from database.projections import DICTIONARY_PROJECTIONS, EMPLOYEE_SEARCH, VEHICLE_SEARCH
+from datetime import datetime
+from utils.http_cache import conditional_json
+from utils.template_cache import template_cache
+
+bp = Blueprint('api', __name__)
+
+
+def dictionary_json(name, active=True):
+    """Ответ GET /api/<справочник> с ETag; ?fields=id,name - только перечисленные поля"""
+    projection = DICTIONARY_PROJECTIONS[name]
+    try:
+        fields = projection.parse_fields(request.args.get('fields'))
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+
+    rows = dictionary_cache.get_active(name) if active else dictionary_cache.get(name)
+    etag = dictionary_cache.etag(name)
+    if request.args.get('fields'):
+        etag = f"{etag}-{'+'.join(fields)}"
+    # При ответе 304 список не сериализуется
+    return conditional_json(etag, lambda: projection.serialize_mappings(fields, rows))
+
+# ========== API ДЛЯ СОГЛАСУЮЩИХ ЛИЦ ==========
+
+
+@bp.route('/api/agreement_persons', methods=['GET', 'POST'])
+def api_agreement_persons():
+    if request.method == 'POST':
+        data = request.get_json()
+        new_person = AgreementPerson(
+            full_name=data['full_name'],
+            organization=data.get('organization', ''),
+            position=data.get('position', ''),
+            phone=data.get('phone', ''),
+            email=data.get('email', '')
+        )
+        db.session.add(new_person)
+        db.session.commit()
+        return jsonify({
+            'id': new_person.id,
+            'full_name': new_person.full_name,
+            'organization': new_person.organization,
+            'position': new_person.position,
+            'phone': new_person.phone,
+            'email': new_person.email
+        })
+
+    return dictionary_json('agreement_persons')
+
+
+@bp.route('/api/agreement_persons/<int:person_id>', methods=['DELETE'])
+def api_delete_agreement_person(person_id):
+    person = AgreementPerson.query.get_or_404(person_id)
+    try:
+        # Проверяем использование
+        pass_requests_count = PassRequest.query.filter_by(
+            agreement_person_id=person_id).count()
+        if pass_requests_count > 0:
+            return jsonify({
+                'success': False,
+                'error': f'Это согласующее лицо используется в {pass_requests_count} заявках'
+            }), 400
+
+        person.is_active = False
+        db.session.commit()
+        return jsonify({'success': True})
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({'success': False, 'error': str(e)}), 500
+
+# ========== API ДЛЯ ПОСТОВ ==========
+
+
+@bp.route('/api/posts', methods=['GET', 'POST'])
+def api_posts():
+    if request.method == 'POST':
+        data = request.get_json()
+        new_post = Post(
+            name=data['name'],
+            description=data.get('description', '')
+        )
+        db.session.add(new_post)
+        db.session.commit()
+        return jsonify({
+            'id': new_post.id,
+            'name': new_post.name,
+            'description': new_post.description
+        })
+
+    return dictionary_json('posts')
+
+
+@bp.route('/api/posts/<int:post_id>', methods=['DELETE'])
+def api_delete_post(post_id):
+    post = Post.query.get_or_404(post_id)
+    try:
+        # Проверяем, используется ли этот пост в заявках
+        pass_requests_count = db.session.query(db.func.count()).select_from(
+            pass_request_posts).filter(pass_request_posts.c.post_id == post_id).scalar()
+
+        if pass_requests_count > 0:
+            return jsonify({
+                'success': False,
+                'error': f'Этот пост используется в {pass_requests_count} заявках'
+            }), 400
+
+        # Мягкое удаление
+        post.is_active = False
+        db.session.commit()
+        return jsonify({'success': True})
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({'success': False, 'error': str(e)}), 500
+
+# ========== API ДЛЯ ДОГОВОРОВ ==========
+
+
+@bp.route('/api/contracts', methods=['GET', 'POST'])
+def api_contracts():
+    if request.method == 'POST':
+        data = request.get_json()
+        new_contract = Contract(
+            number=data['number'],
+            name=data.get('name', ''),
+            start_date=datetime.strptime(
+                data['start_date'], '%Y-%m-%d').date(),
+            end_date=datetime.strptime(
+                data['end_date'], '%Y-%m-%d').date() if data.get('end_date') else None,
+            customer=data.get('customer', '')
+        )
+        db.session.add(new_contract)
+        db.session.commit()
+        return jsonify({
+            'id': new_contract.id,
+            'number': new_contract.number,
+            'name': new_contract.name,
+            'start_date': new_contract.start_date.strftime('%Y-%m-%d'),
+            'end_date': new_contract.end_date.strftime('%Y-%m-%d') if new_contract.end_date else None,
+            'customer': new_contract.customer
+        })
+
+    return dictionary_json('contracts')
+
+
+@bp.route('/api/contracts/<int:contract_id>', methods=['DELETE'])
+def api_delete_contract(contract_id):
+    contract = Contract.query.get_or_404(contract_id)
+    try:
+        # Проверяем использование
+        pass_requests_count = PassRequest.query.filter_by(
+            contract_id=contract_id).count()
+        shift_requests_count = ShiftRequest.query.filter_by(
+            contract_id=contract_id).count()
+        total_count = pass_requests_count + shift_requests_count
+
+        if total_count > 0:
+            return jsonify({
+                'success': False,
+                'error': f'Этот договор используется в {total_count} заявках'
+            }), 400
+
+        contract.is_active = False
+        db.session.commit()
+        return jsonify({'success': True})
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({'success': False, 'error': str(e)}), 500
+
+# ========== API ДЛЯ ИНН ==========
+
+
+@bp.route('/api/inns', methods=['GET', 'POST'])
+def api_inns():
+    if request.method == 'POST':
+        data = request.get_json()
+        new_inn = OrganizationINN(
+            inn=data['inn'],
+            organization_name=data['organization_name'],
+            contact_person=data.get('contact_person', ''),
+            phone=data.get('phone', ''),
+            email=data.get('email', '')
+        )
+        db.session.add(new_inn)
+        db.session.commit()
+        return jsonify({
+            'id': new_inn.id,
+            'inn': new_inn.inn,
+            'organization_name': new_inn.organization_name,
+            'contact_person': new_inn.contact_person,
+            'phone': new_inn.phone,
+            'email': new_inn.email
+        })
+
+    return dictionary_json('inns')
+
+
+@bp.route('/api/inns/<int:inn_id>', methods=['DELETE'])
+def api_delete_inn(inn_id):
+    inn = OrganizationINN.query.get_or_404(inn_id)
+    try:
+        # Проверяем использование
+        pass_requests_count = PassRequest.query.filter_by(
+            inn_id=inn_id).count()
+        if pass_requests_count > 0:
+            return jsonify({
+                'success': False,
+                'error': f'Этот ИНН используется в {pass_requests_count} заявках'
+            }), 400
+
+        inn.is_active = False
+        db.session.commit()
+        return jsonify({'success': True})
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({'success': False, 'error': str(e)}), 500
+
+# ========== API ДЛЯ ТРАНСПОРТА ==========
+
+
+@bp.route('/api/vehicle_types', methods=['GET', 'POST'])
+def api_vehicle_types():
+    if request.method == 'POST':
+        data = request.get_json()
+        new_type = VehicleType(name=data['name'])
+        db.session.add(new_type)
+        db.session.commit()
+        return jsonify({'id': new_type.id, 'name': new_type.name})
+
+    return dictionary_json('vehicle_types', active=False)
+
+
+@bp.route('/api/vehicle_types/<int:type_id>', methods=['DELETE'])
+def api_delete_vehicle_type(type_id):
+    vehicle_type = VehicleType.query.get_or_404(type_id)
+    try:
+        # Проверяем, используется ли этот тип транспорта
+        vehicles_count = Vehicle.query.filter_by(
+            vehicle_type_id=type_id).count()
+        if vehicles_count > 0:
+            return jsonify({'success': False, 'error': f'Этот тип транспорта используется в {vehicles_count} транспортных средствах'}), 400
+
+        db.session.delete(vehicle_type)
+        db.session.commit()
+        return jsonify({'success': True})
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({'success': False, 'error': str(e)}), 500
+
+
+@bp.route('/api/vehicle_categories', methods=['GET', 'POST'])
+def api_vehicle_categories():
+    if request.method == 'POST':
+        data = request.get_json()
+        new_category = VehicleCategory(name=data['name'])
+        db.session.add(new_category)
+        db.session.commit()
+        return jsonify({'id': new_category.id, 'name': new_category.name})
+
+    return dictionary_json('vehicle_categories', active=False)
+
+
+@bp.route('/api/vehicle_categories/<int:category_id>', methods=['DELETE'])
+def api_delete_vehicle_category(category_id):
+    category = VehicleCategory.query.get_or_404(category_id)
+    try:
+        # Проверяем, используется ли эта категория
+        vehicles_count = Vehicle.query.filter_by(
+            vehicle_category_id=category_id).count()
+        if vehicles_count > 0:
+            return jsonify({'success': False, 'error': f'Эта категория используется в {vehicles_count} транспортных средствах'}), 400
+
+        db.session.delete(category)
+        db.session.commit()
+        return jsonify({'success': True})
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({'success': False, 'error': str(e)}), 500
+
+
+# ========== API ДЛЯ ТИПОВ ТРАНСПОРТА ==========
+# @bp.route('/api/vehicle_types/<int:type_id>', methods=['DELETE'])
+# def api_delete_vehicle_type(type_id):
+#     vehicle_type = VehicleType.query.get_or_404(type_id)
+#     try:
+#         # Проверяем, используется ли этот тип транспорта
+#         vehicles_count = Vehicle.query.filter_by(vehicle_type_id=type_id).count()
+#         if vehicles_count > 0:
+#             return jsonify({'success': False, 'error': f'Этот тип транспорта используется в {vehicles_count} транспортных средствах'}), 400
+
+#         db.session.delete(vehicle_type)
+#         db.session.commit()
+#         return jsonify({'success': True})
+#     except Exception as e:
+#         db.session.rollback()
+#         return jsonify({'success': False, 'error': str(e)}), 500
+# ========== API ДЛЯ СПРАВОЧНИКОВ (дополняем) ==========
+
+@bp.route('/api/cities', methods=['GET', 'POST'])
+def api_cities():
+    if request.method == 'POST':
+        data = request.get_json()
+        new_city = City(name=data['name'])
+        db.session.add(new_city)
+        db.session.commit()
+        return jsonify({'id': new_city.id, 'name': new_city.name})
+
+    return dictionary_json('cities', active=False)
+
+
+@bp.route('/api/cities/<int:city_id>', methods=['DELETE'])
+def api_delete_city(city_id):
+    city = City.query.get_or_404(city_id)
+    db.session.delete(city)
+    db.session.commit()
+    return jsonify({'success': True})
+
+
+@bp.route('/api/positions/<int:position_id>', methods=['DELETE'])
+def api_delete_position(position_id):
+    position = Position.query.get_or_404(position_id)
+    db.session.delete(position)
+    db.session.commit()
+    return jsonify({'success': True})
+
+# ========== API ДЛЯ СПРАВОЧНИКОВ ==========
+
+
+@bp.route('/api/departments', methods=['GET', 'POST'])
+def api_departments():
+    if request.method == 'POST':
+        data = request.get_json()
+        new_dept = Department(name=data['name'])
+        db.session.add(new_dept)
+        db.session.commit()
+        return jsonify({'id': new_dept.id, 'name': new_dept.name})
+
+    return dictionary_json('departments', active=False)
+
+
+@bp.route('/api/departments/<int:dept_id>', methods=['DELETE'])
+def api_delete_department(dept_id):
+    department = Department.query.get_or_404(dept_id)
+    db.session.delete(department)
+    db.session.commit()
+    return jsonify({'success': True})
+
+
+@bp.route('/api/positions', methods=['GET', 'POST'])
+def api_positions():
+    if request.method == 'POST':
+        data = request.get_json()
+        new_position = Position(name=data['name'])
+        db.session.add(new_position)
+        db.session.commit()
+        return jsonify({'id': new_position.id, 'name': new_position.name})
+
+    return dictionary_json('positions', active=False)
+
+# @bp.route('/api/vehicle_types', methods=['GET', 'POST'])
+# def api_vehicle_types():
+#     if request.method == 'POST':
+#         data = request.get_json()
+#         new_type = VehicleType(name=data['name'])
+#         db.session.add(new_type)
+#         db.session.commit()
+#         return jsonify({'id': new_type.id, 'name': new_type.name})
+
+#     types = VehicleType.query.all()
+#     return jsonify([{'id': t.id, 'name': t.name} for t in types])
+
+
+SEARCH_PAGE_LIMIT = 50
+
+
+def search_page(search, projection):
+    """Страница подсказок при вводе: ?q=...&offset=0&limit=10&fields=id,text
+
+    Без q - страница всех записей по алфавиту.
+
+    Ответ - {'items': [{id, text, hint}], 'next_offset': смещение следующей
+    страницы или null}; лишняя запись запрашивается, чтобы знать, есть ли еще.
+    """
+    try:
+        fields = projection.parse_fields(request.args.get('fields'))
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    query = request.args.get('q', '').strip()
+    offset = max(request.args.get('offset', 0, type=int), 0)
+    limit = min(max(request.args.get('limit', 10, type=int), 1), SEARCH_PAGE_LIMIT)
+    rows = search(projection.select(fields), query, limit + 1, offset)
+    return jsonify({
+        'items': projection.serialize(fields, rows[:limit]),
+        'next_offset': offset + limit if len(rows) > limit else None
+    })
+
+
+@bp.route('/api/employees/search')
+def api_employees_search():
+    return search_page(DBUtils.search_employees, EMPLOYEE_SEARCH)
+
+
+@bp.route('/api/vehicles/search')
+def api_vehicles_search():
+    return search_page(DBUtils.search_vehicles, VEHICLE_SEARCH)
+
+# ========== ФОРМИРОВАНИЕ ДОКУМЕНТОВ ==========
+
+
+def document_job_to_dict(job):
+    return {
+        'id': job.id,
+        'kind': job.kind,
+        'object_id': job.object_id,
+        'status': job.status,
+        'error': job.error,
+        'download_url': url_for('main.storage_files', filename=job.result_path) if job.result_path else None
+    }
+
+
+@bp.route('/api/document_jobs/<int:job_id>')
+def api_document_job(job_id):
+    job = DocumentJob.query.get_or_404(job_id)
+    return jsonify(document_job_to_dict(job))
+
+
+@bp.route('/api/template_cache/stats')
+def api_template_cache_stats():
+    """Попадания и промахи кэша шаблонов текущего процесса"""
+    return jsonify(template_cache.stats())
@@ -0,0 +1,97 @@
+from database.models import *
+from flask import Blueprint, render_template, request, redirect, url_for, flash, jsonify
+from database import db
+from database.db_utils import DBUtils
+from database.projections import DRIVER_LIST
+from datetime import datetime, date
+from blueprints.helpers import parse_date_arg, missing_ids_message
+
+bp = Blueprint('dispatcher', __name__)
+
+
+# ========== КАБИНЕТ ДИСПЕТЧЕРА ==========
+
+
+@bp.route('/dispatcher')
+def dispatcher_index():
+    return render_template('dispatcher/index.html', current_time=datetime.now())
+
+
+@bp.route('/dispatcher/daily_requests')
+def daily_requests_list():
+    requests = DailyRequest.query.order_by(DailyRequest.date.desc()).all()
+    return render_template('dispatcher/daily_requests.html', requests=requests, current_time=datetime.now())
+
+
+@bp.route('/dispatcher/daily_requests/create', methods=['POST'])
+def create_daily_request():
+    try:
+        shift_type = request.form.get('shift_type')
+        request_date = datetime.strptime(
+            request.form['request_date'], '%Y-%m-%d').date()
+
+        # Собираем данные по технике из формы
+        vehicles_data = []
+        vehicle_count = int(request.form.get('vehicle_count', 0))
+
+        for i in range(1, vehicle_count + 1):
+            vehicle_type = request.form.get(f'vehicle_type_{i}')
+            driver_id = request.form.get(f'vehicle_driver_{i}')
+
+            if vehicle_type and driver_id:
+                vehicles_data.append({
+                    'vehicle_type': vehicle_type,
+                    'driver_id': driver_id,
+                    'shifts_count': request.form.get(f'shifts_count_{i}', 0)
+                })
+
+        # Водители всех строк проверяются одним запросом
+        _, missing = DBUtils.load_by_ids(
+            Employee, [vehicle['driver_id'] for vehicle in vehicles_data])
+        error = missing_ids_message([('водители', missing)])
+        if error:
+            raise ValueError(error)
+        for vehicle in vehicles_data:
+            vehicle['driver_id'] = int(vehicle['driver_id'])
+
+        daily_request = DailyRequest(
+            date=request_date,
+            shift_type=shift_type,
+            vehicles_data=vehicles_data
+        )
+        # Журнал смен для быстрого подсчета по водителям
+        daily_request.assignments = [
+            DailyRequestAssignment(
+                date=request_date,
+                shift_type=shift_type,
+                driver_id=vehicle['driver_id'],
+                vehicle_type=vehicle['vehicle_type']
+            ) for vehicle in vehicles_data
+        ]
+
+        db.session.add(daily_request)
+        db.session.commit()
+        flash('Суточная заявка успешно создана', 'success')
+
+    except Exception as e:
+        db.session.rollback()
+        flash(f'Ошибка при создании заявки: {str(e)}', 'error')
+
+    return redirect(url_for('dispatcher.daily_requests_list'))
+
+
+@bp.route('/api/dispatcher/drivers')
+def api_dispatcher_drivers():
+    """Водители с количеством смен за последние 7 дней"""
+    on_date = parse_date_arg('date') or date.today()
+    fields = list(DRIVER_LIST.fields)
+    rows = db.session.execute(
+        DRIVER_LIST.select(fields).where(Employee.has_driver_license.is_(True))
+        .order_by(Employee.last_name, Employee.id)
+    ).all()
+    shifts = DBUtils.get_drivers_shifts_counts(on_date)
+
+    result = DRIVER_LIST.serialize(fields, rows)
+    for driver in result:
+        driver['shifts'] = shifts.get(driver['id'], 0)
+    return jsonify(result)
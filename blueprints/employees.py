@@ -0,0 +1,404 @@
+from database.models import *
+from flask import Blueprint, render_template, request, redirect, url_for, flash, current_app
+from database import db
+from database.db_utils import DBUtils
+from database.dictionary_cache import dictionary_cache
+from database.loaders import with_profile
+from database.projections import EMPLOYEE_EXPORT
+import os
+from datetime import datetime
+from werkzeug.utils import secure_filename
+from utils.file_handlers import file_handler
+from utils.validators import Validators, ValidationResult
+from blueprints.helpers import parse_date_arg, import_page, export_response
+
+bp = Blueprint('employees', __name__)
+
+
+# ========== ДОКУМЕНТЫ СОТРУДНИКА ==========
+
+
+@bp.route('/employees/<int:employee_id>/documents')
+def employee_documents(employee_id):
+    employee = Employee.query.get_or_404(employee_id)
+    # Здесь будет логика для получения документов сотрудника
+    return render_template('employees/documents.html', employee=employee, current_time=datetime.now())
+
+
+@bp.route('/employees/<int:employee_id>/documents/upload', methods=['POST'])
+def upload_employee_document(employee_id):
+    try:
+        if 'document' in request.files:
+            document_file = request.files['document']
+            if document_file.filename:
+                # Сохранение документа
+                filename = secure_filename(document_file.filename)
+                file_path = f"documents/employee_{employee_id}_{datetime.now().strftime('%Y%m%d_%H%M%S')}_{filename}"
+                document_file.save(os.path.join(
+                    current_app.config['UPLOAD_FOLDER'], file_path))
+
+                # Здесь можно создать запись в таблице документов
+                flash('Документ успешно загружен', 'success')
+    except Exception as e:
+        flash(f'Ошибка при загрузке документа: {str(e)}', 'error')
+
+    return redirect(url_for('employees.employee_documents', employee_id=employee_id))
+
+# ========== ПРОПУСКИ СОТРУДНИКА ==========
+
+
+@bp.route('/employees/<int:employee_id>/passes')
+def employee_passes(employee_id):
+    employee = Employee.query.get_or_404(employee_id)
+    # Заявки на пропуск, в которые включен сотрудник (поиск по индексу связей)
+    pass_requests = employee.pass_requests.order_by(
+        PassRequest.created_at.desc()).all()
+    return render_template('employees/passes.html', employee=employee,
+                           pass_requests=pass_requests, current_time=datetime.now())
+
+# ========== СОТРУДНИКИ ==========
+
+@bp.route('/employees')
+def employees_list():
+    # Фильтры сохраняются в ссылках пагинации
+    filters = {
+        'department_id': request.args.get('department_id', type=int),
+        'position_id': request.args.get('position_id', type=int),
+        'pass_expiry_from': request.args.get('pass_expiry_from', ''),
+        'pass_expiry_to': request.args.get('pass_expiry_to', ''),
+        'q': request.args.get('q', '').strip(),
+        'order': 'desc' if request.args.get('order') == 'desc' else 'asc'
+    }
+    filters = {key: value for key, value in filters.items() if value}
+
+    page = DBUtils.get_employees_page(
+        department_id=filters.get('department_id'),
+        position_id=filters.get('position_id'),
+        pass_expiry_from=parse_date_arg('pass_expiry_from'),
+        pass_expiry_to=parse_date_arg('pass_expiry_to'),
+        search=filters.get('q'),
+        cursor=request.args.get('cursor'),
+        direction=request.args.get('direction', 'next'),
+        order=filters.get('order', 'asc')
+    )
+
+    departments = dictionary_cache.get('departments')
+    positions = dictionary_cache.get('positions')
+    return render_template('employees/list.html',
+                           employees=page['employees'],
+                           next_cursor=page['next_cursor'],
+                           prev_cursor=page['prev_cursor'],
+                           filters=filters,
+                           departments=departments,
+                           positions=positions,
+                           current_time=datetime.now())
+
+
+@bp.route('/employees/add', methods=['GET', 'POST'])
+def employee_add():
+    if request.method == 'POST':
+        try:
+            # Валидация данных
+            validator = ValidationResult()
+
+            # Проверка обязательных полей
+            required_fields = {
+                'last_name': 'Фамилия',
+                'first_name': 'Имя'
+            }
+
+            for field, name in required_fields.items():
+                error = Validators.validate_required(
+                    request.form.get(field), name)
+                if error:
+                    validator.add_error(field, error)
+
+            # Валидация email
+            if request.form.get('email'):
+                error = Validators.validate_email(request.form['email'])
+                if error:
+                    validator.add_error('email', error)
+
+            # Валидация телефона
+            if request.form.get('phone'):
+                error = Validators.validate_phone(request.form['phone'])
+                if error:
+                    validator.add_error('phone', error)
+
+            if validator.has_errors():
+                for field, error in validator.errors.items():
+                    flash(f'{error}', 'error')
+                return render_template('employees/add_edit.html',
+                                       departments=dictionary_cache.get('departments'),
+                                       positions=dictionary_cache.get('positions'),
+                                       cities=dictionary_cache.get('cities'),
+                                       current_time=datetime.now())
+
+            employee = Employee(
+                last_name=request.form['last_name'],
+                first_name=request.form['first_name'],
+                middle_name=request.form.get('middle_name'),
+                gender=request.form.get('gender'),
+                birth_date=datetime.strptime(
+                    request.form['birth_date'], '%Y-%m-%d').date() if request.form.get('birth_date') else None,
+                department_id=request.form.get('department_id', type=int),
+                position_id=request.form.get('position_id', type=int),
+                passport_series=request.form.get('passport_series'),
+                passport_number=request.form.get('passport_number'),
+                phone=request.form.get('phone'),
+                email=request.form.get('email'),
+                city_id=request.form.get('city_id', type=int),
+                has_driver_license=bool(
+                    request.form.get('has_driver_license')),
+                license_categories=','.join(
+                    request.form.getlist('license_categories')),
+                pass_number=request.form.get('pass_number'),
+                pass_expiry=datetime.strptime(
+                    request.form['pass_expiry'], '%Y-%m-%d').date() if request.form.get('pass_expiry') else None,
+                clothing_size=request.form.get('clothing_size'),
+                shoe_size=request.form.get('shoe_size'),
+                height=request.form.get('height')
+            )
+
+            # Обработка фото
+            if 'photo' in request.files:
+                photo = request.files['photo']
+                if photo.filename:
+                    # Валидация файла
+                    error = Validators.validate_file_extension(
+                        photo.filename, ['jpg', 'jpeg', 'png', 'gif'])
+                    if error:
+                        flash(error, 'error')
+                    else:
+                        photo_path = file_handler.save_employee_photo(photo)
+                        if photo_path:
+                            employee.photo_path = photo_path
+
+            db.session.add(employee)
+            db.session.commit()
+            flash('Сотрудник успешно добавлен', 'success')
+            return redirect(url_for('employees.employees_list'))
+
+        except Exception as e:
+            db.session.rollback()
+            flash(f'Ошибка при добавлении сотрудника: {str(e)}', 'error')
+
+    departments = dictionary_cache.get('departments')
+    positions = dictionary_cache.get('positions')
+    cities = dictionary_cache.get('cities')
+    return render_template('employees/add_edit.html',
+                           departments=departments,
+                           positions=positions,
+                           cities=cities, current_time=datetime.now())
+
+
+@bp.route('/employees/export')
+def employees_export():
+    # Те же фильтры, что и в списке сотрудников
+    conditions = DBUtils.employee_filters(
+        department_id=request.args.get('department_id', type=int),
+        position_id=request.args.get('position_id', type=int),
+        pass_expiry_from=parse_date_arg('pass_expiry_from'),
+        pass_expiry_to=parse_date_arg('pass_expiry_to'),
+        search=request.args.get('q', '').strip()
+    )
+    return export_response(
+        EMPLOYEE_EXPORT,
+        lambda statement: statement.where(*conditions).order_by(Employee.last_name, Employee.id),
+        'Сотрудники', 'employees')
+
+
+@bp.route('/employees/import', methods=['GET', 'POST'])
+def employees_import():
+    return import_page('employee', 'Загрузка сотрудников', 'employees.employees_list')
+
+
+@bp.route('/employees/<int:employee_id>')
+def employee_card(employee_id):
+    employee = with_profile(Employee.query, 'employee_card').filter_by(
+        id=employee_id).first_or_404()
+    return render_template('employees/card.html', employee=employee, current_time=datetime.now())
+
+# @bp.route('/employees/<int:employee_id>/edit', methods=['GET', 'POST'])
+# def employee_edit(employee_id):
+#     employee = Employee.query.get_or_404(employee_id)
+
+#     if request.method == 'POST':
+#         try:
+#             # Обновляем все поля
+#             employee.last_name = request.form['last_name']
+#             employee.first_name = request.form['first_name']
+#             employee.middle_name = request.form.get('middle_name')
+#             employee.gender = request.form.get('gender')
+#             employee.birth_date = datetime.strptime(request.form['birth_date'], '%Y-%m-%d').date() if request.form.get('birth_date') else None
+#             employee.department_id = request.form.get('department_id')
+#             employee.position_id = request.form.get('position_id')
+#             employee.passport_series = request.form.get('passport_series')
+#             employee.passport_number = request.form.get('passport_number')
+#             employee.phone = request.form.get('phone')
+#             employee.email = request.form.get('email')
+#             employee.city_id = request.form.get('city_id')
+#             employee.has_driver_license = bool(request.form.get('has_driver_license'))
+#             employee.license_categories = ','.join(request.form.getlist('license_categories'))
+#             employee.pass_number = request.form.get('pass_number')
+#             employee.pass_expiry = datetime.strptime(request.form['pass_expiry'], '%Y-%m-%d').date() if request.form.get('pass_expiry') else None
+#             employee.medical_exam_expiry = datetime.strptime(request.form['medical_exam_expiry'], '%Y-%m-%d').date() if request.form.get('medical_exam_expiry') else None
+#             employee.medical_exam_not_required = bool(request.form.get('medical_exam_not_required'))
+#             employee.psychiatric_exam_expiry = datetime.strptime(request.form['psychiatric_exam_expiry'], '%Y-%m-%d').date() if request.form.get('psychiatric_exam_expiry') else None
+#             employee.psychiatric_exam_not_required = bool(request.form.get('psychiatric_exam_not_required'))
+#             employee.clothing_size = request.form.get('clothing_size')
+#             employee.shoe_size = request.form.get('shoe_size')
+#             employee.height = request.form.get('height')
+#             employee.updated_at = datetime.utcnow()
+
+#             # Обработка фото
+#             if 'photo' in request.files:
+#                 photo = request.files['photo']
+#                 if photo.filename:
+#                     # Сохраняем новое фото (здесь нужно добавить логику сохранения файла)
+#                     pass
+
+#             db.session.commit()
+#             flash('Данные сотрудника успешно обновлены', 'success')
+#             return redirect(url_for('employees.employee_card', employee_id=employee.id))
+
+#         except Exception as e:
+#             db.session.rollback()
+#             flash(f'Ошибка при обновлении данных сотрудника: {str(e)}', 'error')
+
+#     departments = Department.query.all()
+#     positions = Position.query.all()
+#     cities = City.query.all()
+#     return render_template('employees/add_edit.html',
+#                          employee=employee,
+#                          departments=departments,
+#                          positions=positions,
+#                          cities=cities, current_time=datetime.now())
+
+# @bp.route('/employees/<int:employee_id>/delete', methods=['POST'])
+# def employee_delete(employee_id):
+#     employee = Employee.query.get_or_404(employee_id)
+#     try:
+#         # Удаляем фото если есть
+#         if employee.photo_path:
+#             file_handler.delete_file(os.path.join(current_app.config['UPLOAD_FOLDER'], employee.photo_path))
+
+#         db.session.delete(employee)
+#         db.session.commit()
+#         flash('Сотрудник успешно удален', 'success')
+#     except Exception as e:
+#         db.session.rollback()
+#         flash(f'Ошибка при удалении сотрудника: {str(e)}', 'error')
+
+#     return redirect(url_for('employees.employees_list'))
+
+# ========== СОТРУДНИКИ (дополняем маршруты) ==========
+
+
+@bp.route('/employees/<int:employee_id>/edit', methods=['GET', 'POST'])
+def employee_edit(employee_id):
+    employee = Employee.query.get_or_404(employee_id)
+
+    if request.method == 'POST':
+        try:
+            # Обновляем все поля сотрудника
+            employee.last_name = request.form['last_name']
+            employee.first_name = request.form['first_name']
+            employee.middle_name = request.form.get('middle_name')
+            employee.gender = request.form.get('gender')
+
+            # Обработка даты рождения
+            birth_date = request.form.get('birth_date')
+            employee.birth_date = datetime.strptime(
+                birth_date, '%Y-%m-%d').date() if birth_date else None
+
+            employee.department_id = request.form.get('department_id', type=int)
+            employee.position_id = request.form.get('position_id', type=int)
+            employee.passport_series = request.form.get('passport_series')
+            employee.passport_number = request.form.get('passport_number')
+            employee.phone = request.form.get('phone')
+            employee.email = request.form.get('email')
+            employee.city_id = request.form.get('city_id', type=int)
+            employee.has_driver_license = bool(
+                request.form.get('has_driver_license'))
+
+            # Обработка категорий прав
+            license_categories = request.form.getlist('license_categories')
+            employee.license_categories = ','.join(
+                license_categories) if license_categories else None
+
+            employee.pass_number = request.form.get('pass_number')
+
+            # Обработка даты окончания допуска
+            pass_expiry = request.form.get('pass_expiry')
+            employee.pass_expiry = datetime.strptime(
+                pass_expiry, '%Y-%m-%d').date() if pass_expiry else None
+
+            # Обработка медосмотров
+            medical_exam_expiry = request.form.get('medical_exam_expiry')
+            employee.medical_exam_expiry = datetime.strptime(
+                medical_exam_expiry, '%Y-%m-%d').date() if medical_exam_expiry else None
+            employee.medical_exam_not_required = bool(
+                request.form.get('medical_exam_not_required'))
+
+            # Обработка психиатрического освидетельствования
+            psychiatric_exam_expiry = request.form.get(
+                'psychiatric_exam_expiry')
+            employee.psychiatric_exam_expiry = datetime.strptime(
+                psychiatric_exam_expiry, '%Y-%m-%d').date() if psychiatric_exam_expiry else None
+            employee.psychiatric_exam_not_required = bool(
+                request.form.get('psychiatric_exam_not_required'))
+
+            employee.clothing_size = request.form.get('clothing_size')
+            employee.shoe_size = request.form.get('shoe_size')
+            employee.height = request.form.get('height')
+            employee.updated_at = datetime.utcnow()
+
+            # Обработка фото
+            if 'photo' in request.files:
+                photo = request.files['photo']
+                if photo.filename:
+                    # Сохраняем новое фото
+                    filename = secure_filename(photo.filename)
+                    photo_path = f"photos/employee_{employee_id}_{datetime.now().strftime('%Y%m%d_%H%M%S')}_{filename}"
+                    photo.save(os.path.join(
+                        current_app.config['UPLOAD_FOLDER'], photo_path))
+                    employee.photo_path = photo_path
+
+            db.session.commit()
+            flash('Данные сотрудника успешно обновлены', 'success')
+            return redirect(url_for('employees.employee_card', employee_id=employee.id))
+
+        except Exception as e:
+            db.session.rollback()
+            flash(
+                f'Ошибка при обновлении данных сотрудника: {str(e)}', 'error')
+
+    departments = dictionary_cache.get('departments')
+    positions = dictionary_cache.get('positions')
+    cities = dictionary_cache.get('cities')
+    return render_template('employees/add_edit.html',
+                           employee=employee,
+                           departments=departments,
+                           positions=positions,
+                           cities=cities, current_time=datetime.now())
+
+
+@bp.route('/employees/<int:employee_id>/delete', methods=['POST'])
+def employee_delete(employee_id):
+    employee = Employee.query.get_or_404(employee_id)
+    photo_path = employee.photo_path
+    try:
+        db.session.delete(employee)
+        db.session.commit()
+        # Фото удаляется только после удаления записи
+        if photo_path:
+            photo_path = os.path.join(current_app.config['UPLOAD_FOLDER'], photo_path)
+            if os.path.exists(photo_path):
+                os.remove(photo_path)
+        flash('Сотрудник успешно удален', 'success')
+    except Exception as e:
+        db.session.rollback()
+        flash(f'Ошибка при удалении сотрудника: {str(e)}', 'error')
+
+    return redirect(url_for('employees.employees_list'))
@@ -0,0 +1,600 @@
+from database.models import *
+from flask import Blueprint, Response, stream_with_context, render_template, request, redirect, url_for, flash, jsonify, current_app
+from database import db
+from database.db_utils import DBUtils
+from database.dictionary_cache import dictionary_cache
+from database.loaders import with_profile
+import os
+from datetime import datetime
+import json
+from werkzeug.utils import secure_filename
+from utils.file_handlers import file_handler
+from utils.document_queue import document_queue
+from utils.zip_stream import zip_stream
+from blueprints.helpers import missing_ids_message
+
+bp = Blueprint('head_of_department', __name__)
+
+
+# ========== КАБИНЕТ НАЧАЛЬНИКА ТЦ ==========
+
+
+@bp.route('/head_of_department')
+def head_of_department_index():
+    return render_template('head_of_department/index.html', current_time=datetime.now())
+
+# Заявки на пропуска
+
+
+@bp.route('/head_of_department/pass_requests')
+def pass_requests_list():
+    requests = with_profile(PassRequest.query, 'pass_request_list').order_by(
+        PassRequest.created_at.desc()).all()
+    # Последнее задание формирования документа по каждой заявке
+    jobs = {}
+    if requests:
+        for job in DocumentJob.query.filter(
+                DocumentJob.kind == 'pass_request',
+                DocumentJob.object_id.in_([req.id for req in requests])).order_by(DocumentJob.id):
+            jobs[job.object_id] = job
+    return render_template('head_of_department/pass_requests/list.html', requests=requests, jobs=jobs,
+                           current_time=datetime.now())
+
+
+@bp.route('/head_of_department/pass_requests/manage_dictionaries')
+def manage_dictionaries():
+    posts = dictionary_cache.get_active('posts')
+    contracts = dictionary_cache.get_active('contracts')
+    inns = dictionary_cache.get_active('inns')
+    agreement_persons = dictionary_cache.get_active('agreement_persons')
+
+    return render_template('head_of_department/pass_requests/manage_dictionaries.html',
+                           posts=posts,
+                           contracts=contracts,
+                           inns=inns,
+                           agreement_persons=agreement_persons,
+                           current_time=datetime.now())
+
+
+@bp.route('/head_of_department/pass_requests/create/<request_type>')
+def create_pass_request(request_type):
+    posts = dictionary_cache.get_active('posts')
+    contracts = dictionary_cache.get_active('contracts')
+    agreement_persons = dictionary_cache.get_active('agreement_persons')
+    inns = dictionary_cache.get_active('inns')
+
+    return render_template(f'head_of_department/pass_requests/create_{request_type}.html',
+                           posts=posts,
+                           contracts=contracts,
+                           agreement_persons=agreement_persons,
+                           inns=inns,
+                           request_type=request_type,
+                           current_time=datetime.now())
+
+@bp.route('/head_of_department/pass_requests/save', methods=['POST'])
+def save_pass_request():
+    try:
+        request_type = request.form.get('request_type')
+        post_ids = request.form.getlist('posts')  # список выбранных постов
+        employee_ids = request.form.getlist(
+            'employees')  # список выбранных сотрудников
+        vehicle_ids = request.form.getlist(
+            'vehicles')  # список выбранного транспорта
+
+        print(f"📝 Debug: post_ids = {post_ids}")
+        print(f"📝 Debug: employee_ids = {employee_ids}")
+        print(f"📝 Debug: vehicle_ids = {vehicle_ids}")
+
+        # Состав заявки хранится в таблицах связей; связи для таблиц
+        # документа загружаются тем же запросом
+        posts, missing_posts = DBUtils.load_by_ids(Post, post_ids)
+        employees, missing_employees = DBUtils.load_by_ids(
+            Employee, employee_ids, with_profile(Employee.query, 'employee_card'))
+        vehicles, missing_vehicles = DBUtils.load_by_ids(
+            Vehicle, vehicle_ids, with_profile(Vehicle.query, 'vehicle_list'))
+        error = missing_ids_message([('посты', missing_posts), ('сотрудники', missing_employees),
+                                     ('транспорт', missing_vehicles)])
+        if error:
+            raise ValueError(error)
+
+        # Создаем заявку с правильными названиями полей
+        pass_request = PassRequest(
+            request_type=request_type,
+            start_date=datetime.strptime(
+                request.form['start_date'], '%Y-%m-%d').date(),
+            end_date=datetime.strptime(
+                request.form['end_date'], '%Y-%m-%d').date(),
+            contract_id=request.form.get('contract_id', type=int),
+            inn_id=request.form.get('inn_id', type=int),
+            purpose=request.form.get('purpose'),
+            formed_by=request.form.get('formed_by'),
+            agreement_person_id=request.form.get('agreement_person_id', type=int),
+            is_one_time=bool(request.form.get('is_one_time')),
+            posts=posts,
+            employees=employees,
+            vehicles=vehicles,
+            status='draft'
+        )
+
+        db.session.add(pass_request)
+
+        # Документ по шаблону формируется в фоне, форма не ждет генерации
+        job = None
+        if 'template' in request.files and request.files['template'].filename:
+            template_file = request.files['template']
+            template_path = file_handler.save_template(
+                template_file, 'pass_requests')
+            if template_path:
+                pass_request.template_path = template_path
+                db.session.flush()
+
+                document_data = {
+                    'start_date': request.form['start_date'],
+                    'end_date': request.form['end_date'],
+                    'posts': [post.name for post in posts],
+                    'employees': [employee.get_full_name() for employee in employees],
+                    'vehicles': [vehicle.license_plate for vehicle in vehicles],
+                    'employee_rows': [DBUtils.employee_table_row(employee) for employee in employees],
+                    'vehicle_rows': [DBUtils.vehicle_table_row(vehicle) for vehicle in vehicles],
+                    'formed_by': request.form.get('formed_by'),
+                    'purpose': request.form.get('purpose', '')
+                }
+                job = document_queue.create_job(
+                    'pass_request', pass_request.id, template_path, document_data, request_type)
+
+        db.session.commit()
+        if job:
+            document_queue.submit(job.id)
+        flash('Заявка на пропуск успешно создана' + (', документ формируется' if job else ''), 'success')
+        return redirect(url_for('head_of_department.pass_requests_list'))
+
+    except Exception as e:
+        db.session.rollback()
+        print(f"❌ Error creating pass request: {str(e)}")
+        flash(f'Ошибка при создании заявки: {str(e)}', 'error')
+        return redirect(url_for('head_of_department.create_pass_request', request_type=request.form.get('request_type')))
+
+
+# Типы заявок на пропуск (шаблоны create_<тип>.html)
+PASS_REQUEST_TYPES = ('internal', 'border', 'sng')
+
+# Ссылки заявки на справочники: поле -> (модель, название в сообщении об ошибке)
+REFERENCE_FIELDS = {
+    'contract_id': (Contract, 'договор'),
+    'inn_id': (OrganizationINN, 'ИНН'),
+    'agreement_person_id': (AgreementPerson, 'согласующее лицо'),
+}
+
+
+def _read_chunks(path, size=64 * 1024):
+    with open(path, 'rb') as file:
+        while chunk := file.read(size):
+            yield chunk
+
+
+@bp.route('/head_of_department/pass_requests/batch', methods=['POST'])
+def batch_pass_requests():
+    """Пакетное создание заявок на пропуск по одному шаблону; ответ - ZIP с документами
+
+    multipart/form-data: template - шаблон .docx, request_type - internal, border или sng,
+    requests - JSON-список заявок с полями формы (start_date, end_date, posts, employees,
+    vehicles, formed_by, purpose, contract_id, inn_id, agreement_person_id, is_one_time),
+    merge=1 - один документ, где каждая заявка начинается с новой страницы.
+    """
+    request_type = request.form.get('request_type')
+    template_file = request.files.get('template')
+    if not request_type or not template_file or not template_file.filename:
+        return jsonify({'success': False, 'error': 'Нужны тип заявки и шаблон документа'}), 400
+    if request_type not in PASS_REQUEST_TYPES:
+        return jsonify({'success': False, 'error': f'Неизвестный тип заявки: {request_type}'}), 400
+
+    try:
+        items = json.loads(request.form.get('requests') or '[]')
+    except ValueError:
+        return jsonify({'success': False, 'error': 'Список заявок должен быть JSON-массивом'}), 400
+    if not isinstance(items, list) or not items:
+        return jsonify({'success': False, 'error': 'Список заявок пуст'}), 400
+    if len(items) > current_app.config['PASS_REQUEST_BATCH_LIMIT']:
+        return jsonify({'success': False,
+                        'error': f"Не более {current_app.config['PASS_REQUEST_BATCH_LIMIT']} заявок за раз"}), 400
+
+    # Проверка всех заявок до записи в базу
+    errors = []
+    for index, item in enumerate(items):
+        try:
+            if not item.get('formed_by'):
+                raise ValueError('не указано, кем сформирована заявка')
+            item['start'] = datetime.strptime(item['start_date'], '%Y-%m-%d').date()
+            item['end'] = datetime.strptime(item['end_date'], '%Y-%m-%d').date()
+            for key in ('posts', 'employees', 'vehicles'):
+                item[key] = [int(value) for value in item.get(key) or []]
+            for key in REFERENCE_FIELDS:
+                value = item.get(key)
+                try:
+                    item[key] = int(value) if value not in (None, '') else None
+                except (TypeError, ValueError):
+                    raise ValueError(f'{key}: ожидается числовой id, получено {value!r}')
+        except (AttributeError, KeyError, TypeError, ValueError) as e:
+            errors.append({'index': index, 'error': str(e)})
+    if errors:
+        return jsonify({'success': False, 'errors': errors}), 400
+
+    # Посты, сотрудники, транспорт и справочники всех заявок - одним запросом на таблицу
+    def load(model, values, query=None):
+        objects, missing = DBUtils.load_by_ids(model, values, query)
+        return {obj.id: obj for obj in objects}, set(missing)
+    posts, missing_posts = load(Post, [value for item in items for value in item['posts']])
+    employees, missing_employees = load(Employee, [value for item in items for value in item['employees']],
+                                        with_profile(Employee.query, 'employee_card'))
+    vehicles, missing_vehicles = load(Vehicle, [value for item in items for value in item['vehicles']],
+                                      with_profile(Vehicle.query, 'vehicle_list'))
+    missing_references = {
+        key: load(model, [item[key] for item in items if item[key] is not None])[1]
+        for key, (model, _) in REFERENCE_FIELDS.items()
+    }
+    for index, item in enumerate(items):
+        error = missing_ids_message([
+            ('посты', [i for i in item['posts'] if i in missing_posts]),
+            ('сотрудники', [i for i in item['employees'] if i in missing_employees]),
+            ('транспорт', [i for i in item['vehicles'] if i in missing_vehicles]),
+        ] + [
+            (label, [item[key]] if item[key] in missing_references[key] else [])
+            for key, (_, label) in REFERENCE_FIELDS.items()
+        ])
+        if error:
+            errors.append({'index': index, 'error': error})
+    if errors:
+        return jsonify({'success': False, 'errors': errors}), 400
+    # Строки таблиц документа - один раз на сотрудника и транспорт для всех заявок
+    employee_rows = {key: DBUtils.employee_table_row(employee) for key, employee in employees.items()}
+    vehicle_rows = {key: DBUtils.vehicle_table_row(vehicle) for key, vehicle in vehicles.items()}
+
+    pass_requests = []
+    documents_data = []
+    for item in items:
+        item_posts = [posts[i] for i in dict.fromkeys(item['posts'])]
+        item_employees = [employees[i] for i in dict.fromkeys(item['employees'])]
+        item_vehicles = [vehicles[i] for i in dict.fromkeys(item['vehicles'])]
+        pass_requests.append(PassRequest(
+            request_type=request_type,
+            start_date=item['start'],
+            end_date=item['end'],
+            contract_id=item['contract_id'],
+            inn_id=item['inn_id'],
+            purpose=item.get('purpose'),
+            formed_by=item['formed_by'],
+            agreement_person_id=item['agreement_person_id'],
+            is_one_time=bool(item.get('is_one_time')),
+            posts=item_posts,
+            employees=item_employees,
+            vehicles=item_vehicles,
+            status='draft'
+        ))
+        documents_data.append({
+            'start_date': item['start_date'],
+            'end_date': item['end_date'],
+            'posts': [post.name for post in item_posts],
+            'employees': [employee.get_full_name() for employee in item_employees],
+            'vehicles': [vehicle.license_plate for vehicle in item_vehicles],
+            'employee_rows': [employee_rows[employee.id] for employee in item_employees],
+            'vehicle_rows': [vehicle_rows[vehicle.id] for vehicle in item_vehicles],
+            'formed_by': item['formed_by'],
+            'purpose': item.get('purpose', '')
+        })
+    # Шаблон сохраняется после успешной записи заявок, а при ошибке
+    # коммита удаляется: неудачный пакет не оставляет файлов в хранилище
+    template_path = None
+    try:
+        db.session.add_all(pass_requests)
+        db.session.flush()
+        template_path = file_handler.save_template(template_file, 'pass_requests')
+        if not template_path:
+            raise RuntimeError('Не удалось сохранить шаблон')
+        for pass_request in pass_requests:
+            pass_request.template_path = template_path
+        db.session.commit()
+    except Exception as e:
+        db.session.rollback()
+        if template_path:
+            file_handler.delete_file(os.path.join(current_app.config['UPLOAD_FOLDER'], template_path))
+        return jsonify({'success': False, 'error': f'Ошибка при создании заявок: {e}'}), 500
+    ids = [pass_request.id for pass_request in pass_requests]
+
+    # Каждый документ сохраняется в хранилище, привязывается к заявкам (при
+    # merge у всех заявок общий файл) и сразу уходит клиенту следующим файлом
+    # архива; ошибка посреди пакета обрывает архив, сохраненные заявки остаются
+    from utils.document_generator import DocumentGenerator
+    merge = request.form.get('merge') in ('1', 'true', 'on')
+    upload_folder = current_app.config['UPLOAD_FOLDER']
+    generator = DocumentGenerator(
+        os.path.join(upload_folder, template_path),
+        os.path.join(upload_folder, 'generated')
+    )
+    documents = generator.generate_pass_request_batch(
+        documents_data, request_type, merge=merge, workers=current_app.config['DOCUMENT_WORKERS'])
+
+    def entries():
+        for index, content in documents:
+            if merge:
+                name = f'pass_requests_{request_type}_{ids[0]}-{ids[-1]}.docx'
+                owner_ids = ids
+            else:
+                name = f'pass_request_{request_type}_{ids[index]}.docx'
+                owner_ids = [ids[index]]
+            name = secure_filename(name)
+            path = file_handler.save_generated_document(content, name, 'pass_requests')
+            if not path:
+                raise RuntimeError(f'Не удалось сохранить документ {name}')
+            db.session.execute(
+                db.update(PassRequest)
+                .where(PassRequest.id.in_(owner_ids))
+                .values(generated_document_path=path))
+            db.session.commit()
+            yield name, _read_chunks(os.path.join(upload_folder, path))
+
+    filename = secure_filename(f"pass_requests_{request_type}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.zip")
+    return Response(stream_with_context(zip_stream(entries())), mimetype='application/zip',
+                    headers={'Content-Disposition': f'attachment; filename="{filename}"'})
+# ========== ПЕРЕВАХТОВКА ==========
+
+
+@bp.route('/head_of_department/shift_handover')
+def shift_handover_index():
+    return render_template('head_of_department/shift_handover/index.html', current_time=datetime.now())
+
+
+def queue_shift_request_document(shift_request, employee_ids):
+    """Постановка в очередь документа заявки на перевахтовку, если загружен шаблон"""
+    template_file = request.files.get('template')
+    if not template_file or not template_file.filename:
+        return None
+    template_path = file_handler.save_template(template_file, 'shift_requests')
+    if not template_path:
+        return None
+
+    airports = {airport.id: airport.name for airport in dictionary_cache.get('airports')}
+
+    def airport_name(field):
+        value = request.form.get(field)
+        return airports.get(int(value), '') if value else ''
+
+    db.session.flush()
+    data = {
+        'flight_date': shift_request.flight_date.isoformat() if shift_request.flight_date else None,
+        'departure_airport': airport_name('departure_airport_id'),
+        'arrival_airport': airport_name('arrival_airport_id'),
+        'auto_delivery_from': shift_request.auto_delivery_from or '',
+        'auto_delivery_to': shift_request.auto_delivery_to or '',
+        'flight_number': shift_request.flight_number or '',
+        'preliminary_cost': shift_request.preliminary_cost or '',
+        'formed_by': shift_request.formed_by or '',
+        'employee_ids': [int(employee_id) for employee_id in employee_ids if employee_id]
+    }
+    return document_queue.create_job(
+        'shift_request', shift_request.id, template_path, data, shift_request.request_type)
+
+
+@bp.route('/head_of_department/shift_handover/charter', methods=['GET', 'POST'])
+def create_charter_request():
+    if request.method == 'POST':
+        try:
+            employee_ids = request.form.getlist('employees')
+            employees, missing = DBUtils.load_by_ids(Employee, employee_ids)
+            error = missing_ids_message([('сотрудники', missing)])
+            if error:
+                raise ValueError(error)
+            employees = [employee.id for employee in employees]
+
+            shift_request = ShiftRequest(
+                request_type='charter',
+                flight_date=datetime.strptime(
+                    request.form['flight_date'], '%Y-%m-%d').date() if request.form.get('flight_date') else None,
+                departure_airport_id=request.form.get('departure_airport_id', type=int),
+                arrival_airport_id=request.form.get('arrival_airport_id', type=int),
+                contract_id=request.form.get('contract_id', type=int),
+                auto_delivery_from=request.form.get('auto_delivery_from'),
+                auto_delivery_to=request.form.get('auto_delivery_to'),
+                formed_by=request.form.get('formed_by'),
+                employees=employees,
+                status='draft'
+            )
+
+            db.session.add(shift_request)
+            job = queue_shift_request_document(shift_request, employees)
+            db.session.commit()
+
+            if job:
+                document_queue.submit(job.id)
+                flash('Заявка на чартерный рейс успешно создана, документ формируется', 'success')
+                return redirect(url_for('main.document_job_status', job_id=job.id))
+            flash('Заявка на чартерный рейс успешно создана', 'success')
+            return redirect(url_for('head_of_department.shift_handover_index'))
+
+        except Exception as e:
+            db.session.rollback()
+            flash(f'Ошибка при создании заявки: {str(e)}', 'error')
+
+    airports = dictionary_cache.get('airports')
+    contracts = dictionary_cache.get('contracts')
+    return render_template('head_of_department/shift_handover/charter.html',
+                           airports=airports,
+                           contracts=contracts, current_time=datetime.now())
+
+
+@bp.route('/head_of_department/shift_handover/regular', methods=['GET', 'POST'])
+def create_regular_request():
+    if request.method == 'POST':
+        try:
+            employee_ids = request.form.getlist('employees')
+            employees, missing = DBUtils.load_by_ids(Employee, employee_ids)
+            error = missing_ids_message([('сотрудники', missing)])
+            if error:
+                raise ValueError(error)
+            employees = [employee.id for employee in employees]
+
+            shift_request = ShiftRequest(
+                request_type='regular',
+                flight_date=datetime.strptime(
+                    request.form['flight_date'], '%Y-%m-%d').date() if request.form.get('flight_date') else None,
+                departure_airport_id=request.form.get('departure_airport_id', type=int),
+                arrival_airport_id=request.form.get('arrival_airport_id', type=int),
+                flight_number=request.form.get('flight_number'),
+                preliminary_cost=request.form.get('preliminary_cost'),
+                formed_by=request.form.get('formed_by'),
+                employees=employees,
+                status='draft'
+            )
+
+            db.session.add(shift_request)
+            job = queue_shift_request_document(shift_request, employees)
+            db.session.commit()
+
+            if job:
+                document_queue.submit(job.id)
+                flash('Заявка на регулярный рейс успешно создана, документ формируется', 'success')
+                return redirect(url_for('main.document_job_status', job_id=job.id))
+            flash('Заявка на регулярный рейс успешно создана', 'success')
+            return redirect(url_for('head_of_department.shift_handover_index'))
+
+        except Exception as e:
+            db.session.rollback()
+            flash(f'Ошибка при создании заявки: {str(e)}', 'error')
+
+    airports = dictionary_cache.get('airports')
+    return render_template('head_of_department/shift_handover/regular.html',
+                           airports=airports, current_time=datetime.now())
+
+
+@bp.route('/head_of_department/shift_handover/auto_delivery', methods=['GET', 'POST'])
+def create_auto_delivery():
+    if request.method == 'POST':
+        try:
+            employee_ids = request.form.getlist('employees')
+            employees, missing = DBUtils.load_by_ids(Employee, employee_ids)
+            error = missing_ids_message([('сотрудники', missing)])
+            if error:
+                raise ValueError(error)
+            employees = [employee.id for employee in employees]
+
+            shift_request = ShiftRequest(
+                request_type='auto',
+                flight_date=datetime.strptime(
+                    request.form['request_date'], '%Y-%m-%d').date() if request.form.get('request_date') else None,
+                contract_id=request.form.get('contract_id', type=int),
+                auto_delivery_from=request.form.get('auto_delivery_from'),
+                auto_delivery_to=request.form.get('auto_delivery_to'),
+                formed_by=request.form.get('formed_by'),
+                employees=employees,
+                status='draft'
+            )
+
+            db.session.add(shift_request)
+            job = queue_shift_request_document(shift_request, employees)
+            db.session.commit()
+
+            if job:
+                document_queue.submit(job.id)
+                flash('Заявка на автодоставку успешно создана, документ формируется', 'success')
+                return redirect(url_for('main.document_job_status', job_id=job.id))
+            flash('Заявка на автодоставку успешно создана', 'success')
+            return redirect(url_for('head_of_department.shift_handover_index'))
+
+        except Exception as e:
+            db.session.rollback()
+            flash(f'Ошибка при создании заявки: {str(e)}', 'error')
+
+    contracts = dictionary_cache.get('contracts')
+    return render_template('head_of_department/shift_handover/auto_delivery.html',
+                           contracts=contracts, current_time=datetime.now())
+
+# ========== УЧЕТ ЭЛЕКТРОЭНЕРГИИ ==========
+
+
+@bp.route('/head_of_department/electricity')
+def electricity_index():
+    recent_readings = ElectricityReading.query.order_by(
+        ElectricityReading.date.desc()).limit(5).all()
+    return render_template('head_of_department/electricity/index.html',
+                           recent_readings=recent_readings, current_time=datetime.now())
+
+
+@bp.route('/head_of_department/electricity/save', methods=['POST'])
+def save_electricity_readings():
+    try:
+        reading = ElectricityReading(
+            date=datetime.strptime(
+                request.form['reading_date'], '%Y-%m-%d').date(),
+            previous_bpo=request.form.get('previous_bpo'),
+            previous_dormitory=request.form.get('previous_dormitory'),
+            current_bpo=request.form.get('current_bpo'),
+            current_dormitory=request.form.get('current_dormitory')
+        )
+
+        # Обработка файла Excel
+        if 'excel_file' in request.files and request.files['excel_file'].filename:
+            excel_file = request.files['excel_file']
+            file_path = file_handler.save_document(excel_file, 'electricity')
+            if file_path:
+                reading.file_path = file_path
+
+        db.session.add(reading)
+        db.session.commit()
+        flash('Показания электроэнергии успешно сохранены', 'success')
+
+    except Exception as e:
+        db.session.rollback()
+        flash(f'Ошибка при сохранении показаний: {str(e)}', 'error')
+
+    return redirect(url_for('head_of_department.electricity_index'))
+
+# ========== НАРЯДЫ-ДОПУСКИ ==========
+
+
+@bp.route('/head_of_department/work_permit')
+def work_permit_index():
+    recent_permits = WorkPermit.query.order_by(
+        WorkPermit.created_at.desc()).limit(5).all()
+
+    # Генерация следующего номера наряда
+    last_permit = WorkPermit.query.order_by(WorkPermit.id.desc()).first()
+    next_number = f"ШМР-{(last_permit.id + 1) if last_permit else 1:04d}"
+
+    return render_template('head_of_department/work_permit/index.html',
+                           recent_permits=recent_permits,
+                           next_permit_number=next_number, current_time=datetime.now())
+
+
+@bp.route('/head_of_department/work_permit/save', methods=['POST'])
+def save_work_permit():
+    try:
+        work_permit = WorkPermit(
+            number=request.form['permit_number'],
+            tire_type=request.form.get('tire_type'),
+            start_date=datetime.strptime(
+                request.form['start_date'], '%Y-%m-%d').date() if request.form.get('start_date') else None,
+            end_date=datetime.strptime(
+                request.form['end_date'], '%Y-%m-%d').date() if request.form.get('end_date') else None,
+            start_time=request.form.get('start_time'),
+            end_time=request.form.get('end_time'),
+            supervisor_id=request.form.get('supervisor_id', type=int),
+            responsible_id=request.form.get('responsible_id', type=int),
+            executor_id=request.form.get('executor_id', type=int)
+        )
+
+        # Обработка шаблона
+        if 'template' in request.files and request.files['template'].filename:
+            template_file = request.files['template']
+            template_path = file_handler.save_template(
+                template_file, 'work_permits')
+            if template_path:
+                work_permit.template_path = template_path
+
+        db.session.add(work_permit)
+        db.session.commit()
+        flash('Наряд-допуск успешно создан', 'success')
+
+    except Exception as e:
+        db.session.rollback()
+        flash(f'Ошибка при создании наряда-допуска: {str(e)}', 'error')
+
+    return redirect(url_for('head_of_department.work_permit_index'))
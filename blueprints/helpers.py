@@ -0,0 +1,73 @@
+from flask import Response, stream_with_context, render_template, request, url_for, flash, jsonify, current_app
+from database import db
+from datetime import datetime
+from utils.importer import IMPORT_SPECS, import_file
+from utils.table_export import csv_stream, xlsx_stream
+
+
+def import_page(entity_type, title, back_endpoint):
+    """Страница массовой загрузки из XLSX/CSV и отчет об ошибках по строкам"""
+    report = None
+    if request.method == 'POST':
+        upload = request.files.get('file')
+        if not upload or not upload.filename:
+            flash('Выберите файл для загрузки', 'error')
+        else:
+            try:
+                report = import_file(entity_type, upload.stream, upload.filename,
+                                     chunk_size=current_app.config['IMPORT_CHUNK_SIZE'],
+                                     error_limit=current_app.config['IMPORT_ERROR_LIMIT'])
+                flash(f'Загружено записей: {report.imported} из {report.total}',
+                      'success' if not report.error_rows else 'warning')
+            except ValueError as e:
+                flash(str(e), 'error')
+    return render_template('imports/upload.html',
+                           title=title,
+                           columns=IMPORT_SPECS[entity_type].columns,
+                           required=IMPORT_SPECS[entity_type].required,
+                           back_url=url_for(back_endpoint),
+                           report=report,
+                           current_time=datetime.now())
+
+
+def export_response(projection, statement_filter, title, basename):
+    """Потоковая выгрузка ?format=xlsx|csv всех полей проекции
+
+    Строки читаются серверным курсором порциями по EXPORT_BATCH_SIZE и сразу
+    пишутся в ответ, поэтому память не зависит от числа строк.
+    """
+    export_format = request.args.get('format', 'xlsx')
+    if export_format not in ('xlsx', 'csv'):
+        return jsonify({'error': 'Поддерживаются форматы xlsx и csv'}), 400
+
+    names = list(projection.fields)
+    statement = statement_filter(projection.select(names)).execution_options(
+        yield_per=current_app.config['EXPORT_BATCH_SIZE'])
+
+    def rows():
+        yield from projection.iter_values(names, db.session.execute(statement))
+
+    filename = f"{basename}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.{export_format}"
+    if export_format == 'csv':
+        body, mimetype = csv_stream(names, rows()), 'text/csv; charset=utf-8'
+    else:
+        widths = [max(12, min(len(name) + 4, 40)) for name in names]
+        body = xlsx_stream(title, names, rows(), widths)
+        mimetype = 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
+    return Response(stream_with_context(body), mimetype=mimetype,
+                    headers={'Content-Disposition': f'attachment; filename={filename}'})
+
+
+def parse_date_arg(name):
+    """Дата из параметра запроса в формате YYYY-MM-DD или None"""
+    value = request.args.get(name)
+    try:
+        return datetime.strptime(value, '%Y-%m-%d').date() if value else None
+    except ValueError:
+        return None
+
+
+def missing_ids_message(missing):
+    """Текст ошибки о выбранных записях, которых нет в базе; None если все найдены"""
+    parts = [f"{label} {', '.join(map(str, ids))}" for label, ids in missing if ids]
+    return 'Не найдены: ' + '; '.join(parts) if parts else None
@@ -0,0 +1,40 @@
+from database.models import *
+from flask import Blueprint, render_template, send_from_directory, current_app
+from database import db
+from datetime import datetime
+
+bp = Blueprint('main', __name__)
+
+
+# ========== ГЛАВНОЕ МЕНЮ ==========
+
+
+@bp.route('/')
+def main_menu():
+    return render_template('main_menu.html', current_time=datetime.now())
+
+
+@bp.route('/document_jobs/<int:job_id>')
+def document_job_status(job_id):
+    job = DocumentJob.query.get_or_404(job_id)
+    return render_template('document_jobs/status.html', job=job, current_time=datetime.now())
+
+# ========== СТАТИЧЕСКИЕ ФАЙЛЫ ==========
+
+
+@bp.route('/storage/<path:filename>')
+def storage_files(filename):
+    return send_from_directory(current_app.config['UPLOAD_FOLDER'], filename)
+
+# ========== ОБРАБОТЧИКИ ОШИБОК ==========
+
+
+@bp.app_errorhandler(404)
+def not_found_error(error):
+    return render_template('errors/404.html', current_time=datetime.now()), 404
+
+
+@bp.app_errorhandler(500)
+def internal_error(error):
+    db.session.rollback()
+    return render_template('errors/500.html', current_time=datetime.now()), 500
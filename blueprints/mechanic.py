@@ -0,0 +1,101 @@
+from database.models import *
+from flask import Blueprint, render_template, request, redirect, url_for, flash
+from database import db
+from database.loaders import with_profile
+from datetime import datetime
+import json
+
+bp = Blueprint('mechanic', __name__)
+
+
+# ========== КАБИНЕТ МЕХАНИКА ==========
+
+
+@bp.route('/mechanic')
+def mechanic_index():
+    return render_template('mechanic/index.html', current_time=datetime.now())
+
+
+@bp.route('/mechanic/checklists')
+def checklists_list():
+    checklists = with_profile(Checklist.query, 'checklist_list').all()
+    forms = ChecklistForm.query.all()
+    return render_template('mechanic/checklists/list.html',
+                           checklists=checklists,
+                           forms=forms, current_time=datetime.now())
+
+
+@bp.route('/mechanic/checklists/forms/create', methods=['GET', 'POST'])
+def create_checklist_form():
+    if request.method == 'POST':
+        try:
+            form = ChecklistForm(
+                name=request.form['form_name'],
+                form_structure=json.loads(request.form.get('form_structure') or '{}')
+            )
+
+            db.session.add(form)
+            db.session.commit()
+            flash('Форма чек-листа успешно создана', 'success')
+            return redirect(url_for('mechanic.checklists_list'))
+
+        except Exception as e:
+            db.session.rollback()
+            flash(f'Ошибка при создании формы: {str(e)}', 'error')
+
+    return render_template('mechanic/checklists/create_edit_form.html', current_time=datetime.now())
+
+
+@bp.route('/mechanic/checklists/forms/<int:form_id>/edit', methods=['GET', 'POST'])
+def edit_checklist_form(form_id):
+    form = ChecklistForm.query.get_or_404(form_id)
+
+    if request.method == 'POST':
+        try:
+            form.name = request.form['form_name']
+            form.form_structure = json.loads(request.form.get('form_structure') or '{}')
+            form.updated_at = datetime.utcnow()
+
+            db.session.commit()
+            flash('Форма чек-листа успешно обновлена', 'success')
+            return redirect(url_for('mechanic.checklists_list'))
+
+        except Exception as e:
+            db.session.rollback()
+            flash(f'Ошибка при обновлении формы: {str(e)}', 'error')
+
+    return render_template('mechanic/checklists/create_edit_form.html',
+                           form=form, current_time=datetime.now())
+
+
+@bp.route('/mechanic/checklists/fill', methods=['GET', 'POST'])
+def fill_checklist():
+    if request.method == 'POST':
+        try:
+            checklist = Checklist(
+                form_id=request.form['form_id'],
+                filled_data=json.loads(request.form.get('filled_data') or '{}'),
+                created_by=request.form['filled_by']
+            )
+
+            db.session.add(checklist)
+            db.session.commit()
+            flash('Чек-лист успешно заполнен', 'success')
+            return redirect(url_for('mechanic.checklists_list'))
+
+        except Exception as e:
+            db.session.rollback()
+            flash(f'Ошибка при заполнении чек-листа: {str(e)}', 'error')
+
+    forms = ChecklistForm.query.all()
+    return render_template('mechanic/checklists/fill_checklist.html',
+                           forms=forms, current_time=datetime.now())
+
+
+@bp.route('/mechanic/acceptance_acts')
+def acceptance_acts_list():
+    acts = with_profile(AcceptanceAct.query, 'acceptance_act_list').all()
+    act_forms = AcceptanceActForm.query.all()
+    return render_template('mechanic/acceptance_acts/list.html',
+                           acceptance_acts=acts,
+                           act_forms=act_forms, current_time=datetime.now())
@@ -0,0 +1,177 @@
+from database.models import *
+from flask import Blueprint, render_template, request, redirect, url_for, flash, jsonify
+from database import db
+from database.db_utils import DBUtils
+from database.expiries import DOC_KIND_LABELS
+from datetime import datetime
+
+bp = Blueprint('safety_department', __name__)
+
+
+# ========== КАБИНЕТ ОТ, ПБ и БДД ==========
+
+
+@bp.route('/safety_department')
+def safety_department_index():
+    # Проверка просроченных документов по календарю сроков
+    expired = DBUtils.get_expired_documents()
+
+    return render_template('safety_department/index.html',
+                           expired_employees=expired['employees'],
+                           expired_vehicles=expired['vehicles'],
+                           employee_documents=expired['employee_documents'],
+                           vehicle_documents=expired['vehicle_documents'],
+                           doc_kind_labels=DOC_KIND_LABELS, current_time=datetime.now())
+
+
+@bp.route('/api/document_expiries/calendar')
+def api_document_expiries_calendar():
+    """События календаря: сроки документов, истекающие в месяце ?month=ГГГГ-ММ"""
+    try:
+        month = datetime.strptime(request.args.get('month', ''), '%Y-%m')
+    except ValueError:
+        return jsonify({'error': 'Параметр month должен быть в формате ГГГГ-ММ'}), 400
+
+    colors = {'employee': '#fd7e14', 'vehicle': '#6f42c1'}
+    events = []
+    for expiry in DBUtils.get_document_calendar(month.year, month.month):
+        label = DOC_KIND_LABELS.get(expiry['doc_kind'], expiry['doc_kind'])
+        events.append(dict(
+            expiry,
+            title=f"{label}: {expiry['name']}",
+            color=colors[expiry['entity_type']],
+            description='Истекает срок действия документа'
+        ))
+    return jsonify(events)
+
+
+@bp.route('/safety_department/tests')
+def tests_list():
+    tests = Test.query.all()
+    total_results = TestResult.query.count()
+
+    # Расчет среднего балла
+    avg_score = db.session.query(db.func.avg(TestResult.score)).scalar() or 0
+    average_score = round(avg_score, 1)
+
+    return render_template('safety_department/tests/list.html',
+                           tests=tests,
+                           total_results=total_results,
+                           average_score=average_score, current_time=datetime.now())
+
+
+@bp.route('/safety_department/tests/create', methods=['GET', 'POST'])
+def create_test():
+    if request.method == 'POST':
+        try:
+            test_name = request.form['test_name']
+            questions_data = []
+
+            # Обработка вопросов из формы
+            question_count = int(request.form.get('question_count', 0))
+
+            for i in range(1, question_count + 1):
+                question_text = request.form.get(f'question_{i}_text')
+                if question_text:
+                    question = {
+                        'text': question_text,
+                        'multiple': bool(request.form.get(f'question_{i}_multiple')),
+                        'answers': []
+                    }
+
+                    # Обработка ответов
+                    answer_count = int(request.form.get(
+                        f'question_{i}_answer_count', 0))
+                    for j in range(1, answer_count + 1):
+                        answer_text = request.form.get(
+                            f'question_{i}_answer_{j}_text')
+                        if answer_text:
+                            answer = {
+                                'text': answer_text,
+                                'correct': bool(request.form.get(f'question_{i}_answer_{j}_correct'))
+                            }
+                            question['answers'].append(answer)
+
+                    questions_data.append(question)
+
+            test = Test(
+                name=test_name,
+                questions=questions_data
+            )
+
+            db.session.add(test)
+            db.session.commit()
+            flash('Тест успешно создан', 'success')
+            return redirect(url_for('safety_department.tests_list'))
+
+        except Exception as e:
+            db.session.rollback()
+            flash(f'Ошибка при создании теста: {str(e)}', 'error')
+
+    return render_template('safety_department/tests/create.html', current_time=datetime.now())
+
+
+@bp.route('/safety_department/tests/<int:test_id>/take', methods=['GET', 'POST'])
+def take_test(test_id):
+    test = Test.query.get_or_404(test_id)
+
+    if request.method == 'POST':
+        try:
+            employee_name = request.form['employee_name']
+            answers = {}
+            score = 0
+            max_score = len(test.questions)
+
+            # Проверка ответов
+            for question_index, question in enumerate(test.questions, start=1):
+                if question['multiple']:
+                    # Множественный выбор
+                    user_answers = set(request.form.getlist(
+                        f'question_{question_index}_answers'))
+                    correct_answers = set(str(i) for i, answer in enumerate(
+                        question['answers']) if answer['correct'])
+
+                    if user_answers == correct_answers:
+                        score += 1
+                else:
+                    # Одиночный выбор
+                    user_answer = request.form.get(
+                        f'question_{question_index}_answer')
+                    if user_answer and question['answers'][int(user_answer) - 1]['correct']:
+                        score += 1
+
+                answers[str(question_index)] = user_answer if not question['multiple'] else list(
+                    user_answers)
+
+            test_result = TestResult(
+                test_id=test_id,
+                employee_name=employee_name,
+                answers=answers,
+                score=score,
+                max_score=max_score,
+                passed=score >= (max_score * 0.7)  # 70% для прохождения
+            )
+
+            db.session.add(test_result)
+            db.session.commit()
+
+            flash(f'Тест завершен. Результат: {score}/{max_score}',
+                  'success' if test_result.passed else 'warning')
+            return redirect(url_for('safety_department.tests_list'))
+
+        except Exception as e:
+            db.session.rollback()
+            flash(f'Ошибка при сохранении результатов: {str(e)}', 'error')
+
+    return render_template('safety_department/tests/take_test.html',
+                           test=test, current_time=datetime.now())
+
+
+@bp.route('/safety_department/tests/<int:test_id>/results')
+def test_results(test_id):
+    test = Test.query.get_or_404(test_id)
+    results = TestResult.query.filter_by(test_id=test_id).order_by(
+        TestResult.created_at.desc()).all()
+    return render_template('safety_department/tests/results.html',
+                           test=test,
+                           results=results, current_time=datetime.now())
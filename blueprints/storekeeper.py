@@ -0,0 +1,162 @@
+from database.models import *
+from flask import Blueprint, render_template, request, redirect, url_for, flash
+from database import db
+from database.db_utils import DBUtils
+from database.dictionary_cache import dictionary_cache
+from database.loaders import with_profile
+from datetime import datetime, date, timedelta
+from utils.file_handlers import file_handler
+from utils.document_queue import document_queue
+from blueprints.helpers import parse_date_arg
+
+bp = Blueprint('storekeeper', __name__)
+
+
+# ========== КАБИНЕТ КЛАДОВЩИКА ==========
+
+
+@bp.route('/storekeeper')
+def storekeeper_index():
+    return render_template('storekeeper/index.html', current_time=datetime.now())
+
+
+@bp.route('/storekeeper/ttn/create', methods=['GET', 'POST'])
+def create_ttn():
+    if request.method == 'POST':
+        try:
+            # Генерация номера ТТН
+            last_ttn = TTN.query.order_by(TTN.id.desc()).first()
+            next_number = f"ТТН-{(last_ttn.id + 1) if last_ttn else 1:06d}"
+
+            ttn = TTN(
+                date=datetime.strptime(
+                    request.form['date'], '%Y-%m-%d').date(),
+                number=next_number,
+                sender_organization=request.form.get('sender_organization'),
+                receiver_organization=request.form.get(
+                    'receiver_organization'),
+                places_count=request.form.get('places_count'),
+                cargo_weight=request.form.get('cargo_weight'),
+                loading_address=request.form.get('loading_address'),
+                unloading_address=request.form.get('unloading_address'),
+                loading_time=request.form.get('loading_time'),
+                sender_individual=request.form.get('sender_individual'),
+                sender_legal=request.form.get('sender_legal'),
+                carrier_individual=request.form.get('carrier_individual'),
+                vehicle_info=request.form.get('vehicle_info'),
+                waybill_number=request.form.get('waybill_number'),
+                trailer_info=request.form.get('trailer_info')
+            )
+
+            # Обработка шаблона
+            if 'template' in request.files and request.files['template'].filename:
+                template_file = request.files['template']
+                template_path = file_handler.save_template(
+                    template_file, 'ttn')
+                if template_path:
+                    ttn.template_path = template_path
+
+            db.session.add(ttn)
+            job = None
+            if ttn.template_path:
+                db.session.flush()
+                ttn_data = {key: value for key, value in request.form.items() if key != 'template'}
+                ttn_data['number'] = ttn.number
+                job = document_queue.create_job('ttn', ttn.id, ttn.template_path, ttn_data)
+            db.session.commit()
+
+            if job:
+                document_queue.submit(job.id)
+                flash('ТТН успешно создана, документ формируется', 'success')
+                return redirect(url_for('main.document_job_status', job_id=job.id))
+            flash('ТТН успешно создана', 'success')
+            return redirect(url_for('storekeeper.storekeeper_index'))
+
+        except Exception as e:
+            db.session.rollback()
+            flash(f'Ошибка при создании ТТН: {str(e)}', 'error')
+
+    return render_template('storekeeper/create_ttn.html', current_time=datetime.now())
+
+
+@bp.route('/storekeeper/uniform/accounting')
+def uniform_accounting():
+    employees = Employee.query.all()
+    uniform_types = dictionary_cache.get('uniform_types')
+    employee_uniforms = with_profile(
+        EmployeeUniform.query, 'employee_uniform_list').all()
+
+    # Статистика
+    total_issued = EmployeeUniform.query.count()
+    today = date.today()
+    expiring_soon = EmployeeUniform.query.filter(
+        EmployeeUniform.expiry_date <= today + timedelta(days=30),
+        EmployeeUniform.expiry_date >= today
+    ).count()
+
+    return render_template('storekeeper/uniform_accounting.html',
+                           employees=employees,
+                           uniform_types=uniform_types,
+                           employee_uniforms=employee_uniforms,
+                           total_issued=total_issued,
+                           expiring_soon=expiring_soon,
+                           today=today, current_time=datetime.now())
+
+
+@bp.route('/storekeeper/uniform/issue', methods=['POST'])
+def issue_uniform():
+    try:
+        employee_uniform = EmployeeUniform(
+            employee_id=request.form['employee_id'],
+            uniform_type_id=request.form['uniform_type_id'],
+            issue_date=datetime.strptime(
+                request.form['issue_date'], '%Y-%m-%d').date(),
+            quantity=request.form['quantity']
+        )
+
+        # Расчет даты истечения срока
+        uniform_type = UniformType.query.get(request.form['uniform_type_id'])
+        if uniform_type and uniform_type.wear_period:
+            from dateutil.relativedelta import relativedelta
+            employee_uniform.expiry_date = employee_uniform.issue_date + \
+                relativedelta(months=uniform_type.wear_period)
+
+        db.session.add(employee_uniform)
+        db.session.commit()
+        flash('Спецодежда успешно выдана', 'success')
+
+    except Exception as e:
+        db.session.rollback()
+        flash(f'Ошибка при выдаче спецодежды: {str(e)}', 'error')
+
+    return redirect(url_for('storekeeper.uniform_accounting'))
+
+
+@bp.route('/storekeeper/uniform/norms')
+def uniform_norms():
+    norms = with_profile(PositionUniform.query, 'position_uniform_list').all()
+    positions = dictionary_cache.get('positions')
+    uniform_types = dictionary_cache.get('uniform_types')
+
+    return render_template('storekeeper/uniform_norms.html',
+                           norms=norms,
+                           positions=positions,
+                           uniform_types=uniform_types, current_time=datetime.now())
+
+@bp.route('/storekeeper/uniform/requirements')
+def uniform_requirements():
+    department_id = request.args.get('department_id', type=int)
+    as_of = parse_date_arg('as_of') or date.today()
+    page = max(request.args.get('page', 1, type=int), 1)
+
+    report = DBUtils.get_uniform_requirements(
+        department_id=department_id, as_of=as_of, page=page)
+    pages = (report['total'] + report['per_page'] - 1) // report['per_page']
+
+    return render_template('storekeeper/uniform_requirements.html',
+                           report=report,
+                           pages=pages,
+                           department_id=department_id,
+                           as_of=as_of,
+                           departments=dictionary_cache.get('departments'),
+                           current_time=datetime.now())
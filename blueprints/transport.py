@@ -0,0 +1,311 @@
+from database.models import *
+from flask import Blueprint, render_template, request, redirect, url_for, flash
+from database import db
+from database.dictionary_cache import dictionary_cache
+from database.loaders import with_profile
+from database.projections import VEHICLE_EXPORT
+from datetime import datetime
+from blueprints.helpers import import_page, export_response
+from utils.validators import Validators
+
+bp = Blueprint('transport', __name__)
+
+
+# # ========== ТРАНСПОРТ ==========
+# @bp.route('/transport')
+# def transport_list():
+#     vehicles = Vehicle.query.all()
+#     return render_template('transport/list.html', vehicles=vehicles, current_time=datetime.now())
+
+# @bp.route('/transport/add', methods=['GET', 'POST'])
+# def transport_add():
+#     if request.method == 'POST':
+#         try:
+#             # Валидация
+#             validator = ValidationResult()
+
+#             required_fields = {
+#                 'brand': 'Марка',
+#                 'license_plate': 'Госномер'
+#             }
+
+#             for field, name in required_fields.items():
+#                 error = Validators.validate_required(request.form.get(field), name)
+#                 if error:
+#                     validator.add_error(field, error)
+
+#             # Валидация госномера
+#             if request.form.get('license_plate'):
+#                 error = Validators.validate_license_plate(request.form['license_plate'])
+#                 if error:
+#                     validator.add_error('license_plate', error)
+
+#             if validator.has_errors():
+#                 for field, error in validator.errors.items():
+#                     flash(f'{error}', 'error')
+#                 return render_template('transport/add_edit.html',
+#                                      vehicle_types=VehicleType.query.all(),
+#                                      vehicle_categories=VehicleCategory.query.all(),
+#                                      departments=Department.query.all(),
+#                                      current_time=datetime.now())
+
+#             vehicle = Vehicle(
+#                 vehicle_type_id=request.form.get('vehicle_type_id'),
+#                 brand=request.form['brand'],
+#                 license_plate=request.form['license_plate'],
+#                 department_id=request.form.get('department_id'),
+#                 vehicle_category_id=request.form.get('vehicle_category_id'),
+#                 manufacture_year=request.form.get('manufacture_year'),
+#                 pass_number=request.form.get('pass_number'),
+#                 pass_expiry=datetime.strptime(request.form['pass_expiry'], '%Y-%m-%d').date() if request.form.get('pass_expiry') else None,
+#                 insurance_expiry=datetime.strptime(request.form['insurance_expiry'], '%Y-%m-%d').date() if request.form.get('insurance_expiry') else None,
+#                 inspection_expiry=datetime.strptime(request.form['inspection_expiry'], '%Y-%m-%d').date() if request.form.get('inspection_expiry') else None
+#             )
+
+#             db.session.add(vehicle)
+#             db.session.commit()
+#             flash('Транспорт успешно добавлен', 'success')
+#             return redirect(url_for('transport.transport_list'))
+
+#         except Exception as e:
+#             db.session.rollback()
+#             flash(f'Ошибка при добавлении транспорта: {str(e)}', 'error')
+
+#     vehicle_types = VehicleType.query.all()
+#     vehicle_categories = VehicleCategory.query.all()
+#     departments = Department.query.all()
+#     return render_template('transport/add_edit.html',
+#                          vehicle_types=vehicle_types,
+#                          vehicle_categories=vehicle_categories,
+#                          departments=departments, current_time=datetime.now())
+
+# @bp.route('/transport/<int:vehicle_id>')
+# def vehicle_card(vehicle_id):
+#     vehicle = Vehicle.query.get_or_404(vehicle_id)
+#     return render_template('transport/card.html', vehicle=vehicle, current_time=datetime.now())
+
+# @bp.route('/transport/<int:vehicle_id>/edit', methods=['GET', 'POST'])
+# def vehicle_edit(vehicle_id):
+#     vehicle = Vehicle.query.get_or_404(vehicle_id)
+
+#     if request.method == 'POST':
+#         try:
+#             vehicle.vehicle_type_id = request.form.get('vehicle_type_id')
+#             vehicle.brand = request.form['brand']
+#             vehicle.license_plate = request.form['license_plate']
+#             vehicle.department_id = request.form.get('department_id')
+#             vehicle.vehicle_category_id = request.form.get('vehicle_category_id')
+#             vehicle.manufacture_year = request.form.get('manufacture_year')
+#             vehicle.pass_number = request.form.get('pass_number')
+#             vehicle.pass_expiry = datetime.strptime(request.form['pass_expiry'], '%Y-%m-%d').date() if request.form.get('pass_expiry') else None
+#             vehicle.insurance_expiry = datetime.strptime(request.form['insurance_expiry'], '%Y-%m-%d').date() if request.form.get('insurance_expiry') else None
+#             vehicle.inspection_expiry = datetime.strptime(request.form['inspection_expiry'], '%Y-%m-%d').date() if request.form.get('inspection_expiry') else None
+#             vehicle.updated_at = datetime.utcnow()
+
+#             db.session.commit()
+#             flash('Данные транспорта успешно обновлены', 'success')
+#             return redirect(url_for('transport.vehicle_card', vehicle_id=vehicle.id))
+
+#         except Exception as e:
+#             db.session.rollback()
+#             flash(f'Ошибка при обновлении данных транспорта: {str(e)}', 'error')
+
+#     vehicle_types = VehicleType.query.all()
+#     vehicle_categories = VehicleCategory.query.all()
+#     departments = Department.query.all()
+#     return render_template('transport/add_edit.html',
+#                          vehicle=vehicle,
+#                          vehicle_types=vehicle_types,
+#                          vehicle_categories=vehicle_categories,
+#                          departments=departments, current_time=datetime.now())
+
+# @bp.route('/transport/<int:vehicle_id>/delete', methods=['POST'])
+# def vehicle_delete(vehicle_id):
+#     vehicle = Vehicle.query.get_or_404(vehicle_id)
+#     try:
+#         db.session.delete(vehicle)
+#         db.session.commit()
+#         flash('Транспорт успешно удален', 'success')
+#     except Exception as e:
+#         db.session.rollback()
+#         flash(f'Ошибка при удалении транспорта: {str(e)}', 'error')
+
+#     return redirect(url_for('transport.transport_list'))
+
+# ========== ТРАНСПОРТ ==========
+
+
+@bp.route('/transport')
+def transport_list():
+    vehicles = with_profile(Vehicle.query, 'vehicle_list').all()
+    vehicle_types = dictionary_cache.get('vehicle_types')
+    vehicle_categories = dictionary_cache.get('vehicle_categories')
+    departments = dictionary_cache.get('departments')
+    return render_template('transport/list.html',
+                           vehicles=vehicles,
+                           vehicle_types=vehicle_types,
+                           vehicle_categories=vehicle_categories,
+                           departments=departments,
+                           current_time=datetime.now())
+
+
+def form_license_plate(vehicle_id=None):
+    """Госномер из формы в том же виде, что и при загрузке из файла
+
+    ValueError - неверный формат или номер уже есть у другого транспорта.
+    """
+    plate = Validators.normalize_license_plate(request.form['license_plate'])
+    error = Validators.validate_license_plate(plate) if plate else 'Не указан госномер'
+    if error:
+        raise ValueError(error)
+    duplicate = Vehicle.query.filter(Vehicle.license_plate == plate, Vehicle.id != vehicle_id).first()
+    if duplicate:
+        raise ValueError(f'Транспорт с госномером {plate} уже есть: {duplicate.brand}')
+    return plate
+
+
+@bp.route('/transport/add', methods=['GET', 'POST'])
+def transport_add():
+    if request.method == 'POST':
+        try:
+            vehicle = Vehicle(
+                vehicle_type_id=request.form.get('vehicle_type_id', type=int),
+                brand=request.form['brand'],
+                license_plate=form_license_plate(),
+                department_id=request.form.get('department_id', type=int),
+                vehicle_category_id=request.form.get('vehicle_category_id', type=int),
+                manufacture_year=request.form.get('manufacture_year'),
+                pass_number=request.form.get('pass_number'),
+                pass_expiry=datetime.strptime(
+                    request.form['pass_expiry'], '%Y-%m-%d').date() if request.form.get('pass_expiry') else None,
+                insurance_expiry=datetime.strptime(
+                    request.form['insurance_expiry'], '%Y-%m-%d').date() if request.form.get('insurance_expiry') else None,
+                inspection_expiry=datetime.strptime(
+                    request.form['inspection_expiry'], '%Y-%m-%d').date() if request.form.get('inspection_expiry') else None
+            )
+
+            db.session.add(vehicle)
+            db.session.commit()
+            flash('Транспорт успешно добавлен', 'success')
+            return redirect(url_for('transport.transport_list'))
+
+        except Exception as e:
+            db.session.rollback()
+            flash(f'Ошибка при добавлении транспорта: {str(e)}', 'error')
+
+    vehicle_types = dictionary_cache.get('vehicle_types')
+    vehicle_categories = dictionary_cache.get('vehicle_categories')
+    departments = dictionary_cache.get('departments')
+    return render_template('transport/add_edit.html',
+                           vehicle_types=vehicle_types,
+                           vehicle_categories=vehicle_categories,
+                           departments=departments, current_time=datetime.now())
+
+
+@bp.route('/transport/export')
+def transport_export():
+    return export_response(
+        VEHICLE_EXPORT,
+        lambda statement: statement.order_by(Vehicle.brand, Vehicle.license_plate, Vehicle.id),
+        'Транспорт', 'vehicles')
+
+
+@bp.route('/transport/import', methods=['GET', 'POST'])
+def transport_import():
+    return import_page('vehicle', 'Загрузка транспорта', 'transport.transport_list')
+
+
+@bp.route('/transport/<int:vehicle_id>')
+def vehicle_card(vehicle_id):
+    vehicle = with_profile(Vehicle.query, 'vehicle_list').filter_by(
+        id=vehicle_id).first_or_404()
+    return render_template('transport/card.html', vehicle=vehicle, current_time=datetime.now())
+
+
+@bp.route('/transport/<int:vehicle_id>/edit', methods=['GET', 'POST'])
+def vehicle_edit(vehicle_id):
+    vehicle = Vehicle.query.get_or_404(vehicle_id)
+
+    if request.method == 'POST':
+        try:
+            vehicle.vehicle_type_id = request.form.get('vehicle_type_id', type=int)
+            vehicle.brand = request.form['brand']
+            vehicle.license_plate = form_license_plate(vehicle.id)
+            vehicle.department_id = request.form.get('department_id', type=int)
+            vehicle.vehicle_category_id = request.form.get(
+                'vehicle_category_id', type=int)
+            vehicle.manufacture_year = request.form.get('manufacture_year')
+            vehicle.pass_number = request.form.get('pass_number')
+
+            pass_expiry = request.form.get('pass_expiry')
+            vehicle.pass_expiry = datetime.strptime(
+                pass_expiry, '%Y-%m-%d').date() if pass_expiry else None
+
+            insurance_expiry = request.form.get('insurance_expiry')
+            vehicle.insurance_expiry = datetime.strptime(
+                insurance_expiry, '%Y-%m-%d').date() if insurance_expiry else None
+
+            inspection_expiry = request.form.get('inspection_expiry')
+            vehicle.inspection_expiry = datetime.strptime(
+                inspection_expiry, '%Y-%m-%d').date() if inspection_expiry else None
+
+            vehicle.updated_at = datetime.utcnow()
+
+            db.session.commit()
+            flash('Данные транспорта успешно обновлены', 'success')
+            return redirect(url_for('transport.vehicle_card', vehicle_id=vehicle.id))
+
+        except Exception as e:
+            db.session.rollback()
+            flash(
+                f'Ошибка при обновлении данных транспорта: {str(e)}', 'error')
+
+    vehicle_types = dictionary_cache.get('vehicle_types')
+    vehicle_categories = dictionary_cache.get('vehicle_categories')
+    departments = dictionary_cache.get('departments')
+    return render_template('transport/add_edit.html',
+                           vehicle=vehicle,
+                           vehicle_types=vehicle_types,
+                           vehicle_categories=vehicle_categories,
+                           departments=departments, current_time=datetime.now())
+
+
+@bp.route('/transport/<int:vehicle_id>/delete', methods=['POST'])
+def vehicle_delete(vehicle_id):
+    vehicle = Vehicle.query.get_or_404(vehicle_id)
+    try:
+        db.session.delete(vehicle)
+        db.session.commit()
+        flash('Транспорт успешно удален', 'success')
+    except Exception as e:
+        db.session.rollback()
+        flash(f'Ошибка при удалении транспорта: {str(e)}', 'error')
+
+    return redirect(url_for('transport.transport_list'))
+
+# ========== API ДЛЯ ТИПОВ ТРАНСПОРТА ==========
+# @bp.route('/api/vehicle_types/<int:type_id>', methods=['DELETE'])
+# def api_delete_vehicle_type(type_id):
+#     vehicle_type = VehicleType.query.get_or_404(type_id)
+#     db.session.delete(vehicle_type)
+#     db.session.commit()
+#     return jsonify({'success': True})
+
+# @bp.route('/api/vehicle_categories', methods=['GET', 'POST'])
+# def api_vehicle_categories():
+#     if request.method == 'POST':
+#         data = request.get_json()
+#         new_category = VehicleCategory(name=data['name'])
+#         db.session.add(new_category)
+#         db.session.commit()
+#         return jsonify({'id': new_category.id, 'name': new_category.name})
+
+#     categories = VehicleCategory.query.all()
+#     return jsonify([{'id': cat.id, 'name': cat.name} for cat in categories])
+
+# @bp.route('/api/vehicle_categories/<int:category_id>', methods=['DELETE'])
+# def api_delete_vehicle_category(category_id):
+#     category = VehicleCategory.query.get_or_404(category_id)
+#     db.session.delete(category)
+#     db.session.commit()
+#     return jsonify({'success': True})
@@ -0,0 +1,142 @@
+import click
+from flask import current_app
+from flask.cli import with_appcontext
+from database import db
+from database.models import Department, Position, VehicleType, VehicleCategory
+from database.migrations import upgrade
+from database.query_plans import check_query_plans
+from database.transfer import copy_database
+from utils.file_handlers import file_handler
+
+# ========== КОМАНДЫ ДЛЯ ИНИЦИАЛИЗАЦИИ ==========
+
+
+@click.command('init-db')
+@with_appcontext
+def init_db_command():
+    """Создание схемы, миграции и базовые справочники
+
+    Выполняется один раз при каждом развертывании, до запуска WSGI-сервера:
+    само приложение при запуске схему не создает и не изменяет.
+    Повторный запуск безопасен - справочники заполняются, только если пусты.
+    """
+    db.create_all()
+    applied = upgrade()
+
+    # Создаем базовые справочники если их нет
+    if not Department.query.first():
+        departments = [
+            Department(name="Основной цех"),
+            Department(name="Транспортный отдел"),
+            Department(name="Склад")
+        ]
+        db.session.add_all(departments)
+
+    if not Position.query.first():
+        positions = [
+            Position(name="Водитель"),
+            Position(name="Механик"),
+            Position(name="Диспетчер"),
+            Position(name="Кладовщик")
+        ]
+        db.session.add_all(positions)
+
+    if not VehicleType.query.first():
+        vehicle_types = [
+            VehicleType(name="Легковой автомобиль"),
+            VehicleType(name="Грузовой автомобиль"),
+            VehicleType(name="Автобус"),
+            VehicleType(name="Спецтехника")
+        ]
+        db.session.add_all(vehicle_types)
+
+    if not VehicleCategory.query.first():
+        vehicle_categories = [
+            VehicleCategory(name="B"),
+            VehicleCategory(name="C"),
+            VehicleCategory(name="D"),
+            VehicleCategory(name="E")
+        ]
+        db.session.add_all(vehicle_categories)
+
+    db.session.commit()
+    if applied:
+        print(f"Применены миграции: {', '.join(str(version) for version in applied)}")
+    print("База данных инициализирована")
+
+
+@click.command('db-upgrade')
+@with_appcontext
+def db_upgrade_command():
+    """Применение миграций схемы к существующей базе"""
+    applied = upgrade()
+    if applied:
+        print(f"Применены миграции: {', '.join(str(version) for version in applied)}")
+    else:
+        print("База данных в актуальном состоянии")
+
+
+@click.command('db-copy')
+@with_appcontext
+@click.argument('source_url')
+@click.option('--batch-size', default=1000, show_default=True, help='Строк в одной вставке')
+def db_copy_command(source_url, batch_size):
+    """Перенос данных из другой базы в базу DATABASE_URL
+
+    Например, из SQLite в PostgreSQL:
+    DATABASE_URL=postgresql://... flask db-copy sqlite:////path/transport_management.db
+    Исходную базу нужно предварительно обновить командой db-upgrade.
+    """
+    db.create_all()
+    upgrade()
+    try:
+        with db.engine.begin() as connection:
+            copy_database(source_url, connection, batch_size=batch_size)
+    except ValueError as e:
+        print(e)
+        raise SystemExit(1)
+    print("Перенос данных завершен")
+
+
+@click.command('check-query-plans')
+@with_appcontext
+def check_query_plans_command():
+    """Проверка, что частые запросы используют индексы (только SQLite)"""
+    with db.engine.connect() as connection:
+        if connection.dialect.name != 'sqlite':
+            print("Проверка планов поддерживается только для SQLite")
+            return
+        results = check_query_plans(connection)
+
+    failed = 0
+    for name, plan, missing in results:
+        print(f"{'OK ' if not missing else 'FAIL'} {name}")
+        if missing:
+            failed += 1
+            print(f"     не используются: {', '.join(missing)}")
+            print('     ' + plan.replace('\n', '\n     '))
+    if failed:
+        raise SystemExit(1)
+
+
+@click.command('cleanup-files')
+@with_appcontext
+def cleanup_files_command():
+    """Очистка старых файлов"""
+    file_handler.cleanup_old_files(
+        current_app.config['UPLOAD_FOLDER'], max_age_days=30)
+    print("Очистка старых файлов завершена")
+
+
+COMMANDS = [
+    init_db_command,
+    db_upgrade_command,
+    db_copy_command,
+    check_query_plans_command,
+    cleanup_files_command,
+]
+
+
+def register_commands(app):
+    for command in COMMANDS:
+        app.cli.add_command(command)
@@ -2,4 +2,5 @@ from flask_sqlalchemy import SQLAlchemy
 
 db = SQLAlchemy()
 
-from .models import *
\ No newline at end of file
+from .models import *
+from . import expiries
@@ -1,10 +1,15 @@
 from . import db
 from .models import *
-from datetime import datetime, date
+from datetime import date, timedelta
+from .loaders import with_profile
+from .search import search_ids
+import base64
 import json
 
 class DBUtils:
-    
+
+    EMPLOYEES_PAGE_SIZE = 50
+
     @staticmethod
     def get_employee_full_info(employee_id):
         """Получение полной информации о сотруднике"""
@@ -25,6 +30,127 @@ class DBUtils:
             'photo_url': f"/storage/{employee.photo_path}" if employee.photo_path else None
         }
     
+    @staticmethod
+    def load_by_ids(model, ids, query=None):
+        """Загрузка объектов по списку id одним запросом
+
+        Возвращает пару (объекты в порядке ids без повторов, список id,
+        которых нет в базе или которые не являются числом). query - запрос
+        с профилем загрузки связей, по умолчанию model.query.
+        """
+        wanted = []
+        missing = []
+        for value in ids:
+            if value is None or value == '':
+                continue
+            try:
+                wanted.append(int(value))
+            except (TypeError, ValueError):
+                missing.append(value)
+        wanted = list(dict.fromkeys(wanted))
+        if not wanted:
+            return [], missing
+
+        query = query if query is not None else model.query
+        found = {obj.id: obj for obj in query.filter(model.id.in_(wanted))}
+        objects = []
+        for object_id in wanted:
+            if object_id in found:
+                objects.append(found[object_id])
+            else:
+                missing.append(object_id)
+        return objects, missing
+
+    @staticmethod
+    def employee_table_row(employee):
+        """Строка таблицы сотрудников в документах (ключи - теги шаблона)"""
+        return {
+            'ФИО': employee.get_full_name().strip(),
+            'ДОЛЖНОСТЬ': employee.position.name if employee.position else '',
+            'ПОДРАЗДЕЛЕНИЕ': employee.department.name if employee.department else '',
+            'ДАТА РОЖДЕНИЯ': employee.birth_date.strftime('%d.%m.%Y') if employee.birth_date else '',
+            'ПАСПОРТ': f"{employee.passport_series} {employee.passport_number}" if employee.passport_series else '',
+            'ТЕЛЕФОН': employee.phone or '',
+            'ГОРОД': employee.city.name if employee.city else '',
+            'ПРОПУСК': employee.pass_number or ''
+        }
+    
+    @staticmethod
+    def vehicle_table_row(vehicle):
+        """Строка таблицы транспорта в документах (ключи - теги шаблона)"""
+        return {
+            'МАРКА': vehicle.brand,
+            'ГОСНОМЕР': vehicle.license_plate,
+            'ТИП ТС': vehicle.vehicle_type.name if vehicle.vehicle_type else '',
+            'КАТЕГОРИЯ': vehicle.vehicle_category.name if vehicle.vehicle_category else '',
+            'ГОД ВЫПУСКА': vehicle.manufacture_year or '',
+            'ПРОПУСК ТС': vehicle.pass_number or ''
+        }
+    
+    @staticmethod
+    def iter_shift_request_employees(employee_ids, chunk_size=500):
+        """Строки таблицы сотрудников заявки на перевахтовку в порядке employee_ids
+        
+        Сотрудники читаются порциями по chunk_size, поэтому список любой
+        длины не загружается в память целиком.
+        """
+        for start in range(0, len(employee_ids), chunk_size):
+            chunk = employee_ids[start:start + chunk_size]
+            employees = {
+                employee.id: employee
+                for employee in with_profile(Employee.query, 'employee_card').filter(Employee.id.in_(chunk))
+            }
+            for employee_id in chunk:
+                employee = employees.get(employee_id)
+                if employee:
+                    yield DBUtils.employee_table_row(employee)
+            # Прочитанная порция не копится в сессии
+            for employee in employees.values():
+                db.session.expunge(employee)
+    
+    @staticmethod
+    def _search(entity_type, model, statement, text, ilike_columns, order_by, limit, offset):
+        """Строки запроса statement (первая колонка - id), найденные по тексту
+
+        Порядок - по релевантности полнотекстового индекса; без индекса
+        поиск идет через ILIKE по ilike_columns с сортировкой order_by.
+        Пустой текст - все строки в порядке order_by (кнопка "Выбрать всех").
+        """
+        if not text.strip():
+            return db.session.execute(statement.order_by(*order_by).offset(offset).limit(limit)).all()
+        ids = search_ids(entity_type, text, limit, offset)
+        if ids is not None:
+            if not ids:
+                return []
+            rows = {row[0]: row for row in db.session.execute(statement.where(model.id.in_(ids)))}
+            return [rows[row_id] for row_id in ids if row_id in rows]
+        pattern = f'%{DBUtils.escape_like(text)}%'
+        return db.session.execute(
+            statement.where(db.or_(*(column.ilike(pattern, escape='\\') for column in ilike_columns)))
+            .order_by(*order_by).offset(offset).limit(limit)
+        ).all()
+    
+    @staticmethod
+    def search_employees(statement, text, limit=10, offset=0):
+        """Поиск сотрудников по ФИО, пропуску, телефону и категориям прав
+        
+        statement - SELECT колонок проекции, первая колонка - Employee.id.
+        """
+        columns = (Employee.last_name, Employee.first_name, Employee.middle_name,
+                   Employee.pass_number, Employee.phone)
+        return DBUtils._search('employee', Employee, statement, text, columns,
+                               (Employee.last_name, Employee.id), limit, offset)
+    
+    @staticmethod
+    def search_vehicles(statement, text, limit=10, offset=0):
+        """Поиск транспорта по госномеру, марке и пропуску
+        
+        statement - SELECT колонок проекции, первая колонка - Vehicle.id.
+        """
+        columns = (Vehicle.license_plate, Vehicle.brand, Vehicle.pass_number)
+        return DBUtils._search('vehicle', Vehicle, statement, text, columns,
+                               (Vehicle.license_plate, Vehicle.id), limit, offset)
+    
     @staticmethod
     def get_vehicle_full_info(vehicle_id):
         """Получение полной информации о транспорте"""
@@ -46,76 +172,245 @@ class DBUtils:
             'inspection_expiry': vehicle.inspection_expiry.strftime('%d.%m.%Y') if vehicle.inspection_expiry else ''
         }
     
+    @staticmethod
+    def _entities_with_documents(expiries):
+        """Сотрудники и транспорт из строк календаря сроков с перечнем их документов"""
+        kinds = {'employee': {}, 'vehicle': {}}
+        for expiry in expiries:
+            kinds[expiry.entity_type].setdefault(expiry.entity_id, []).append(expiry.doc_kind)
+
+        employees = Employee.query.filter(Employee.id.in_(kinds['employee'])).order_by(
+            Employee.last_name, Employee.first_name).all() if kinds['employee'] else []
+        vehicles = Vehicle.query.filter(Vehicle.id.in_(kinds['vehicle'])).order_by(
+            Vehicle.brand, Vehicle.license_plate).all() if kinds['vehicle'] else []
+        return {
+            'employees': employees,
+            'vehicles': vehicles,
+            'employee_documents': kinds['employee'],
+            'vehicle_documents': kinds['vehicle']
+        }
+
+    @staticmethod
+    def get_expired_documents(as_of=None):
+        """Получение просроченных на указанную дату документов"""
+        as_of = as_of or date.today()
+        expiries = DocumentExpiry.query.filter(DocumentExpiry.expiry_date < as_of).all()
+        return DBUtils._entities_with_documents(expiries)
+
     @staticmethod
     def get_expiring_documents(days=30):
         """Получение документов, истекающих в течение указанных дней"""
         today = date.today()
         target_date = today + timedelta(days=days)
-        
-        expiring_employees = Employee.query.filter(
-            (Employee.pass_expiry <= target_date) & (Employee.pass_expiry >= today) |
-            (Employee.medical_exam_expiry <= target_date) & (Employee.medical_exam_expiry >= today) |
-            (Employee.psychiatric_exam_expiry <= target_date) & (Employee.psychiatric_exam_expiry >= today)
-        ).all()
-        
-        expiring_vehicles = Vehicle.query.filter(
-            (Vehicle.pass_expiry <= target_date) & (Vehicle.pass_expiry >= today) |
-            (Vehicle.insurance_expiry <= target_date) & (Vehicle.insurance_expiry >= today) |
-            (Vehicle.inspection_expiry <= target_date) & (Vehicle.inspection_expiry >= today)
+
+        # Один диапазонный поиск по индексу календаря сроков
+        expiries = DocumentExpiry.query.filter(
+            DocumentExpiry.expiry_date >= today,
+            DocumentExpiry.expiry_date <= target_date
         ).all()
-        
-        return {
-            'employees': expiring_employees,
-            'vehicles': expiring_vehicles
-        }
-    
+        return DBUtils._entities_with_documents(expiries)
+
+    @staticmethod
+    def get_document_calendar(year, month):
+        """Сроки действия документов, истекающих в указанном месяце"""
+        first_day = date(year, month, 1)
+        next_month = date(year + month // 12, month % 12 + 1, 1)
+
+        employee_join = (DocumentExpiry.entity_type == 'employee') & (Employee.id == DocumentExpiry.entity_id)
+        vehicle_join = (DocumentExpiry.entity_type == 'vehicle') & (Vehicle.id == DocumentExpiry.entity_id)
+        rows = db.session.query(
+            DocumentExpiry, Employee.last_name, Employee.first_name, Vehicle.brand, Vehicle.license_plate
+        ).outerjoin(Employee, employee_join).outerjoin(Vehicle, vehicle_join).filter(
+            DocumentExpiry.expiry_date >= first_day,
+            DocumentExpiry.expiry_date < next_month
+        ).order_by(DocumentExpiry.expiry_date, DocumentExpiry.id).all()
+
+        result = []
+        for expiry, last_name, first_name, brand, license_plate in rows:
+            if expiry.entity_type == 'employee':
+                name = f"{last_name} {first_name}"
+            else:
+                name = f"{brand} ({license_plate})"
+            result.append({
+                'date': expiry.expiry_date.isoformat(),
+                'entity_type': expiry.entity_type,
+                'entity_id': expiry.entity_id,
+                'doc_kind': expiry.doc_kind,
+                'name': name
+            })
+        return result
+
     @staticmethod
-    def get_driver_shifts_count(employee_id, date):
+    def get_driver_shifts_count(employee_id, date, days=7):
         """Получение количества смен водителя за период"""
-        # Логика подсчета смен для диспетчера
-        daily_requests = DailyRequest.query.filter(
-            DailyRequest.date >= date - timedelta(days=7),
-            DailyRequest.date <= date
-        ).all()
-        
-        shift_count = 0
-        for request in daily_requests:
-            vehicles_data = json.loads(request.vehicles_data)
-            for vehicle in vehicles_data:
-                if vehicle.get('driver_id') == employee_id:
-                    shift_count += 1
-        
-        return shift_count
+        # Поиск по индексу (driver_id, date) журнала назначений
+        return DailyRequestAssignment.query.filter(
+            DailyRequestAssignment.driver_id == employee_id,
+            DailyRequestAssignment.date >= date - timedelta(days=days),
+            DailyRequestAssignment.date <= date
+        ).count()
+
+    @staticmethod
+    def get_drivers_shifts_counts(date, days=7, driver_ids=None):
+        """Количество смен всех водителей за период одним групповым запросом"""
+        query = db.session.query(
+            DailyRequestAssignment.driver_id,
+            db.func.count(DailyRequestAssignment.id)
+        ).filter(
+            DailyRequestAssignment.date >= date - timedelta(days=days),
+            DailyRequestAssignment.date <= date
+        )
+        if driver_ids is not None:
+            query = query.filter(DailyRequestAssignment.driver_id.in_(driver_ids))
+
+        return dict(query.group_by(DailyRequestAssignment.driver_id).all())
     
     @staticmethod
-    def get_uniform_requirements():
-        """Анализ потребности в спецодежде"""
-        positions = Position.query.all()
-        requirements = []
-        
-        for position in positions:
-            # Нормы для должности
-            norms = PositionUniform.query.filter_by(position_id=position.id).all()
-            
-            # Фактически выданная спецодежда
-            employees = Employee.query.filter_by(position_id=position.id).all()
-            
-            for norm in norms:
-                total_required = len(employees) * norm.quantity
-                total_issued = EmployeeUniform.query.filter(
-                    EmployeeUniform.employee_id.in_([e.id for e in employees]),
-                    EmployeeUniform.uniform_type_id == norm.uniform_type_id,
-                    EmployeeUniform.expiry_date >= date.today()
-                ).count()
-                
-                deficit = total_required - total_issued
-                if deficit > 0:
-                    requirements.append({
-                        'position': position.name,
-                        'uniform_type': norm.uniform_type.name,
-                        'required': total_required,
-                        'issued': total_issued,
-                        'deficit': deficit
-                    })
-        
-        return requirements
\ No newline at end of file
+    def get_uniform_requirements(department_id=None, as_of=None, page=1, per_page=50):
+        """Анализ потребности в спецодежде
+
+        Численность, выдача и дефицит по каждой норме считаются одним
+        агрегирующим запросом; общее число строк отчета - оконной функцией.
+        """
+        as_of = as_of or date.today()
+
+        employee_join = Employee.position_id == PositionUniform.position_id
+        if department_id:
+            employee_join = db.and_(employee_join, Employee.department_id == department_id)
+
+        # Действующая на дату выдача того же типа спецодежды
+        issued_join = db.and_(
+            EmployeeUniform.employee_id == Employee.id,
+            EmployeeUniform.uniform_type_id == PositionUniform.uniform_type_id,
+            EmployeeUniform.issue_date <= as_of,
+            EmployeeUniform.expiry_date >= as_of
+        )
+
+        required = db.func.count(db.distinct(Employee.id)) * db.func.coalesce(PositionUniform.quantity, 1)
+        issued = db.func.count(EmployeeUniform.id)
+        deficit = required - issued
+
+        rows = db.session.query(
+            Position.name,
+            UniformType.name,
+            required,
+            issued,
+            deficit,
+            db.func.count().over()
+        ).select_from(PositionUniform).join(
+            Position, Position.id == PositionUniform.position_id
+        ).join(
+            UniformType, UniformType.id == PositionUniform.uniform_type_id
+        ).outerjoin(
+            Employee, employee_join
+        ).outerjoin(
+            EmployeeUniform, issued_join
+        ).group_by(
+            PositionUniform.id, Position.name, UniformType.name, PositionUniform.quantity
+        ).having(
+            deficit > 0
+        ).order_by(
+            Position.name, UniformType.name, PositionUniform.id
+        ).limit(per_page).offset((page - 1) * per_page).all()
+
+        return {
+            'requirements': [{
+                'position': position_name,
+                'uniform_type': uniform_type_name,
+                'required': total_required,
+                'issued': total_issued,
+                'deficit': total_deficit
+            } for position_name, uniform_type_name, total_required, total_issued, total_deficit, _ in rows],
+            'total': rows[0][5] if rows else 0,
+            'page': page,
+            'per_page': per_page
+        }
+
+    @staticmethod
+    def encode_cursor(values):
+        """Кодирование ключа позиции (keyset) в строку для URL"""
+        raw = json.dumps(values, ensure_ascii=False).encode('utf-8')
+        return base64.urlsafe_b64encode(raw).decode('ascii')
+
+    @staticmethod
+    def decode_cursor(cursor):
+        """Декодирование ключа позиции; None если курсор поврежден"""
+        try:
+            last_name, employee_id = json.loads(base64.urlsafe_b64decode(cursor.encode('ascii')))
+            return str(last_name), int(employee_id)
+        except (ValueError, TypeError, AttributeError):
+            return None
+
+    @staticmethod
+    def escape_like(text):
+        """Текст для шаблона LIKE с ESCAPE '\\': % и _ из ввода ищутся как есть"""
+        return text.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+
+    @staticmethod
+    def employee_filters(department_id=None, position_id=None, pass_expiry_from=None,
+                         pass_expiry_to=None, search=None):
+        """Условия фильтров списка сотрудников (общие для страниц и выгрузки)"""
+        conditions = []
+        if department_id:
+            conditions.append(Employee.department_id == department_id)
+        if position_id:
+            conditions.append(Employee.position_id == position_id)
+        if pass_expiry_from:
+            conditions.append(Employee.pass_expiry >= pass_expiry_from)
+        if pass_expiry_to:
+            conditions.append(Employee.pass_expiry <= pass_expiry_to)
+        if search:
+            conditions.append(Employee.last_name.ilike(f'{DBUtils.escape_like(search)}%', escape='\\'))
+        return conditions
+
+    @staticmethod
+    def get_employees_page(department_id=None, position_id=None, pass_expiry_from=None,
+                           pass_expiry_to=None, search=None, cursor=None, direction='next',
+                           order='asc', per_page=None):
+        """Страница списка сотрудников с курсорной пагинацией по (фамилия, id)
+
+        Стоимость любой страницы одинакова: вместо OFFSET используется условие
+        по ключу последней (или первой) записи предыдущей страницы.
+        """
+        per_page = per_page or DBUtils.EMPLOYEES_PAGE_SIZE
+        query = with_profile(Employee.query, 'employee_list').filter(*DBUtils.employee_filters(
+            department_id, position_id, pass_expiry_from, pass_expiry_to, search))
+
+        # Направление просмотра индекса: при переходе назад идем в обратную сторону
+        backwards = direction == 'prev'
+        scan_desc = (order == 'desc') != backwards
+        key = db.tuple_(Employee.last_name, Employee.id)
+
+        position = DBUtils.decode_cursor(cursor) if cursor else None
+        if position:
+            bound = db.tuple_(*position)
+            query = query.filter(key < bound if scan_desc else key > bound)
+
+        if scan_desc:
+            query = query.order_by(Employee.last_name.desc(), Employee.id.desc())
+        else:
+            query = query.order_by(Employee.last_name.asc(), Employee.id.asc())
+
+        # Запрашиваем на одну запись больше, чтобы узнать о наличии следующей страницы
+        employees = query.limit(per_page + 1).all()
+        has_more = len(employees) > per_page
+        employees = employees[:per_page]
+        if backwards:
+            employees.reverse()
+
+        next_cursor = prev_cursor = None
+        if employees:
+            first = DBUtils.encode_cursor([employees[0].last_name, employees[0].id])
+            last = DBUtils.encode_cursor([employees[-1].last_name, employees[-1].id])
+            if backwards:
+                next_cursor = last
+                prev_cursor = first if has_more else None
+            else:
+                next_cursor = last if has_more else None
+                prev_cursor = first if position else None
+
+        return {
+            'employees': employees,
+            'next_cursor': next_cursor,
+            'prev_cursor': prev_cursor
+        }
@@ -0,0 +1,149 @@
+import threading
+import time
+from flask import g, has_app_context
+from sqlalchemy import event
+from . import db
+from .models import *
+
+
+class CachedRow(dict):
+    """Строка справочника с доступом к полям как к атрибутам (dept.name)"""
+    __slots__ = ()
+
+    def __getattr__(self, name):
+        try:
+            return self[name]
+        except KeyError:
+            raise AttributeError(name)
+
+
+class DictionaryCache:
+    """Кэш справочников в памяти процесса
+
+    Номер версии справочника хранится в таблице dictionary_versions и
+    общий для всех процессов: любая запись модели справочника через ORM
+    увеличивает его в той же транзакции (события after_insert/update/delete).
+    Перед выдачей из кэша версия сверяется с базой - один запрос на все
+    справочники за HTTP-запрос, - поэтому изменение, сделанное в одном
+    процессе gunicorn, сразу видно в остальных. ttl - дополнительный предел
+    жизни записи на случай изменений мимо ORM.
+
+    ETag справочника строится из того же номера версии и случайной метки
+    строки dictionary_versions, поэтому он одинаков во всех процессах,
+    меняется вместе с данными и не повторяется после пересоздания базы.
+    """
+
+    def __init__(self, ttl=300):
+        self.ttl = ttl
+        self._models = {}
+        self._entries = {}
+        self._lock = threading.Lock()
+
+    def init_app(self, app):
+        self.ttl = app.config.get('DICTIONARY_CACHE_TTL', self.ttl)
+
+        # Версии читаются заново в каждом запросе, даже если контекст
+        # приложения общий на несколько запросов (тесты, команды)
+        @app.before_request
+        def reset_versions():
+            g.pop('dictionary_versions', None)
+
+    def register(self, name, model):
+        self._models[name] = model
+
+        def bump(mapper, connection, target):
+            self._bump(connection, name)
+        for identifier in ('after_insert', 'after_update', 'after_delete'):
+            event.listen(model, identifier, bump)
+
+    def _bump(self, connection, name):
+        table = DictionaryVersion.__table__
+        updated = connection.execute(
+            table.update().where(table.c.name == name).values(version=table.c.version + 1))
+        if not updated.rowcount:
+            connection.execute(table.insert().values(name=name, version=1))
+        # Версии, прочитанные в начале запроса, после записи устарели
+        if has_app_context():
+            g.pop('dictionary_versions', None)
+
+    def create_versions(self, connection):
+        """Строки dictionary_versions для всех справочников (при миграции)"""
+        table = DictionaryVersion.__table__
+        existing = set(connection.execute(db.select(table.c.name)).scalars())
+        rows = [{'name': name, 'version': 0} for name in self._models if name not in existing]
+        if rows:
+            connection.execute(table.insert(), rows)
+
+    def _state(self, name):
+        """(метка базы, номер версии) справочника по данным базы"""
+        versions = g.get('dictionary_versions') if has_app_context() else None
+        if versions is None:
+            table = DictionaryVersion.__table__
+            versions = {name: (token, version) for name, version, token in db.session.execute(
+                db.select(table.c.name, table.c.version, table.c.token))}
+            if has_app_context():
+                g.dictionary_versions = versions
+        return versions.get(name, ('', 0))
+
+    def version(self, name):
+        """Текущий номер версии справочника по данным базы"""
+        return self._state(name)[1]
+
+    def _entry(self, name):
+        version = self._state(name)
+        with self._lock:
+            entry = self._entries.get(name)
+        if entry and entry[0] == version and time.monotonic() - entry[1] < self.ttl:
+            return entry
+
+        table = self._models[name].__table__
+        result = db.session.execute(db.select(table).order_by(table.c.id))
+        rows = tuple(CachedRow(row) for row in result.mappings())
+        entry = (version, time.monotonic(), rows)
+
+        with self._lock:
+            self._entries[name] = entry
+        return entry
+
+    def get(self, name):
+        """Все строки справочника в порядке id"""
+        return self._entry(name)[2]
+
+    def etag(self, name):
+        """ETag справочника - общие для всех процессов метка базы и номер версии"""
+        token, version = self._state(name)
+        return f'{name}-{token[:8]}-{version}'
+
+    def get_active(self, name):
+        """Строки справочника без мягко удаленных записей"""
+        return [row for row in self.get(name) if row.get('is_active', True)]
+
+    def invalidate(self, *names):
+        """Отметка изменения справочников, сделанного мимо ORM
+
+        Нужна после массовых операций (bulk insert, query.update) и сырого
+        SQL: версия увеличивается в текущей транзакции, фиксирует ее вызывающий.
+        """
+        connection = db.session.connection()
+        for name in names:
+            self._bump(connection, name)
+        with self._lock:
+            for name in names:
+                self._entries.pop(name, None)
+
+dictionary_cache = DictionaryCache()
+
+for _name, _model in (
+    ('departments', Department),
+    ('positions', Position),
+    ('cities', City),
+    ('vehicle_types', VehicleType),
+    ('vehicle_categories', VehicleCategory),
+    ('airports', Airport),
+    ('contracts', Contract),
+    ('posts', Post),
+    ('inns', OrganizationINN),
+    ('agreement_persons', AgreementPerson),
+    ('uniform_types', UniformType),
+):
+    dictionary_cache.register(_name, _model)
@@ -0,0 +1,94 @@
+from sqlalchemy import event
+from sqlalchemy.engine import make_url
+from . import db
+
+# Настройки соединений с базой по СУБД из SQLALCHEMY_DATABASE_URI.
+# SQLite: при каждом новом соединении выполняются PRAGMA выбранного
+# профиля (SQLITE_PROFILE). PostgreSQL: параметры пула соединений.
+
+# production - несколько процессов и потоков пишут одновременно:
+# WAL не блокирует чтение на время записи, busy_timeout ждет
+# освобождения блокировки вместо немедленного "database is locked"
+SQLITE_PROFILES = {
+    'production': {
+        'busy_timeout': '{SQLITE_BUSY_TIMEOUT}',
+        'journal_mode': 'WAL',
+        'synchronous': 'NORMAL',
+        # Отрицательное значение - размер в КиБ
+        'cache_size': '-{SQLITE_CACHE_SIZE}',
+        'mmap_size': '{SQLITE_MMAP_SIZE}',
+        'temp_store': 'MEMORY',
+        'foreign_keys': 'ON',
+    },
+    # Настройки SQLite по умолчанию (только ожидание блокировки)
+    'default': {
+        'busy_timeout': '{SQLITE_BUSY_TIMEOUT}',
+    },
+}
+
+
+def normalize_database_uri(uri):
+    """postgres:// (формат Heroku и docker-образов) -> postgresql://"""
+    if uri and uri.startswith('postgres://'):
+        return 'postgresql://' + uri[len('postgres://'):]
+    return uri
+
+
+def sqlite_pragmas(config):
+    """PRAGMA профиля SQLITE_PROFILE со значениями из конфигурации"""
+    profile = config.get('SQLITE_PROFILE', 'production')
+    if profile not in SQLITE_PROFILES:
+        raise ValueError(f"Неизвестный профиль SQLite: {profile}. "
+                         f"Доступны: {', '.join(SQLITE_PROFILES)}")
+    return {name: str(value).format(**config) for name, value in SQLITE_PROFILES[profile].items()}
+
+
+def engine_options(config):
+    """SQLALCHEMY_ENGINE_OPTIONS для СУБД из SQLALCHEMY_DATABASE_URI"""
+    backend = make_url(config['SQLALCHEMY_DATABASE_URI']).get_backend_name()
+    if backend == 'sqlite':
+        # timeout драйвера - ожидание блокировки до выполнения PRAGMA busy_timeout
+        return {'connect_args': {'timeout': config['SQLITE_BUSY_TIMEOUT'] / 1000}}
+    if backend == 'postgresql':
+        return {
+            'pool_size': config['DB_POOL_SIZE'],
+            'max_overflow': config['DB_MAX_OVERFLOW'],
+            'pool_timeout': config['DB_POOL_TIMEOUT'],
+            # Соединения пересоздаются раньше, чем их закроет сервер или балансировщик
+            'pool_recycle': config['DB_POOL_RECYCLE'],
+            'pool_pre_ping': True,
+            'connect_args': {
+                'connect_timeout': config['DB_CONNECT_TIMEOUT'],
+                'application_name': config['DB_APPLICATION_NAME'],
+                'options': f"-c statement_timeout={config['DB_STATEMENT_TIMEOUT']}",
+            },
+        }
+    return {}
+
+
+def _set_sqlite_pragmas(pragmas):
+    def on_connect(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        try:
+            for name, value in pragmas.items():
+                cursor.execute(f'PRAGMA {name} = {value}')
+        finally:
+            cursor.close()
+    return on_connect
+
+
+def init_database(app):
+    """Подключение db к приложению с настройками соединений для его СУБД
+
+    Явно заданные в конфигурации SQLALCHEMY_ENGINE_OPTIONS имеют приоритет.
+    """
+    config = app.config
+    config['SQLALCHEMY_DATABASE_URI'] = normalize_database_uri(config['SQLALCHEMY_DATABASE_URI'])
+    config['SQLALCHEMY_ENGINE_OPTIONS'] = {**engine_options(config),
+                                           **config.get('SQLALCHEMY_ENGINE_OPTIONS', {})}
+    db.init_app(app)
+
+    with app.app_context():
+        engine = db.engine
+        if engine.dialect.name == 'sqlite':
+            event.listen(engine, 'connect', _set_sqlite_pragmas(sqlite_pragmas(config)))
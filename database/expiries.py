@@ -0,0 +1,78 @@
+from sqlalchemy import event
+from . import db
+from .models import *
+
+# Колонки сроков действия документов, которые попадают в календарь сроков
+EXPIRY_FIELDS = {
+    'employee': (Employee, ('pass_expiry', 'medical_exam_expiry', 'psychiatric_exam_expiry')),
+    'vehicle': (Vehicle, ('pass_expiry', 'insurance_expiry', 'inspection_expiry')),
+}
+
+DOC_KIND_LABELS = {
+    'pass_expiry': 'Допуск',
+    'medical_exam_expiry': 'Медосмотр',
+    'psychiatric_exam_expiry': 'Психосвидетельствование',
+    'insurance_expiry': 'Страховка',
+    'inspection_expiry': 'Техосмотр',
+}
+
+
+def _expiry_rows(entity_type, entity_id, values):
+    return [
+        {'entity_type': entity_type, 'entity_id': entity_id,
+         'doc_kind': doc_kind, 'expiry_date': expiry_date}
+        for doc_kind, expiry_date in values
+        if expiry_date is not None
+    ]
+
+
+def _replace_expiries(connection, entity_type, target):
+    table = DocumentExpiry.__table__
+    fields = EXPIRY_FIELDS[entity_type][1]
+    connection.execute(table.delete().where(
+        table.c.entity_type == entity_type, table.c.entity_id == target.id))
+    rows = _expiry_rows(entity_type, target.id,
+                        [(field, getattr(target, field)) for field in fields])
+    if rows:
+        connection.execute(table.insert(), rows)
+
+
+def _register_listeners(entity_type, model, fields):
+    @event.listens_for(model, 'after_insert')
+    def after_insert(mapper, connection, target):
+        _replace_expiries(connection, entity_type, target)
+
+    @event.listens_for(model, 'after_update')
+    def after_update(mapper, connection, target):
+        state = db.inspect(target)
+        if any(state.attrs[field].history.has_changes() for field in fields):
+            _replace_expiries(connection, entity_type, target)
+
+    @event.listens_for(model, 'after_delete')
+    def after_delete(mapper, connection, target):
+        table = DocumentExpiry.__table__
+        connection.execute(table.delete().where(
+            table.c.entity_type == entity_type, table.c.entity_id == target.id))
+
+
+for _entity_type, (_model, _fields) in EXPIRY_FIELDS.items():
+    _register_listeners(_entity_type, _model, _fields)
+
+
+def rebuild_document_expiries(connection, entity_type=None):
+    """Полное перестроение календаря сроков
+
+    Нужно после массовых операций (bulk insert, query.update), которые
+    не вызывают событий ORM.
+    """
+    table = DocumentExpiry.__table__
+    for current_type, (model, fields) in EXPIRY_FIELDS.items():
+        if entity_type and current_type != entity_type:
+            continue
+        connection.execute(table.delete().where(table.c.entity_type == current_type))
+        columns = [model.__table__.c.id] + [model.__table__.c[field] for field in fields]
+        rows = []
+        for entity_id, *dates in connection.execute(db.select(*columns)):
+            rows.extend(_expiry_rows(current_type, entity_id, zip(fields, dates)))
+        if rows:
+            connection.execute(table.insert(), rows)
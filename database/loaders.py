@@ -0,0 +1,51 @@
+from sqlalchemy.orm import joinedload
+from .models import *
+
+# Профили загрузки связей для страниц-списков.
+# Связи "многие к одному" подтягиваются JOIN'ом в том же запросе.
+LOADER_PROFILES = {
+    'employee_list': (
+        joinedload(Employee.position),
+        joinedload(Employee.department),
+    ),
+    'employee_card': (
+        joinedload(Employee.position),
+        joinedload(Employee.department),
+        joinedload(Employee.city),
+    ),
+    'employee_select': (
+        joinedload(Employee.position),
+    ),
+    'vehicle_list': (
+        joinedload(Vehicle.vehicle_type),
+        joinedload(Vehicle.vehicle_category),
+        joinedload(Vehicle.department),
+    ),
+    'vehicle_select': (
+        joinedload(Vehicle.vehicle_type),
+    ),
+    'pass_request_list': (
+        joinedload(PassRequest.contract),
+        joinedload(PassRequest.organization_inn),
+        joinedload(PassRequest.agreement_person),
+    ),
+    'employee_uniform_list': (
+        joinedload(EmployeeUniform.employee),
+        joinedload(EmployeeUniform.uniform_type),
+    ),
+    'position_uniform_list': (
+        joinedload(PositionUniform.position),
+        joinedload(PositionUniform.uniform_type),
+    ),
+    'checklist_list': (
+        joinedload(Checklist.form),
+    ),
+    'acceptance_act_list': (
+        joinedload(AcceptanceAct.form),
+    ),
+}
+
+
+def with_profile(query, profile):
+    """Применение профиля загрузки связей к запросу"""
+    return query.options(*LOADER_PROFILES[profile])
@@ -0,0 +1,259 @@
+import json
+import uuid
+from datetime import datetime
+from sqlalchemy.dialects.postgresql import JSONB
+from . import db
+from .models import *
+from .dictionary_cache import dictionary_cache
+from .expiries import rebuild_document_expiries
+from .search import create_search_index
+from .types import JSONDocument
+
+# Версионные миграции схемы для уже существующих баз.
+# Каждая миграция выполняется один раз, номер применённой версии
+# хранится в таблице schema_migrations. Данные при этом не удаляются.
+MIGRATIONS = []
+
+
+def migration(version, description):
+    """Регистрация миграции с номером версии"""
+    def decorator(func):
+        MIGRATIONS.append((version, description, func))
+        MIGRATIONS.sort(key=lambda item: item[0])
+        return func
+    return decorator
+
+
+def _ensure_version_table(connection):
+    connection.execute(db.text(
+        'CREATE TABLE IF NOT EXISTS schema_migrations ('
+        'version INTEGER PRIMARY KEY, '
+        'description VARCHAR(200), '
+        'applied_at DATETIME)'
+    ))
+
+
+def current_version(connection):
+    """Номер последней примененной миграции"""
+    _ensure_version_table(connection)
+    return connection.execute(
+        db.text('SELECT MAX(version) FROM schema_migrations')).scalar() or 0
+
+
+def reset_history():
+    """Сброс истории миграций после пересоздания схемы через drop_all"""
+    with db.engine.begin() as connection:
+        connection.execute(db.text('DROP TABLE IF EXISTS schema_migrations'))
+
+
+def upgrade():
+    """Применение всех новых миграций; возвращает список примененных версий"""
+    applied = []
+    with db.engine.begin() as connection:
+        version = current_version(connection)
+        for number, description, func in MIGRATIONS:
+            if number <= version:
+                continue
+            func(connection)
+            connection.execute(
+                db.text('INSERT INTO schema_migrations (version, description, applied_at) '
+                        'VALUES (:version, :description, :applied_at)'),
+                {'version': number, 'description': description, 'applied_at': datetime.utcnow()}
+            )
+            applied.append(number)
+    return applied
+
+
+def _columns(connection, table_name):
+    return {column['name'] for column in db.inspect(connection).get_columns(table_name)}
+
+
+def _parse_ids(raw):
+    """Список id из JSON-строки старого формата; мусор пропускается"""
+    try:
+        values = json.loads(raw) if raw else []
+    except (TypeError, ValueError):
+        return []
+    ids = []
+    for value in values:
+        try:
+            ids.append(int(value))
+        except (TypeError, ValueError):
+            continue
+    return list(dict.fromkeys(ids))
+
+
+@migration(1, 'Связи заявок на пропуск с постами, сотрудниками и транспортом')
+def create_pass_request_links(connection):
+    tables = [pass_request_posts, pass_request_employees, pass_request_vehicles]
+    db.metadata.create_all(connection, tables=tables, checkfirst=True)
+
+    # Перенос id из JSON-колонок старой схемы
+    legacy_columns = _columns(connection, 'pass_requests')
+    links = [
+        ('post_ids', pass_request_posts, 'post_id', Post),
+        ('employee_ids', pass_request_employees, 'employee_id', Employee),
+        ('vehicle_ids', pass_request_vehicles, 'vehicle_id', Vehicle),
+    ]
+    for column, table, target_column, model in links:
+        if column not in legacy_columns:
+            continue
+
+        existing_ids = set(connection.execute(db.select(model.__table__.c.id)).scalars())
+        rows = connection.execute(
+            db.text(f'SELECT id, {column} FROM pass_requests WHERE {column} IS NOT NULL'))
+        values = [
+            {'pass_request_id': request_id, target_column: target_id}
+            for request_id, raw in rows
+            for target_id in _parse_ids(raw)
+            if target_id in existing_ids
+        ]
+        if values:
+            connection.execute(table.insert(), values)
+
+
+@migration(2, 'Журнал назначений водителей по суточным заявкам')
+def create_daily_request_assignments(connection):
+    DailyRequestAssignment.__table__.create(connection, checkfirst=True)
+
+    existing_drivers = set(connection.execute(db.select(Employee.__table__.c.id)).scalars())
+    requests = DailyRequest.__table__
+    assignments = DailyRequestAssignment.__table__
+    rows = connection.execute(
+        db.select(requests.c.id, requests.c.date, requests.c.shift_type, requests.c.vehicles_data)
+        .where(requests.c.id.not_in(db.select(assignments.c.daily_request_id)))
+    )
+
+    values = []
+    for request_id, request_date, shift_type, raw in rows:
+        # Колонка уже читается как JSON; строка - запись не в формате JSON
+        if isinstance(raw, str):
+            continue
+        vehicles_data = raw or []
+        for vehicle in vehicles_data:
+            try:
+                driver_id = int(vehicle.get('driver_id'))
+            except (TypeError, ValueError, AttributeError):
+                continue
+            if driver_id in existing_drivers:
+                values.append({
+                    'daily_request_id': request_id,
+                    'date': request_date,
+                    'shift_type': shift_type,
+                    'driver_id': driver_id,
+                    'vehicle_type': vehicle.get('vehicle_type')
+                })
+    if values:
+        connection.execute(assignments.insert(), values)
+
+
+def create_missing_indexes(connection):
+    """Создание объявленных в моделях индексов, которых еще нет в базе"""
+    inspector = db.inspect(connection)
+    existing_tables = set(inspector.get_table_names())
+    created = []
+    for table in db.metadata.sorted_tables:
+        if table.name not in existing_tables:
+            continue
+        existing = {index['name'] for index in inspector.get_indexes(table.name)}
+        for index in table.indexes:
+            if index.name not in existing:
+                index.create(connection)
+                created.append(index.name)
+    return created
+
+
+@migration(3, 'Индексы по датам окончания документов и внешним ключам')
+def create_date_and_foreign_key_indexes(connection):
+    create_missing_indexes(connection)
+
+
+@migration(4, 'Календарь сроков действия документов')
+def create_document_expiries(connection):
+    DocumentExpiry.__table__.create(connection, checkfirst=True)
+    rebuild_document_expiries(connection)
+
+
+@migration(5, 'Очередь заданий на формирование документов')
+def create_document_jobs(connection):
+    DocumentJob.__table__.create(connection, checkfirst=True)
+
+
+@migration(6, 'Полнотекстовый поиск сотрудников и транспорта')
+def create_search_tables(connection):
+    create_search_index(connection)
+
+
+@migration(7, 'JSON-колонки как JSONB и GIN-индексы (PostgreSQL)')
+def convert_json_columns(connection):
+    # В SQLite JSON по-прежнему хранится в TEXT, менять нечего
+    if connection.dialect.name != 'postgresql':
+        return
+    inspector = db.inspect(connection)
+    existing_tables = set(inspector.get_table_names())
+    for table in db.metadata.sorted_tables:
+        if table.name not in existing_tables:
+            continue
+        current_types = {column['name']: column['type'] for column in inspector.get_columns(table.name)}
+        for column in table.columns:
+            if not isinstance(column.type, JSONDocument) or column.name not in current_types:
+                continue
+            if isinstance(current_types[column.name], JSONB):
+                continue
+            connection.execute(db.text(
+                f'ALTER TABLE {table.name} ALTER COLUMN {column.name} TYPE JSONB '
+                f"USING NULLIF({column.name}, '')::jsonb"))
+    create_missing_indexes(connection)
+
+
+@migration(8, 'Удаление назначений водителя вместе с сотрудником (ON DELETE CASCADE)')
+def cascade_driver_assignments(connection):
+    table = DailyRequestAssignment.__table__
+    inspector = db.inspect(connection)
+    if connection.dialect.name == 'postgresql':
+        for foreign_key in inspector.get_foreign_keys(table.name):
+            if foreign_key['constrained_columns'] == ['driver_id']:
+                connection.execute(db.text(
+                    f"ALTER TABLE {table.name} DROP CONSTRAINT {foreign_key['name']}, "
+                    f"ADD CONSTRAINT {foreign_key['name']} FOREIGN KEY (driver_id) "
+                    f"REFERENCES employees (id) ON DELETE CASCADE"))
+        return
+    if connection.dialect.name != 'sqlite':
+        return
+    # SQLite не меняет внешние ключи существующей таблицы: таблица
+    # пересоздается по модели, строки без сотрудника или заявки не переносятся
+    for index in inspector.get_indexes(table.name):
+        connection.execute(db.text(f"DROP INDEX IF EXISTS {index['name']}"))
+    connection.execute(db.text(f'ALTER TABLE {table.name} RENAME TO {table.name}_old'))
+    table.create(connection)
+    columns = ', '.join(column.name for column in table.columns)
+    connection.execute(db.text(
+        f'INSERT INTO {table.name} ({columns}) SELECT {columns} FROM {table.name}_old '
+        f'WHERE driver_id IN (SELECT id FROM employees) '
+        f'AND daily_request_id IN (SELECT id FROM daily_requests)'))
+    connection.execute(db.text(f'DROP TABLE {table.name}_old'))
+
+
+@migration(9, 'Общие для всех процессов версии справочников')
+def create_dictionary_versions(connection):
+    DictionaryVersion.__table__.create(connection, checkfirst=True)
+    dictionary_cache.create_versions(connection)
+
+
+@migration(10, 'Метка базы в версиях справочников для ETag')
+def add_dictionary_version_tokens(connection):
+    table = DictionaryVersion.__table__
+    if 'token' not in _columns(connection, table.name):
+        connection.execute(db.text(f'ALTER TABLE {table.name} ADD COLUMN token VARCHAR(32)'))
+    for name in connection.execute(db.select(table.c.name).where(table.c.token.is_(None))).scalars():
+        connection.execute(table.update().where(table.c.name == name).values(token=uuid.uuid4().hex))
+
+
+@migration(11, 'Госномера транспорта в едином виде (как при загрузке из файла)')
+def normalize_license_plates(connection):
+    from utils.validators import Validators
+    table = Vehicle.__table__
+    for vehicle_id, plate in connection.execute(db.select(table.c.id, table.c.license_plate)).all():
+        normalized = Validators.normalize_license_plate(plate)
+        if normalized and normalized != plate:
+            connection.execute(table.update().where(table.c.id == vehicle_id).values(license_plate=normalized))
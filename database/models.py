@@ -1,6 +1,7 @@
 from . import db
+from .types import JSONDocument, gin_index
 from datetime import datetime
-import json
+import uuid
 
 
 class Department(db.Model):
@@ -35,26 +36,30 @@ class VehicleCategory(db.Model):
 
 class Employee(db.Model):
     __tablename__ = 'employees'
+    __table_args__ = (
+        # Ключ курсорной пагинации списка сотрудников
+        db.Index('ix_employees_last_name_id', 'last_name', 'id'),
+    )
     id = db.Column(db.Integer, primary_key=True)
     last_name = db.Column(db.String(100), nullable=False)
     first_name = db.Column(db.String(100), nullable=False)
     middle_name = db.Column(db.String(100))
     gender = db.Column(db.String(10))
     birth_date = db.Column(db.Date)
-    department_id = db.Column(db.Integer, db.ForeignKey('departments.id'))
-    position_id = db.Column(db.Integer, db.ForeignKey('positions.id'))
+    department_id = db.Column(db.Integer, db.ForeignKey('departments.id'), index=True)
+    position_id = db.Column(db.Integer, db.ForeignKey('positions.id'), index=True)
     passport_series = db.Column(db.String(4))
     passport_number = db.Column(db.String(6))
     phone = db.Column(db.String(20))
     email = db.Column(db.String(100))
-    city_id = db.Column(db.Integer, db.ForeignKey('cities.id'))
+    city_id = db.Column(db.Integer, db.ForeignKey('cities.id'), index=True)
     has_driver_license = db.Column(db.Boolean, default=False)
     license_categories = db.Column(db.String(100))
     pass_number = db.Column(db.String(50))
-    pass_expiry = db.Column(db.Date)
-    medical_exam_expiry = db.Column(db.Date)
+    pass_expiry = db.Column(db.Date, index=True)
+    medical_exam_expiry = db.Column(db.Date, index=True)
     medical_exam_not_required = db.Column(db.Boolean, default=False)
-    psychiatric_exam_expiry = db.Column(db.Date)
+    psychiatric_exam_expiry = db.Column(db.Date, index=True)
     psychiatric_exam_not_required = db.Column(db.Boolean, default=False)
     clothing_size = db.Column(db.String(10))
     shoe_size = db.Column(db.String(10))
@@ -73,16 +78,16 @@ class Employee(db.Model):
 class Vehicle(db.Model):
     __tablename__ = 'vehicles'
     id = db.Column(db.Integer, primary_key=True)
-    vehicle_type_id = db.Column(db.Integer, db.ForeignKey('vehicle_types.id'))
+    vehicle_type_id = db.Column(db.Integer, db.ForeignKey('vehicle_types.id'), index=True)
     brand = db.Column(db.String(100), nullable=False)
     license_plate = db.Column(db.String(20), nullable=False)
-    department_id = db.Column(db.Integer, db.ForeignKey('departments.id'))
-    vehicle_category_id = db.Column(db.Integer, db.ForeignKey('vehicle_categories.id'))
+    department_id = db.Column(db.Integer, db.ForeignKey('departments.id'), index=True)
+    vehicle_category_id = db.Column(db.Integer, db.ForeignKey('vehicle_categories.id'), index=True)
     manufacture_year = db.Column(db.Integer)
     pass_number = db.Column(db.String(50))
-    pass_expiry = db.Column(db.Date)
-    insurance_expiry = db.Column(db.Date)
-    inspection_expiry = db.Column(db.Date)
+    pass_expiry = db.Column(db.Date, index=True)
+    insurance_expiry = db.Column(db.Date, index=True)
+    inspection_expiry = db.Column(db.Date, index=True)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
@@ -90,6 +95,19 @@ class Vehicle(db.Model):
     vehicle_category = db.relationship('VehicleCategory', backref='vehicles')
     department = db.relationship('Department', backref='vehicles')
 
+class DocumentExpiry(db.Model):
+    """Срок действия документа сотрудника или транспорта (календарь сроков)"""
+    __tablename__ = 'document_expiries'
+    __table_args__ = (
+        db.Index('ix_document_expiries_entity', 'entity_type', 'entity_id', 'doc_kind', unique=True),
+        db.Index('ix_document_expiries_expiry_date_entity', 'expiry_date', 'entity_type', 'entity_id'),
+    )
+    id = db.Column(db.Integer, primary_key=True)
+    entity_type = db.Column(db.String(20), nullable=False)  # employee, vehicle
+    entity_id = db.Column(db.Integer, nullable=False)
+    doc_kind = db.Column(db.String(30), nullable=False)  # имя колонки срока: pass_expiry, ...
+    expiry_date = db.Column(db.Date, nullable=False)
+
 # Справочники для заявок на пропуска
 class Post(db.Model):
     __tablename__ = 'posts'
@@ -136,30 +154,56 @@ class AgreementPerson(db.Model):
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
+# Состав заявок на пропуск: посты, сотрудники и транспорт.
+# Обратный индекс (объект, заявка) отвечает на вопрос "в каких заявках участвует объект".
+pass_request_posts = db.Table(
+    'pass_request_posts',
+    db.Column('pass_request_id', db.Integer, db.ForeignKey('pass_requests.id', ondelete='CASCADE'), primary_key=True),
+    db.Column('post_id', db.Integer, db.ForeignKey('posts.id'), primary_key=True),
+    db.Index('ix_pass_request_posts_post_id', 'post_id', 'pass_request_id')
+)
+
+pass_request_employees = db.Table(
+    'pass_request_employees',
+    db.Column('pass_request_id', db.Integer, db.ForeignKey('pass_requests.id', ondelete='CASCADE'), primary_key=True),
+    db.Column('employee_id', db.Integer, db.ForeignKey('employees.id'), primary_key=True),
+    db.Index('ix_pass_request_employees_employee_id', 'employee_id', 'pass_request_id')
+)
+
+pass_request_vehicles = db.Table(
+    'pass_request_vehicles',
+    db.Column('pass_request_id', db.Integer, db.ForeignKey('pass_requests.id', ondelete='CASCADE'), primary_key=True),
+    db.Column('vehicle_id', db.Integer, db.ForeignKey('vehicles.id'), primary_key=True),
+    db.Index('ix_pass_request_vehicles_vehicle_id', 'vehicle_id', 'pass_request_id')
+)
+
 class PassRequest(db.Model):
     __tablename__ = 'pass_requests'
     id = db.Column(db.Integer, primary_key=True)
     request_type = db.Column(db.String(50), nullable=False)
-    post_ids = db.Column(db.Text)
     start_date = db.Column(db.Date, nullable=False)
     end_date = db.Column(db.Date, nullable=False)
-    contract_id = db.Column(db.Integer, db.ForeignKey('contracts.id'))
-    inn_id = db.Column(db.Integer, db.ForeignKey('organization_inns.id'))
+    contract_id = db.Column(db.Integer, db.ForeignKey('contracts.id'), index=True)
+    inn_id = db.Column(db.Integer, db.ForeignKey('organization_inns.id'), index=True)
     purpose = db.Column(db.Text)
     formed_by = db.Column(db.String(200), nullable=False)
-    agreement_person_id = db.Column(db.Integer, db.ForeignKey('agreement_persons.id'))
+    agreement_person_id = db.Column(db.Integer, db.ForeignKey('agreement_persons.id'), index=True)
     is_one_time = db.Column(db.Boolean, default=False)
-    employee_ids = db.Column(db.Text)
-    vehicle_ids = db.Column(db.Text)
     status = db.Column(db.String(20), default='draft')
     template_path = db.Column(db.String(500))
     generated_document_path = db.Column(db.String(500))
-    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow, index=True)
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
     contract = db.relationship('Contract', backref='pass_requests')
     organization_inn = db.relationship('OrganizationINN', backref='pass_requests')
     agreement_person = db.relationship('AgreementPerson', backref='pass_requests')
+    posts = db.relationship('Post', secondary=pass_request_posts, order_by='Post.id',
+                            backref=db.backref('pass_requests', lazy='dynamic'))
+    employees = db.relationship('Employee', secondary=pass_request_employees, order_by='Employee.id',
+                                backref=db.backref('pass_requests', lazy='dynamic'))
+    vehicles = db.relationship('Vehicle', secondary=pass_request_vehicles, order_by='Vehicle.id',
+                               backref=db.backref('pass_requests', lazy='dynamic'))
 
 # Модели для перевахтовки
 class Airport(db.Model):
@@ -172,18 +216,22 @@ class Airport(db.Model):
 
 class ShiftRequest(db.Model):
     __tablename__ = 'shift_requests'
+    __table_args__ = (
+        # Поиск заявок по сотруднику: employees @> '[id]'
+        gin_index('ix_shift_requests_employees', 'employees'),
+    )
     id = db.Column(db.Integer, primary_key=True)
     request_type = db.Column(db.String(20), nullable=False)  # charter, regular, auto
     flight_date = db.Column(db.Date)
-    departure_airport_id = db.Column(db.Integer, db.ForeignKey('airports.id'))
-    arrival_airport_id = db.Column(db.Integer, db.ForeignKey('airports.id'))
-    contract_id = db.Column(db.Integer, db.ForeignKey('contracts.id'))
+    departure_airport_id = db.Column(db.Integer, db.ForeignKey('airports.id'), index=True)
+    arrival_airport_id = db.Column(db.Integer, db.ForeignKey('airports.id'), index=True)
+    contract_id = db.Column(db.Integer, db.ForeignKey('contracts.id'), index=True)
     flight_number = db.Column(db.String(20))
     preliminary_cost = db.Column(db.String(100))
     auto_delivery_from = db.Column(db.String(200))
     auto_delivery_to = db.Column(db.String(200))
     formed_by = db.Column(db.String(200))
-    employees = db.Column(db.Text)  # JSON список ID сотрудников
+    employees = db.Column(JSONDocument)  # список ID сотрудников
     status = db.Column(db.String(20), default='draft')
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
@@ -196,7 +244,7 @@ class ShiftRequest(db.Model):
 class ElectricityReading(db.Model):
     __tablename__ = 'electricity_readings'
     id = db.Column(db.Integer, primary_key=True)
-    date = db.Column(db.Date, nullable=False)
+    date = db.Column(db.Date, nullable=False, index=True)
     previous_bpo = db.Column(db.String(20))
     previous_dormitory = db.Column(db.String(20))
     current_bpo = db.Column(db.String(20))
@@ -214,11 +262,11 @@ class WorkPermit(db.Model):
     end_date = db.Column(db.Date)
     start_time = db.Column(db.String(10))
     end_time = db.Column(db.String(10))
-    supervisor_id = db.Column(db.Integer, db.ForeignKey('employees.id'))
-    responsible_id = db.Column(db.Integer, db.ForeignKey('employees.id'))
-    executor_id = db.Column(db.Integer, db.ForeignKey('employees.id'))
+    supervisor_id = db.Column(db.Integer, db.ForeignKey('employees.id'), index=True)
+    responsible_id = db.Column(db.Integer, db.ForeignKey('employees.id'), index=True)
+    executor_id = db.Column(db.Integer, db.ForeignKey('employees.id'), index=True)
     template_path = db.Column(db.String(500))
-    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow, index=True)
 
     supervisor = db.relationship('Employee', foreign_keys=[supervisor_id], backref='supervised_permits')
     responsible = db.relationship('Employee', foreign_keys=[responsible_id], backref='responsible_permits')
@@ -227,26 +275,50 @@ class WorkPermit(db.Model):
 # Модели для диспетчера
 class DailyRequest(db.Model):
     __tablename__ = 'daily_requests'
+    __table_args__ = (
+        gin_index('ix_daily_requests_vehicles_data', 'vehicles_data'),
+    )
     id = db.Column(db.Integer, primary_key=True)
-    date = db.Column(db.Date, nullable=False)
+    date = db.Column(db.Date, nullable=False, index=True)
     shift_type = db.Column(db.String(10))  # day, night
-    vehicles_data = db.Column(db.Text)  # JSON данные по технике
+    vehicles_data = db.Column(JSONDocument)  # данные по технике
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
 
+class DailyRequestAssignment(db.Model):
+    """Назначение водителя в суточной заявке (журнал смен)"""
+    __tablename__ = 'daily_request_assignments'
+    __table_args__ = (
+        db.Index('ix_daily_request_assignments_driver_date', 'driver_id', 'date'),
+    )
+    id = db.Column(db.Integer, primary_key=True)
+    daily_request_id = db.Column(db.Integer, db.ForeignKey('daily_requests.id', ondelete='CASCADE'), nullable=False, index=True)
+    date = db.Column(db.Date, nullable=False, index=True)
+    shift_type = db.Column(db.String(10))
+    # Журнал строится по суточным заявкам: при удалении сотрудника его строки удаляются
+    driver_id = db.Column(db.Integer, db.ForeignKey('employees.id', ondelete='CASCADE'), nullable=False)
+    vehicle_type = db.Column(db.String(100))
+
+    daily_request = db.relationship('DailyRequest', backref=db.backref('assignments', cascade='all, delete-orphan'))
+    driver = db.relationship('Employee', backref=db.backref('shift_assignments', cascade='all, delete-orphan',
+                                                            passive_deletes=True))
+
 # Модели для отдела безопасности
 class Test(db.Model):
     __tablename__ = 'tests'
     id = db.Column(db.Integer, primary_key=True)
     name = db.Column(db.String(200), nullable=False)
-    questions = db.Column(db.Text)  # JSON структура вопросов
+    questions = db.Column(JSONDocument)  # структура вопросов
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
 
 class TestResult(db.Model):
     __tablename__ = 'test_results'
+    __table_args__ = (
+        db.Index('ix_test_results_test_id_created_at', 'test_id', 'created_at'),
+    )
     id = db.Column(db.Integer, primary_key=True)
     test_id = db.Column(db.Integer, db.ForeignKey('tests.id'))
     employee_name = db.Column(db.String(200), nullable=False)
-    answers = db.Column(db.Text)  # JSON ответов
+    answers = db.Column(JSONDocument)  # ответы
     score = db.Column(db.Integer)
     max_score = db.Column(db.Integer)
     passed = db.Column(db.Boolean)
@@ -285,11 +357,14 @@ class UniformType(db.Model):
 
 class EmployeeUniform(db.Model):
     __tablename__ = 'employee_uniforms'
+    __table_args__ = (
+        db.Index('ix_employee_uniforms_employee_type_expiry', 'employee_id', 'uniform_type_id', 'expiry_date'),
+    )
     id = db.Column(db.Integer, primary_key=True)
     employee_id = db.Column(db.Integer, db.ForeignKey('employees.id'))
-    uniform_type_id = db.Column(db.Integer, db.ForeignKey('uniform_types.id'))
+    uniform_type_id = db.Column(db.Integer, db.ForeignKey('uniform_types.id'), index=True)
     issue_date = db.Column(db.Date, nullable=False)
-    expiry_date = db.Column(db.Date)
+    expiry_date = db.Column(db.Date, index=True)
     quantity = db.Column(db.Integer, default=1)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
 
@@ -298,9 +373,12 @@ class EmployeeUniform(db.Model):
 
 class PositionUniform(db.Model):
     __tablename__ = 'position_uniforms'
+    __table_args__ = (
+        db.Index('ix_position_uniforms_position_type', 'position_id', 'uniform_type_id'),
+    )
     id = db.Column(db.Integer, primary_key=True)
     position_id = db.Column(db.Integer, db.ForeignKey('positions.id'))
-    uniform_type_id = db.Column(db.Integer, db.ForeignKey('uniform_types.id'))
+    uniform_type_id = db.Column(db.Integer, db.ForeignKey('uniform_types.id'), index=True)
     quantity = db.Column(db.Integer, default=1)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
 
@@ -312,15 +390,18 @@ class ChecklistForm(db.Model):
     __tablename__ = 'checklist_forms'
     id = db.Column(db.Integer, primary_key=True)
     name = db.Column(db.String(200), nullable=False)
-    form_structure = db.Column(db.Text)  # JSON структура формы
+    form_structure = db.Column(JSONDocument)  # структура формы
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
 class Checklist(db.Model):
     __tablename__ = 'checklists'
+    __table_args__ = (
+        gin_index('ix_checklists_filled_data', 'filled_data'),
+    )
     id = db.Column(db.Integer, primary_key=True)
-    form_id = db.Column(db.Integer, db.ForeignKey('checklist_forms.id'))
-    filled_data = db.Column(db.Text)  # JSON заполненных данных
+    form_id = db.Column(db.Integer, db.ForeignKey('checklist_forms.id'), index=True)
+    filled_data = db.Column(JSONDocument)  # заполненные данные
     created_by = db.Column(db.String(200))
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
 
@@ -331,16 +412,47 @@ class AcceptanceActForm(db.Model):
     id = db.Column(db.Integer, primary_key=True)
     name = db.Column(db.String(200), nullable=False)
     act_type = db.Column(db.String(50))
-    form_structure = db.Column(db.Text)
+    form_structure = db.Column(JSONDocument)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
 class AcceptanceAct(db.Model):
     __tablename__ = 'acceptance_acts'
     id = db.Column(db.Integer, primary_key=True)
-    form_id = db.Column(db.Integer, db.ForeignKey('acceptance_act_forms.id'))
-    filled_data = db.Column(db.Text)
+    form_id = db.Column(db.Integer, db.ForeignKey('acceptance_act_forms.id'), index=True)
+    filled_data = db.Column(JSONDocument)
     created_by = db.Column(db.String(200))
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
 
-    form = db.relationship('AcceptanceActForm', backref='acceptance_acts')
\ No newline at end of file
+    form = db.relationship('AcceptanceActForm', backref='acceptance_acts')
+
+# Фоновое формирование документов
+class DocumentJob(db.Model):
+    """Задание на формирование документа по шаблону"""
+    __tablename__ = 'document_jobs'
+    __table_args__ = (
+        db.Index('ix_document_jobs_kind_object', 'kind', 'object_id'),
+    )
+    id = db.Column(db.Integer, primary_key=True)
+    kind = db.Column(db.String(30), nullable=False)  # pass_request, ttn, shift_request
+    object_id = db.Column(db.Integer, nullable=False)
+    request_type = db.Column(db.String(50))
+    template_path = db.Column(db.String(500), nullable=False)
+    data = db.Column(db.Text)  # JSON данных для подстановки
+    status = db.Column(db.String(20), default='queued', index=True)  # queued, running, done, failed
+    result_path = db.Column(db.String(500))
+    error = db.Column(db.Text)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    started_at = db.Column(db.DateTime)
+    finished_at = db.Column(db.DateTime)
+
+
+# Версии справочников, общие для всех процессов (см. database/dictionary_cache.py)
+class DictionaryVersion(db.Model):
+    """Счетчик изменений справочника"""
+    __tablename__ = 'dictionary_versions'
+    name = db.Column(db.String(50), primary_key=True)
+    version = db.Column(db.Integer, nullable=False, default=0)
+    # Случайная метка строки: после пересоздания базы счетчик начинается
+    # заново, а метка - новая, поэтому ETag старой базы не совпадет
+    token = db.Column(db.String(32), nullable=False, default=lambda: uuid.uuid4().hex)
@@ -0,0 +1,263 @@
+from datetime import date, timedelta
+from . import db
+from .models import *
+from .expiries import DOC_KIND_LABELS
+
+# Проекции для JSON-ответов: из базы читаются только колонки, нужные
+# запрошенным полям, строки приходят кортежами без создания объектов ORM.
+
+
+class Projection:
+    """Поля JSON-ответа и колонки, из которых они собираются
+
+    fields - пары (имя поля, спецификация). Спецификация - колонка модели
+    или кортеж (функция, колонка, ...): функция получает значения колонок
+    и возвращает значение поля. joins - связи для внешнего соединения,
+    если поля берутся из связанных таблиц.
+    """
+
+    def __init__(self, model, fields, joins=()):
+        self.model = model
+        self.joins = joins
+        self.fields = {}
+        for name, spec in fields:
+            if isinstance(spec, tuple):
+                self.fields[name] = (spec[0], spec[1:])
+            else:
+                self.fields[name] = (None, (spec,))
+
+    def parse_fields(self, raw):
+        """Имена полей из параметра ?fields=a,b; ValueError для неизвестных"""
+        if not raw:
+            return list(self.fields)
+        names = list(dict.fromkeys(name.strip() for name in raw.split(',') if name.strip()))
+        unknown = [name for name in names if name not in self.fields]
+        if unknown:
+            raise ValueError(f"Неизвестные поля: {', '.join(unknown)}. "
+                             f"Доступны: {', '.join(self.fields)}")
+        return names or list(self.fields)
+
+    def _layout(self, names):
+        """Колонки запроса без повторов (первая - id модели) и их номера для каждого поля"""
+        columns = [self.model.id]
+        positions = {(self.model.__table__.name, self.model.id.key): 0}
+        layout = []
+        for name in names:
+            compute, sources = self.fields[name]
+            indexes = []
+            for column in sources:
+                key = (column.table.name, column.key)
+                if key not in positions:
+                    positions[key] = len(columns)
+                    columns.append(column)
+                indexes.append(positions[key])
+            layout.append((name, compute, indexes))
+        return columns, layout
+
+    def select(self, names):
+        """SELECT только нужных колонок; первая колонка результата - id модели"""
+        columns, _ = self._layout(names)
+        statement = db.select(*columns).select_from(self.model)
+        for target, onclause in self.joins:
+            statement = statement.outerjoin(target, onclause)
+        return statement
+
+    def serialize(self, names, rows):
+        """Словари полей из кортежей, полученных запросом select(names)"""
+        _, layout = self._layout(names)
+        result = []
+        for row in rows:
+            item = {}
+            for name, compute, indexes in layout:
+                if compute is None:
+                    item[name] = row[indexes[0]]
+                else:
+                    item[name] = compute(*(row[index] for index in indexes))
+            result.append(item)
+        return result
+
+    def iter_values(self, names, rows):
+        """Кортежи значений полей по одному на строку - для потоковой выгрузки"""
+        _, layout = self._layout(names)
+        for row in rows:
+            yield tuple(
+                row[indexes[0]] if compute is None else compute(*(row[index] for index in indexes))
+                for _, compute, indexes in layout
+            )
+
+    def serialize_mappings(self, names, rows):
+        """Словари полей из строк справочника (ключи - имена колонок)"""
+        layout = [(name, *self.fields[name]) for name in names]
+        result = []
+        for row in rows:
+            item = {}
+            for name, compute, sources in layout:
+                if compute is None:
+                    item[name] = row[sources[0].key]
+                else:
+                    item[name] = compute(*(row[column.key] for column in sources))
+            result.append(item)
+        return result
+
+
+def _iso_date(value):
+    return value.strftime('%Y-%m-%d') if value else None
+
+
+def _full_name(last_name, first_name, middle_name):
+    return f"{last_name} {first_name} {middle_name or ''}".strip()
+
+
+def _initials_name(last_name, first_name, middle_name):
+    initials = ''.join(f'{part[0]}.' for part in (first_name, middle_name) if part)
+    return f'{last_name} {initials}'
+
+
+def _vehicle_name(brand, license_plate):
+    return f'{brand} ({license_plate})'
+
+
+def _hint(kind, pass_number):
+    parts = [kind or '']
+    if pass_number:
+        parts.append(f'Допуск: {pass_number}')
+    return ' | '.join(part for part in parts if part)
+
+
+def _named(model):
+    return Projection(model, [('id', model.id), ('name', model.name)])
+
+
+# Справочники: поля ответов /api/<справочник>
+DICTIONARY_PROJECTIONS = {
+    'departments': _named(Department),
+    'positions': _named(Position),
+    'cities': _named(City),
+    'vehicle_types': _named(VehicleType),
+    'vehicle_categories': _named(VehicleCategory),
+    'posts': Projection(Post, [
+        ('id', Post.id),
+        ('name', Post.name),
+        ('description', Post.description),
+    ]),
+    'contracts': Projection(Contract, [
+        ('id', Contract.id),
+        ('number', Contract.number),
+        ('name', Contract.name),
+        ('start_date', (_iso_date, Contract.start_date)),
+        ('end_date', (_iso_date, Contract.end_date)),
+        ('customer', Contract.customer),
+    ]),
+    'inns': Projection(OrganizationINN, [
+        ('id', OrganizationINN.id),
+        ('inn', OrganizationINN.inn),
+        ('organization_name', OrganizationINN.organization_name),
+        ('contact_person', OrganizationINN.contact_person),
+        ('phone', OrganizationINN.phone),
+        ('email', OrganizationINN.email),
+    ]),
+    'agreement_persons': Projection(AgreementPerson, [
+        ('id', AgreementPerson.id),
+        ('full_name', AgreementPerson.full_name),
+        ('organization', AgreementPerson.organization),
+        ('position', AgreementPerson.position),
+        ('phone', AgreementPerson.phone),
+        ('email', AgreementPerson.email),
+    ]),
+}
+
+# Подсказки при вводе: /api/employees/search, /api/vehicles/search
+EMPLOYEE_SEARCH = Projection(Employee, [
+    ('id', Employee.id),
+    ('text', (_full_name, Employee.last_name, Employee.first_name, Employee.middle_name)),
+    ('hint', (_hint, Position.name, Employee.pass_number)),
+], joins=((Position, Employee.position_id == Position.id),))
+
+VEHICLE_SEARCH = Projection(Vehicle, [
+    ('id', Vehicle.id),
+    ('text', (_vehicle_name, Vehicle.brand, Vehicle.license_plate)),
+    ('hint', (_hint, VehicleType.name, Vehicle.pass_number)),
+], joins=((VehicleType, Vehicle.vehicle_type_id == VehicleType.id),))
+
+# Водители для суточной заявки: /api/dispatcher/drivers (shifts добавляется отдельно)
+DRIVER_LIST = Projection(Employee, [
+    ('id', Employee.id),
+    ('name', (_initials_name, Employee.last_name, Employee.first_name, Employee.middle_name)),
+])
+
+# Выгрузка для проверок: заголовки совпадают с колонками загрузки из файла
+EXPIRY_WARNING_DAYS = 30
+
+
+def _expiry_status(*documents):
+    """Состояние сроков по парам (вид документа, дата)"""
+    today = date.today()
+    warning = today + timedelta(days=EXPIRY_WARNING_DAYS)
+    expired = [DOC_KIND_LABELS[kind] for kind, expiry in documents if expiry and expiry < today]
+    expiring = [DOC_KIND_LABELS[kind] for kind, expiry in documents if expiry and today <= expiry <= warning]
+    parts = []
+    if expired:
+        parts.append(f"Просрочено: {', '.join(expired)}")
+    if expiring:
+        parts.append(f"Истекает в {EXPIRY_WARNING_DAYS} дней: {', '.join(expiring)}")
+    return '; '.join(parts) or 'Действительны'
+
+
+def _employee_status(pass_expiry, medical_exam_expiry, medical_exam_not_required,
+                     psychiatric_exam_expiry, psychiatric_exam_not_required):
+    return _expiry_status(
+        ('pass_expiry', pass_expiry),
+        ('medical_exam_expiry', None if medical_exam_not_required else medical_exam_expiry),
+        ('psychiatric_exam_expiry', None if psychiatric_exam_not_required else psychiatric_exam_expiry))
+
+
+def _vehicle_status(pass_expiry, insurance_expiry, inspection_expiry):
+    return _expiry_status(('pass_expiry', pass_expiry), ('insurance_expiry', insurance_expiry),
+                          ('inspection_expiry', inspection_expiry))
+
+
+EMPLOYEE_EXPORT = Projection(Employee, [
+    ('Фамилия', Employee.last_name),
+    ('Имя', Employee.first_name),
+    ('Отчество', Employee.middle_name),
+    ('Пол', Employee.gender),
+    ('Дата рождения', Employee.birth_date),
+    ('Подразделение', Department.name),
+    ('Должность', Position.name),
+    ('Серия паспорта', Employee.passport_series),
+    ('Номер паспорта', Employee.passport_number),
+    ('Телефон', Employee.phone),
+    ('Email', Employee.email),
+    ('Город', City.name),
+    ('Категории прав', Employee.license_categories),
+    ('Номер допуска', Employee.pass_number),
+    ('Допуск до', Employee.pass_expiry),
+    ('Медосмотр до', Employee.medical_exam_expiry),
+    ('Психосвидетельствование до', Employee.psychiatric_exam_expiry),
+    ('Состояние документов', (_employee_status, Employee.pass_expiry,
+                              Employee.medical_exam_expiry, Employee.medical_exam_not_required,
+                              Employee.psychiatric_exam_expiry, Employee.psychiatric_exam_not_required)),
+], joins=(
+    (Department, Employee.department_id == Department.id),
+    (Position, Employee.position_id == Position.id),
+    (City, Employee.city_id == City.id),
+))
+
+VEHICLE_EXPORT = Projection(Vehicle, [
+    ('Марка', Vehicle.brand),
+    ('Госномер', Vehicle.license_plate),
+    ('Тип ТС', VehicleType.name),
+    ('Категория', VehicleCategory.name),
+    ('Подразделение', Department.name),
+    ('Год выпуска', Vehicle.manufacture_year),
+    ('Номер допуска', Vehicle.pass_number),
+    ('Допуск до', Vehicle.pass_expiry),
+    ('Страховка до', Vehicle.insurance_expiry),
+    ('Техосмотр до', Vehicle.inspection_expiry),
+    ('Состояние документов', (_vehicle_status, Vehicle.pass_expiry,
+                              Vehicle.insurance_expiry, Vehicle.inspection_expiry)),
+], joins=(
+    (VehicleType, Vehicle.vehicle_type_id == VehicleType.id),
+    (VehicleCategory, Vehicle.vehicle_category_id == VehicleCategory.id),
+    (Department, Vehicle.department_id == Department.id),
+))
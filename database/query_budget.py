@@ -0,0 +1,51 @@
+from flask import g, has_request_context, request
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+
+class QueryBudgetExceeded(AssertionError):
+    """Запрос выполнил больше SQL-операторов, чем разрешено"""
+
+
+def query_budget(limit):
+    """Декоратор: собственный лимит SQL-операторов для представления"""
+    def decorator(view):
+        view.sql_query_budget = limit
+        return view
+    return decorator
+
+
+def _count_statement(conn, cursor, statement, parameters, context, executemany):
+    if has_request_context() and 'sql_statements' in g:
+        g.sql_statements += 1
+
+
+def init_query_budget(app):
+    """Подсчет SQL-операторов на запрос и проверка лимита в режиме отладки
+
+    Лимит берется из SQL_QUERY_BUDGET или из декоратора query_budget.
+    Превышение в режиме отладки завершает запрос ошибкой, что позволяет
+    сразу заметить появившиеся N+1 ленивые загрузки.
+    """
+    if not event.contains(Engine, 'before_cursor_execute', _count_statement):
+        event.listen(Engine, 'before_cursor_execute', _count_statement)
+
+    @app.before_request
+    def start_statement_count():
+        g.sql_statements = 0
+
+    @app.after_request
+    def check_statement_count(response):
+        # Счетчик снимается один раз, чтобы страница ошибки не проверялась повторно
+        statements = g.pop('sql_statements', None)
+        if not app.debug or statements is None:
+            return response
+
+        response.headers['X-SQL-Statements'] = str(statements)
+        view = app.view_functions.get(request.endpoint)
+        limit = getattr(view, 'sql_query_budget', app.config.get('SQL_QUERY_BUDGET'))
+        if limit is not None and statements > limit:
+            raise QueryBudgetExceeded(
+                f'{request.endpoint}: выполнено {statements} SQL-запросов при лимите {limit}'
+            )
+        return response
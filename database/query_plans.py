@@ -0,0 +1,66 @@
+from datetime import date, timedelta
+from . import db
+from .models import *
+
+# Частые запросы и индексы, которые они обязаны использовать.
+# Проверка выполняется командой flask check-query-plans.
+
+
+def _hot_queries():
+    today = date.today()
+    soon = today + timedelta(days=30)
+    return [
+        ('Просроченные документы',
+         db.select(DocumentExpiry.entity_type, DocumentExpiry.entity_id).where(
+             DocumentExpiry.expiry_date < today),
+         ['ix_document_expiries_expiry_date_entity']),
+        ('Истекающие документы',
+         db.select(DocumentExpiry.entity_type, DocumentExpiry.entity_id).where(
+             DocumentExpiry.expiry_date >= today, DocumentExpiry.expiry_date <= soon),
+         ['ix_document_expiries_expiry_date_entity']),
+        ('Суточные заявки по дате',
+         db.select(DailyRequest.id).where(DailyRequest.date >= today - timedelta(days=7)),
+         ['ix_daily_requests_date']),
+        ('Результаты теста',
+         db.select(TestResult.id).where(TestResult.test_id == 1).order_by(TestResult.created_at.desc()),
+         ['ix_test_results_test_id_created_at']),
+        ('Сотрудники подразделения',
+         db.select(Employee.id).where(Employee.department_id == 1),
+         ['ix_employees_department_id']),
+        ('Страница списка сотрудников',
+         db.select(Employee.id).where(db.tuple_(Employee.last_name, Employee.id) > db.tuple_('А', 0))
+         .order_by(Employee.last_name, Employee.id).limit(50),
+         ['ix_employees_last_name_id']),
+        ('Транспорт по типу',
+         db.select(Vehicle.id).where(Vehicle.vehicle_type_id == 1),
+         ['ix_vehicles_vehicle_type_id']),
+        ('Заявки на пропуск по договору',
+         db.select(PassRequest.id).where(PassRequest.contract_id == 1),
+         ['ix_pass_requests_contract_id']),
+        ('Спецодежда с истекающим сроком',
+         db.select(EmployeeUniform.id).where(
+             EmployeeUniform.expiry_date <= soon, EmployeeUniform.expiry_date >= today),
+         ['ix_employee_uniforms_expiry_date']),
+        ('Смены водителя за неделю',
+         db.select(db.func.count()).select_from(DailyRequestAssignment).where(
+             DailyRequestAssignment.driver_id == 1,
+             DailyRequestAssignment.date >= today - timedelta(days=7)),
+         ['ix_daily_request_assignments_driver_date']),
+    ]
+
+
+def check_query_plans(connection):
+    """EXPLAIN QUERY PLAN частых запросов; список (название, план, неиспользованные индексы)"""
+    results = []
+    for name, statement, indexes in _hot_queries():
+        sql = str(statement.compile(dialect=connection.dialect,
+                                    compile_kwargs={'literal_binds': True}))
+        try:
+            plan = '\n'.join(
+                row[-1] for row in connection.exec_driver_sql(f'EXPLAIN QUERY PLAN {sql}'))
+        except db.exc.OperationalError as e:
+            # Например, база еще не обновлена командой flask db-upgrade
+            plan = str(e.orig)
+        missing = [index for index in indexes if index not in plan]
+        results.append((name, plan, missing))
+    return results
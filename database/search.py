@@ -0,0 +1,120 @@
+import re
+from . import db
+
+# Полнотекстовый поиск сотрудников и транспорта (SQLite FTS5).
+# Таблицы индекса заполняются триггерами, поэтому в синхроне и при
+# массовых операциях в обход ORM. unicode61 приводит к нижнему регистру
+# и кириллицу; ё заменяется на е при записи и в запросе.
+# На других СУБД поиск идет через ILIKE.
+
+
+def _fold(expression):
+    return f"replace(replace({expression}, 'ё', 'е'), 'Ё', 'Е')"
+
+
+def _strip(expression, characters):
+    for character in characters:
+        expression = f"replace({expression}, '{character}', '')"
+    return expression
+
+
+# Колонки индекса: выражения над строкой исходной таблицы ({row} - new или имя таблицы)
+SEARCH_INDEXES = {
+    'employee': ('employee_search', 'employees', {
+        'full_name': _fold("{row}.last_name || ' ' || {row}.first_name || ' ' || coalesce({row}.middle_name, '')"),
+        'pass_number': "coalesce({row}.pass_number, '')",
+        # Телефон хранится цифрами, чтобы +7 (999) 123-45-67 находился по 7999123
+        'phone': _strip("coalesce({row}.phone, '')", ' -()+'),
+        'license_categories': "coalesce({row}.license_categories, '')",
+    }),
+    'vehicle': ('vehicle_search', 'vehicles', {
+        'license_plate': _fold(_strip("{row}.license_plate", ' ')),
+        'brand': _fold("{row}.brand"),
+        'pass_number': "coalesce({row}.pass_number, '')",
+    }),
+}
+
+_TOKEN_PATTERN = re.compile(r'\w+')
+
+
+def is_supported(connection):
+    return connection.dialect.name == 'sqlite'
+
+
+def create_search_index(connection):
+    """Создание таблиц FTS5 и триггеров синхронизации; на других СУБД ничего не делает"""
+    if not is_supported(connection):
+        return False
+    for index_table, source, columns in SEARCH_INDEXES.values():
+        # prefix='2 3' - индекс коротких префиксов для подсказок при вводе
+        connection.execute(db.text(
+            f"CREATE VIRTUAL TABLE IF NOT EXISTS {index_table} USING fts5("
+            f"{', '.join(columns)}, tokenize='unicode61 remove_diacritics 2', prefix='2 3')"))
+
+        names = ', '.join(columns)
+        values = ', '.join(expression.format(row='new') for expression in columns.values())
+        insert = f"INSERT INTO {index_table} (rowid, {names}) VALUES (new.id, {values});"
+        delete = f"DELETE FROM {index_table} WHERE rowid = old.id;"
+        triggers = {
+            'ai': f"AFTER INSERT ON {source} BEGIN {insert} END",
+            'ad': f"AFTER DELETE ON {source} BEGIN {delete} END",
+            'au': f"AFTER UPDATE ON {source} BEGIN {delete} {insert} END",
+        }
+        for suffix, body in triggers.items():
+            connection.execute(db.text(f"CREATE TRIGGER IF NOT EXISTS {index_table}_{suffix} {body}"))
+    rebuild_search_index(connection)
+    return True
+
+
+def rebuild_search_index(connection, entity_type=None):
+    """Полное перестроение индекса поиска по исходным таблицам"""
+    if not is_supported(connection):
+        return
+    for current_type, (index_table, source, columns) in SEARCH_INDEXES.items():
+        if entity_type and current_type != entity_type:
+            continue
+        values = ', '.join(expression.format(row=source) for expression in columns.values())
+        connection.execute(db.text(f"DELETE FROM {index_table}"))
+        connection.execute(db.text(
+            f"INSERT INTO {index_table} (rowid, {', '.join(columns)}) "
+            f"SELECT {source}.id, {values} FROM {source}"))
+
+
+def match_expression(text):
+    """Запрос FTS5: каждое слово - префикс, все слова обязательны; None для пустого ввода
+
+    Госномер и телефон хранятся в индексе без пробелов и знаков, поэтому
+    ввод из нескольких слов дополнительно ищется как одно слово: "А 123 ВС 77"
+    находит А123ВС77, "+7 (999) 123" - 79991234567.
+    """
+    tokens = _TOKEN_PATTERN.findall(text.replace('ё', 'е').replace('Ё', 'Е'))
+    if not tokens:
+        return None
+    expression = ' '.join(f'"{token}"*' for token in tokens)
+    if len(tokens) > 1:
+        expression = f'({expression}) OR "{"".join(tokens)}"*'
+    return expression
+
+
+def search_ids(entity_type, text, limit=10, offset=0):
+    """id найденных записей по релевантности
+
+    None, если индекс недоступен (другая СУБД или миграция не применена) -
+    тогда вызывающий код ищет через ILIKE.
+    """
+    if not is_supported(db.session.get_bind()):
+        return None
+    expression = match_expression(text)
+    if expression is None:
+        return []
+    index_table = SEARCH_INDEXES[entity_type][0]
+    # Сортировка по rank и LIMIT/OFFSET - внутри запроса к FTS5: ранжируются
+    # все совпадения, и любая страница выдачи берется из общего порядка
+    statement = db.text(
+        f"SELECT rowid FROM {index_table} WHERE {index_table} MATCH :query "
+        f"ORDER BY rank LIMIT :limit OFFSET :offset")
+    params = {'query': expression, 'limit': limit, 'offset': offset}
+    try:
+        return list(db.session.execute(statement, params).scalars())
+    except db.exc.OperationalError:
+        return None
@@ -0,0 +1,108 @@
+from sqlalchemy import create_engine
+from . import db
+
+# Перенос данных из другой базы (обычно из файла SQLite) в базу приложения.
+# Схема базы-приемника создается заранее (create_all и миграции), таблицы
+# копируются в порядке внешних ключей порциями, без загрузки в память.
+
+
+def _foreign_keys(table):
+    """Колонки с внешним ключом на id другой таблицы: [(колонка, таблица)]"""
+    return [
+        (foreign_key.parent, foreign_key.column.table.name)
+        for foreign_key in table.foreign_keys
+        if foreign_key.column.name == 'id'
+    ]
+
+
+def _integer(value):
+    """Целое из значения колонки SQLite: формы раньше сохраняли id строками ('5', '')"""
+    if not isinstance(value, str):
+        return value
+    value = value.strip()
+    return int(value) if value.lstrip('-').isdigit() else None
+
+
+def _reset_sequences(connection, tables):
+    """Счетчики SERIAL в PostgreSQL после вставки с явными id"""
+    if connection.dialect.name != 'postgresql':
+        return
+    for table in tables:
+        if 'id' not in table.c or not table.c.id.primary_key:
+            continue
+        connection.execute(db.text(
+            f"SELECT setval(pg_get_serial_sequence('{table.name}', 'id'), "
+            f"COALESCE((SELECT MAX(id) FROM {table.name}), 0) + 1, false)"))
+
+
+def copy_database(source_url, target_connection, batch_size=1000, log=print):
+    """Копирование всех таблиц моделей из source_url в target_connection
+
+    Таблицы-приемники должны быть пустыми. Строки со ссылками на
+    несуществующие записи (в SQLite внешние ключи раньше не проверялись):
+    необязательная ссылка обнуляется, строка с обязательной пропускается.
+    Возвращает {таблица: (скопировано, пропущено, обнулено ссылок)}.
+    """
+    tables = db.metadata.sorted_tables
+    not_empty = [
+        table.name for table in tables
+        if target_connection.execute(db.select(db.literal(1)).select_from(table).limit(1)).first()
+    ]
+    if not_empty:
+        raise ValueError(f"В базе-приемнике уже есть данные: {', '.join(not_empty)}")
+
+    source_engine = create_engine(source_url)
+    copied_ids = {}
+    stats = {}
+    try:
+        with source_engine.connect() as source:
+            inspector = db.inspect(source)
+            source_tables = set(inspector.get_table_names())
+            for table in tables:
+                if table.name not in source_tables:
+                    continue
+                source_columns = {column['name'] for column in inspector.get_columns(table.name)}
+                columns = [column for column in table.columns if column.name in source_columns]
+                foreign_keys = [(column.name, column.nullable, target)
+                                for column, target in _foreign_keys(table)
+                                if column.name in source_columns and copied_ids.get(target) is not None]
+                ids = copied_ids[table.name] = set() if 'id' in source_columns else None
+                integer_columns = [column.name for column in columns
+                                   if isinstance(column.type, db.Integer)]
+
+                copied = skipped = cleared = 0
+                result = source.execution_options(yield_per=batch_size).execute(
+                    db.select(*columns))
+                for partition in result.partitions():
+                    rows = []
+                    for row in partition:
+                        values = dict(row._mapping)
+                        for name in integer_columns:
+                            values[name] = _integer(values[name])
+                        valid = True
+                        for name, nullable, target in foreign_keys:
+                            if values[name] is None or values[name] in copied_ids[target]:
+                                continue
+                            if nullable:
+                                values[name] = None
+                                cleared += 1
+                            else:
+                                valid = False
+                                break
+                        if not valid:
+                            skipped += 1
+                            continue
+                        rows.append(values)
+                        if ids is not None:
+                            ids.add(values['id'])
+                    if rows:
+                        target_connection.execute(table.insert(), rows)
+                        copied += len(rows)
+                stats[table.name] = (copied, skipped, cleared)
+                log(f"{table.name}: {copied}" + (f", пропущено {skipped}" if skipped else '')
+                    + (f", обнулено ссылок {cleared}" if cleared else ''))
+    finally:
+        source_engine.dispose()
+
+    _reset_sequences(target_connection, tables)
+    return stats
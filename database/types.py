@@ -0,0 +1,43 @@
+import json
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy import Index
+from sqlalchemy.types import Text, TypeDecorator
+
+
+class JSONDocument(TypeDecorator):
+    """JSON-документ (список или словарь) в колонке модели
+
+    PostgreSQL - JSONB: поддерживает GIN-индексы и операторы @>, ?, ->>.
+    Другие СУБД - TEXT с JSON, в SQLite доступный функциям JSON1
+    (json_extract, json_each). В Python значение всегда список или словарь.
+    """
+
+    impl = Text
+    cache_ok = True
+
+    def load_dialect_impl(self, dialect):
+        if dialect.name == 'postgresql':
+            # None сохраняется как NULL, а не как JSON null
+            return dialect.type_descriptor(JSONB(none_as_null=True))
+        return dialect.type_descriptor(Text())
+
+    def process_bind_param(self, value, dialect):
+        if value is None or dialect.name == 'postgresql':
+            return value
+        return json.dumps(value, ensure_ascii=False)
+
+    def process_result_value(self, value, dialect):
+        if value is None or dialect.name == 'postgresql':
+            return value
+        try:
+            return json.loads(value)
+        except ValueError:
+            # Старые записи, сохраненные не в формате JSON, возвращаются как есть
+            return value
+
+
+def gin_index(name, column):
+    """GIN-индекс JSONB-колонки для запросов @>; создается только в PostgreSQL"""
+    index = Index(name, column, postgresql_using='gin', postgresql_ops={column: 'jsonb_path_ops'})
+    return index.ddl_if(dialect='postgresql')
+
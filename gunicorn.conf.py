@@ -0,0 +1,29 @@
+from config import Config
+
+# Настройки gunicorn: gunicorn -c gunicorn.conf.py wsgi:app
+# Схему базы перед запуском обновляет flask --app app init-db.
+# Число процессов и потоков - WEB_WORKERS и WEB_THREADS (config.py).
+
+bind = Config.WEB_BIND
+workers = Config.WEB_WORKERS
+# Потоки внутри процесса обслуживают запросы, ожидающие базу или файлы
+worker_class = 'gthread'
+threads = Config.WEB_THREADS
+timeout = Config.WEB_TIMEOUT
+# Приложение импортируется один раз в главном процессе до fork:
+# процессы запускаются быстрее и разделяют память загруженных модулей
+preload_app = True
+accesslog = '-'
+
+
+def post_fork(server, worker):
+    from app import after_fork
+    after_fork(server.app.wsgi())
+
+
+def post_worker_init(worker):
+    # Задания, прерванные остановкой, продолжает только первый процесс
+    if worker.age == 1:
+        from utils.document_queue import document_queue
+        with worker.wsgi.app_context():
+            document_queue.resume_pending()
@@ -1,11 +1,15 @@
-from app import app, db
+from app import create_app
+from database import db
 from database.models import *
+from database.migrations import reset_history, upgrade
 
 def init_database():
+    app = create_app()
     with app.app_context():
         try:
             # Пытаемся удалить таблицы если они существуют
             db.drop_all()
+            reset_history()
             print("Старые таблицы удалены")
         except Exception as e:
             print(f"Ошибка при удалении таблиц: {e}")
@@ -13,6 +17,7 @@ def init_database():
         
         # Создаем все таблицы
         db.create_all()
+        upgrade()
         print("Созданы новые таблицы базы данных")
         
         # Создаем базовые справочники
@@ -1,4 +1,14 @@
-from app import app
+from waitress import serve
+from config import Config
+from utils.document_queue import document_queue
+from wsgi import app
+
+# Запуск без gunicorn (например, в Windows): waitress, один процесс с
+# WEB_WORKERS * WEB_THREADS потоками. Схему базы перед запуском обновляет
+# flask --app app init-db.
 
 if __name__ == '__main__':
-    app.run(debug=True, host='0.0.0.0', port=5000)
\ No newline at end of file
+    with app.app_context():
+        document_queue.resume_pending()
+    host, port = Config.WEB_BIND.rsplit(':', 1)
+    serve(app, host=host, port=int(port), threads=Config.WEB_WORKERS * Config.WEB_THREADS)
@@ -4,10 +4,13 @@ class Calendar {
         this.currentDate = new Date();
         this.selectedDate = new Date();
         this.events = this.loadEvents();
+        // Сроки документов с сервера по месяцам: {'ГГГГ-ММ': [события]}
+        this.documentEvents = {};
         this.init();
     }
 
     init() {
+        if (!this.container) return;
         this.render();
         this.loadHolidays();
     }
@@ -97,6 +100,33 @@ class Calendar {
         `;
 
         this.container.innerHTML = calendarHTML;
+        this.loadDocumentExpiries(year, month);
+    }
+
+    monthKey(year, month) {
+        return `${year}-${String(month + 1).padStart(2, '0')}`;
+    }
+
+    async loadDocumentExpiries(year, month) {
+        // Лента сроков документов запрашивается один раз на месяц
+        const url = this.container.dataset.expiriesUrl;
+        const key = this.monthKey(year, month);
+        if (!url || key in this.documentEvents) return;
+
+        this.documentEvents[key] = [];
+        try {
+            const response = await fetch(`${url}?month=${key}`);
+            if (!response.ok) throw new Error(`HTTP ${response.status}`);
+            this.documentEvents[key] = await response.json();
+        } catch (error) {
+            delete this.documentEvents[key];
+            console.error('Ошибка загрузки сроков документов:', error);
+            return;
+        }
+
+        if (key === this.monthKey(this.currentDate.getFullYear(), this.currentDate.getMonth())) {
+            this.render();
+        }
     }
 
     getWeekdays() {
@@ -131,11 +161,12 @@ class Calendar {
     }
 
     hasEvents(date) {
-        return this.events.some(event => this.isSameDay(new Date(event.date), date));
+        return this.getEventsForDate(date).length > 0;
     }
 
     getEventsForDate(date) {
-        return this.events.filter(event => this.isSameDay(new Date(event.date), date));
+        const documentEvents = this.documentEvents[this.monthKey(date.getFullYear(), date.getMonth())] || [];
+        return this.events.concat(documentEvents).filter(event => this.isSameDay(new Date(event.date), date));
     }
 
     renderDayEvents() {
@@ -194,8 +194,7 @@ class DictionariesManager {
             </div>
         `;
 
-        fetch(`/api/${dictType}`)
-            .then(response => response.json())
+        DictionaryStore.getJSON(`/api/${dictType}`)
             .then(data => {
                 this.renderDictionaryList(dictType, data);
                 section.setAttribute('data-loaded', 'true');
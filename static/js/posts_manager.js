@@ -18,8 +18,7 @@ class PostsManager {
     }
 
     loadPosts() {
-        fetch('/api/posts')
-            .then(response => response.json())
+        DictionaryStore.getJSON('/api/posts')
             .then(posts => {
                 this.renderPosts(posts);
             })
@@ -44,6 +44,46 @@ function validateForm(formId) {
     return isValid;
 }
 
+// Локальная копия справочников: запрос с If-None-Match,
+// при ответе 304 используется сохраненный ранее список
+class DictionaryStore {
+    static storageKey(url) {
+        return `dictionary:${url}`;
+    }
+
+    static read(url) {
+        try {
+            return JSON.parse(localStorage.getItem(this.storageKey(url)));
+        } catch (error) {
+            return null;
+        }
+    }
+
+    static async getJSON(url) {
+        const cached = this.read(url);
+        const headers = cached ? {'If-None-Match': cached.etag} : {};
+        const response = await fetch(url, {headers: headers, cache: 'no-store'});
+
+        if (response.status === 304 && cached) {
+            return cached.data;
+        }
+        if (!response.ok) {
+            throw new Error(`HTTP ${response.status}`);
+        }
+
+        const data = await response.json();
+        const etag = response.headers.get('ETag');
+        if (etag) {
+            try {
+                localStorage.setItem(this.storageKey(url), JSON.stringify({etag: etag, data: data}));
+            } catch (error) {
+                // Хранилище переполнено - работаем без локальной копии
+            }
+        }
+        return data;
+    }
+}
+
 // API функции для работы со справочниками
 class DictionaryAPI {
     static async addItem(endpoint, data) {
@@ -99,6 +139,54 @@ class FileUtils {
     }
 }
 
+// Ожидание фоновых заданий формирования документов:
+// элементы с data-job-url опрашивают сервер, пока документ не будет готов
+class DocumentJobs {
+    static watchAll() {
+        document.querySelectorAll('[data-job-url]').forEach(element => DocumentJobs.watch(element));
+    }
+
+    // Элементы создаются через DOM: текст ошибки сервера не разбирается как HTML
+    static showError(element, text, title = '') {
+        const badge = document.createElement('span');
+        badge.className = 'badge bg-danger';
+        badge.title = title;
+        badge.textContent = text;
+        element.replaceChildren(badge);
+    }
+
+    static async watch(element, delay = 1000) {
+        try {
+            const response = await fetch(element.dataset.jobUrl);
+            // Задание не найдено или сервер ответил ошибкой - опрос прекращается
+            if (!response.ok) {
+                DocumentJobs.showError(element, 'Статус недоступен', `HTTP ${response.status}`);
+                return;
+            }
+            const job = await response.json();
+
+            if (job.status === 'done') {
+                const link = document.createElement('a');
+                link.href = job.download_url;
+                link.className = 'btn btn-sm btn-primary';
+                link.title = 'Скачать';
+                link.textContent = '📄';
+                element.replaceChildren(link);
+                return;
+            }
+            if (job.status === 'failed') {
+                DocumentJobs.showError(element, 'Ошибка формирования', job.error || '');
+                return;
+            }
+        } catch (error) {
+            // Сеть недоступна - повторяем позже
+            console.error('Ошибка проверки задания:', error);
+        }
+        // Интервал опроса растет до 5 секунд
+        setTimeout(() => DocumentJobs.watch(element, Math.min(delay * 1.5, 5000)), delay);
+    }
+}
+
 // Поиск и фильтрация в таблицах
 class TableFilter {
     static initSearch(inputId, tableSelector) {
@@ -201,4 +289,5 @@ class TimeManager {
 // Инициализация при загрузке страницы
 document.addEventListener('DOMContentLoaded', function() {
     TimeManager.initTimeSensitiveElements();
+    DocumentJobs.watchAll();
 });
\ No newline at end of file
@@ -0,0 +1,276 @@
+// Выбор сотрудников и транспорта с подсказками при вводе.
+// Списки не выводятся в HTML формы: элемент с data-typeahead-url
+// запрашивает страницы поиска по мере ввода. Запросы откладываются
+// до паузы в наборе, устаревший запрос отменяется, ответы хранятся
+// в памяти страницы, следующая страница подгружается заранее.
+//
+// <div data-typeahead-url="/api/employees/search" data-name="employees"
+//      data-multiple data-required data-placeholder="..."></div>
+//
+// Выбранные значения попадают в форму скрытыми полями с именем data-name.
+// При изменении выбора на элементе возникает событие typeahead:change.
+class Typeahead {
+    // Размер страницы при загрузке всего списка (SEARCH_PAGE_LIMIT на сервере)
+    static PAGE_LIMIT = 50;
+
+    static initAll() {
+        document.querySelectorAll('[data-typeahead-url]').forEach(element => new Typeahead(element));
+    }
+
+    constructor(element, options = {}) {
+        this.element = element;
+        element.typeahead = this;
+        this.options = Object.assign({
+            url: element.dataset.typeaheadUrl,
+            name: element.dataset.name,
+            multiple: 'multiple' in element.dataset,
+            required: 'required' in element.dataset,
+            placeholder: element.dataset.placeholder || 'Начните вводить...',
+            limit: 10,
+            delay: 250,
+            minLength: 1
+        }, options);
+
+        this.cache = new Map();
+        this.controller = null;
+        this.timer = null;
+        this.query = '';
+        this.nextOffset = null;
+        this.loading = false;
+        this.selected = new Map();
+
+        this.render();
+    }
+
+    render() {
+        this.element.classList.add('typeahead');
+
+        this.chips = document.createElement('div');
+        this.chips.className = 'typeahead-chips';
+
+        this.input = document.createElement('input');
+        this.input.type = 'text';
+        this.input.className = 'form-control';
+        this.input.placeholder = this.options.placeholder;
+        this.input.autocomplete = 'off';
+        this.input.addEventListener('input', () => this.schedule());
+        this.input.addEventListener('focus', () => this.input.value.trim() && this.schedule(0));
+        this.input.addEventListener('keydown', event => {
+            if (event.key === 'Enter') event.preventDefault();
+            if (event.key === 'Escape') this.close();
+        });
+
+        this.dropdown = document.createElement('div');
+        this.dropdown.className = 'typeahead-dropdown';
+        this.dropdown.addEventListener('scroll', () => {
+            const bottom = this.dropdown.scrollTop + this.dropdown.clientHeight;
+            if (bottom >= this.dropdown.scrollHeight - 20) this.loadMore();
+        });
+
+        this.element.append(this.chips, this.input, this.dropdown);
+        this.updateRequired();
+
+        document.addEventListener('click', event => {
+            if (!this.element.contains(event.target)) this.close();
+        });
+    }
+
+    schedule(delay = this.options.delay) {
+        clearTimeout(this.timer);
+        this.timer = setTimeout(() => this.search(this.input.value.trim()), delay);
+    }
+
+    async search(query) {
+        this.query = query;
+        if (query.length < this.options.minLength) {
+            this.close();
+            return;
+        }
+        const page = await this.fetchPage(query, 0);
+        // Пока шел запрос, пользователь мог изменить ввод
+        if (!page || query !== this.query) return;
+
+        this.dropdown.innerHTML = '';
+        this.showPage(page);
+        this.dropdown.classList.add('show');
+    }
+
+    async loadMore() {
+        if (this.nextOffset === null || this.loading) return;
+        this.loading = true;
+        const query = this.query;
+        const page = await this.fetchPage(query, this.nextOffset);
+        this.loading = false;
+        if (page && query === this.query) this.showPage(page);
+    }
+
+    showPage(page) {
+        page.items.forEach(item => this.dropdown.appendChild(this.createItem(item)));
+        if (!this.dropdown.children.length) {
+            const empty = document.createElement('div');
+            empty.className = 'typeahead-empty';
+            empty.textContent = 'Ничего не найдено';
+            this.dropdown.appendChild(empty);
+        }
+        this.nextOffset = page.next_offset;
+        // Следующая страница запрашивается заранее и ждет в кэше
+        if (page.next_offset !== null) this.fetchPage(this.query, page.next_offset, true);
+    }
+
+    cacheKey(query, offset) {
+        return `${query.toLowerCase()}\n${offset}`;
+    }
+
+    async fetchPage(query, offset, prefetch = false) {
+        const key = this.cacheKey(query, offset);
+        if (this.cache.has(key)) return this.cache.get(key);
+
+        // Новый запрос отменяет предыдущий, предзагрузка не отменяет ничего
+        let signal;
+        if (!prefetch) {
+            if (this.controller) this.controller.abort();
+            this.controller = new AbortController();
+            signal = this.controller.signal;
+        }
+
+        const params = new URLSearchParams({q: query, offset: offset, limit: this.options.limit});
+        try {
+            const response = await fetch(`${this.options.url}?${params}`, {signal: signal});
+            if (!response.ok) throw new Error(`HTTP ${response.status}`);
+            const page = await response.json();
+            this.cache.set(key, page);
+            return page;
+        } catch (error) {
+            if (error.name !== 'AbortError') console.error('Ошибка поиска:', error);
+            return null;
+        }
+    }
+
+    createItem(item) {
+        const element = document.createElement('div');
+        element.className = 'typeahead-item';
+        if (this.selected.has(String(item.id))) element.classList.add('selected');
+
+        const text = document.createElement('div');
+        text.className = 'multiselect-text-primary';
+        text.textContent = item.text;
+        element.appendChild(text);
+        if (item.hint) {
+            const hint = document.createElement('div');
+            hint.className = 'multiselect-text-secondary';
+            hint.textContent = item.hint;
+            element.appendChild(hint);
+        }
+
+        element.addEventListener('click', () => {
+            this.toggle(item);
+            element.classList.toggle('selected', this.selected.has(String(item.id)));
+        });
+        return element;
+    }
+
+    toggle(item) {
+        const id = String(item.id);
+        if (this.selected.has(id)) {
+            this.remove(id);
+            return;
+        }
+        if (!this.options.multiple) {
+            this.selected.forEach((_, selectedId) => this.remove(selectedId, false));
+            this.close();
+        }
+        this.add(item);
+    }
+
+    add(item, notify = true) {
+        const id = String(item.id);
+        const chip = document.createElement('span');
+        chip.className = 'typeahead-chip';
+        chip.textContent = item.text;
+        const hidden = document.createElement('input');
+        hidden.type = 'hidden';
+        hidden.name = this.options.name;
+        hidden.value = id;
+        const remove = document.createElement('button');
+        remove.type = 'button';
+        remove.className = 'btn-close btn-close-sm';
+        remove.title = 'Убрать';
+        remove.addEventListener('click', () => this.remove(id));
+        chip.append(hidden, remove);
+
+        this.chips.appendChild(chip);
+        this.selected.set(id, chip);
+        if (!this.options.multiple) this.input.value = '';
+        if (notify) this.changed();
+    }
+
+    remove(id, notify = true) {
+        const chip = this.selected.get(id);
+        if (!chip) return;
+        chip.remove();
+        this.selected.delete(id);
+        if (notify) this.changed();
+    }
+
+    // Выбор всех записей по текущему вводу (при пустом вводе - всех записей);
+    // если все они уже выбраны - снятие выбора
+    async toggleAll() {
+        const query = this.input.value.trim();
+        const items = [];
+        let offset = 0;
+        while (offset !== null) {
+            const params = new URLSearchParams({q: query, offset: offset, limit: Typeahead.PAGE_LIMIT});
+            try {
+                const response = await fetch(`${this.options.url}?${params}`);
+                if (!response.ok) throw new Error(`HTTP ${response.status}`);
+                const page = await response.json();
+                items.push(...page.items);
+                offset = page.next_offset;
+            } catch (error) {
+                console.error('Ошибка загрузки списка:', error);
+                return;
+            }
+        }
+
+        const allSelected = items.length && items.every(item => this.selected.has(String(item.id)));
+        items.forEach(item => {
+            const id = String(item.id);
+            if (allSelected) this.remove(id, false);
+            else if (!this.selected.has(id)) this.add(item, false);
+        });
+        this.close();
+        this.changed();
+    }
+
+    // Подписи выбранных значений в порядке выбора
+    selectedTexts() {
+        return Array.from(this.selected.values()).map(chip => chip.textContent);
+    }
+
+    clear() {
+        this.selected.forEach((_, id) => this.remove(id, false));
+        this.changed();
+    }
+
+    changed() {
+        this.updateRequired();
+        this.element.dispatchEvent(new CustomEvent('typeahead:change', {
+            bubbles: true,
+            detail: {count: this.selected.size}
+        }));
+    }
+
+    // Обязательное поле: браузер не даст отправить форму, пока ничего не выбрано
+    updateRequired() {
+        if (!this.options.required) return;
+        this.input.setCustomValidity(this.selected.size ? '' : 'Выберите значение из списка');
+    }
+
+    close() {
+        this.dropdown.classList.remove('show');
+    }
+}
+
+document.addEventListener('DOMContentLoaded', function() {
+    Typeahead.initAll();
+});
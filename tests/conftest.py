@@ -0,0 +1,25 @@
+import pytest
+from app import create_app
+from database import db
+
+
+@pytest.fixture
+def app(tmp_path):
+    """Приложение с отдельной базой SQLite и хранилищем во временном каталоге"""
+    app = create_app({
+        'TESTING': True,
+        'SQLALCHEMY_DATABASE_URI': f"sqlite:///{tmp_path / 'test.db'}",
+        'UPLOAD_FOLDER': str(tmp_path / 'storage'),
+    })
+    result = app.test_cli_runner().invoke(args=['init-db'])
+    assert result.exit_code == 0, result.output
+    with app.app_context():
+        yield app
+        db.session.remove()
+        for engine in db.engines.values():
+            engine.dispose()
+
+
+@pytest.fixture
+def client(app):
+    return app.test_client()
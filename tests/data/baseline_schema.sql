@@ -0,0 +1,350 @@
+-- Схема базы до версионных миграций (create_all исходных моделей)
+CREATE TABLE departments (
+	id INTEGER NOT NULL,
+	name VARCHAR(200) NOT NULL,
+	created_at DATETIME,
+	PRIMARY KEY (id)
+);
+
+CREATE TABLE positions (
+	id INTEGER NOT NULL,
+	name VARCHAR(200) NOT NULL,
+	created_at DATETIME,
+	PRIMARY KEY (id)
+);
+
+CREATE TABLE cities (
+	id INTEGER NOT NULL,
+	name VARCHAR(100) NOT NULL,
+	created_at DATETIME,
+	PRIMARY KEY (id)
+);
+
+CREATE TABLE vehicle_types (
+	id INTEGER NOT NULL,
+	name VARCHAR(100) NOT NULL,
+	created_at DATETIME,
+	PRIMARY KEY (id)
+);
+
+CREATE TABLE vehicle_categories (
+	id INTEGER NOT NULL,
+	name VARCHAR(10) NOT NULL,
+	created_at DATETIME,
+	PRIMARY KEY (id)
+);
+
+CREATE TABLE posts (
+	id INTEGER NOT NULL,
+	name VARCHAR(200) NOT NULL,
+	description TEXT,
+	is_active BOOLEAN,
+	created_at DATETIME,
+	updated_at DATETIME,
+	PRIMARY KEY (id)
+);
+
+CREATE TABLE contracts (
+	id INTEGER NOT NULL,
+	number VARCHAR(100) NOT NULL,
+	name VARCHAR(300),
+	start_date DATE NOT NULL,
+	end_date DATE,
+	customer VARCHAR(300),
+	is_active BOOLEAN,
+	created_at DATETIME,
+	updated_at DATETIME,
+	PRIMARY KEY (id),
+	UNIQUE (number)
+);
+
+CREATE TABLE organization_inns (
+	id INTEGER NOT NULL,
+	inn VARCHAR(12) NOT NULL,
+	organization_name VARCHAR(300) NOT NULL,
+	contact_person VARCHAR(200),
+	phone VARCHAR(20),
+	email VARCHAR(100),
+	is_active BOOLEAN,
+	created_at DATETIME,
+	updated_at DATETIME,
+	PRIMARY KEY (id),
+	UNIQUE (inn)
+);
+
+CREATE TABLE agreement_persons (
+	id INTEGER NOT NULL,
+	full_name VARCHAR(200) NOT NULL,
+	organization VARCHAR(300),
+	position VARCHAR(200),
+	phone VARCHAR(20),
+	email VARCHAR(100),
+	is_active BOOLEAN,
+	created_at DATETIME,
+	updated_at DATETIME,
+	PRIMARY KEY (id)
+);
+
+CREATE TABLE airports (
+	id INTEGER NOT NULL,
+	name VARCHAR(200) NOT NULL,
+	code VARCHAR(10),
+	is_active BOOLEAN,
+	created_at DATETIME,
+	PRIMARY KEY (id)
+);
+
+CREATE TABLE electricity_readings (
+	id INTEGER NOT NULL,
+	date DATE NOT NULL,
+	previous_bpo VARCHAR(20),
+	previous_dormitory VARCHAR(20),
+	current_bpo VARCHAR(20),
+	current_dormitory VARCHAR(20),
+	file_path VARCHAR(500),
+	created_at DATETIME,
+	PRIMARY KEY (id)
+);
+
+CREATE TABLE daily_requests (
+	id INTEGER NOT NULL,
+	date DATE NOT NULL,
+	shift_type VARCHAR(10),
+	vehicles_data TEXT,
+	created_at DATETIME,
+	PRIMARY KEY (id)
+);
+
+CREATE TABLE tests (
+	id INTEGER NOT NULL,
+	name VARCHAR(200) NOT NULL,
+	questions TEXT,
+	created_at DATETIME,
+	PRIMARY KEY (id)
+);
+
+CREATE TABLE ttns (
+	id INTEGER NOT NULL,
+	date DATE NOT NULL,
+	number VARCHAR(50) NOT NULL,
+	sender_organization VARCHAR(300),
+	receiver_organization VARCHAR(300),
+	places_count VARCHAR(20),
+	cargo_weight VARCHAR(20),
+	loading_address VARCHAR(300),
+	unloading_address VARCHAR(300),
+	loading_time VARCHAR(10),
+	sender_individual VARCHAR(200),
+	sender_legal VARCHAR(200),
+	carrier_individual VARCHAR(200),
+	vehicle_info VARCHAR(200),
+	waybill_number VARCHAR(50),
+	trailer_info VARCHAR(200),
+	template_path VARCHAR(500),
+	created_at DATETIME,
+	PRIMARY KEY (id)
+);
+
+CREATE TABLE uniform_types (
+	id INTEGER NOT NULL,
+	name VARCHAR(200) NOT NULL,
+	wear_period INTEGER,
+	created_at DATETIME,
+	PRIMARY KEY (id)
+);
+
+CREATE TABLE checklist_forms (
+	id INTEGER NOT NULL,
+	name VARCHAR(200) NOT NULL,
+	form_structure TEXT,
+	created_at DATETIME,
+	updated_at DATETIME,
+	PRIMARY KEY (id)
+);
+
+CREATE TABLE acceptance_act_forms (
+	id INTEGER NOT NULL,
+	name VARCHAR(200) NOT NULL,
+	act_type VARCHAR(50),
+	form_structure TEXT,
+	created_at DATETIME,
+	updated_at DATETIME,
+	PRIMARY KEY (id)
+);
+
+CREATE TABLE employees (
+	id INTEGER NOT NULL,
+	last_name VARCHAR(100) NOT NULL,
+	first_name VARCHAR(100) NOT NULL,
+	middle_name VARCHAR(100),
+	gender VARCHAR(10),
+	birth_date DATE,
+	department_id INTEGER,
+	position_id INTEGER,
+	passport_series VARCHAR(4),
+	passport_number VARCHAR(6),
+	phone VARCHAR(20),
+	email VARCHAR(100),
+	city_id INTEGER,
+	has_driver_license BOOLEAN,
+	license_categories VARCHAR(100),
+	pass_number VARCHAR(50),
+	pass_expiry DATE,
+	medical_exam_expiry DATE,
+	medical_exam_not_required BOOLEAN,
+	psychiatric_exam_expiry DATE,
+	psychiatric_exam_not_required BOOLEAN,
+	clothing_size VARCHAR(10),
+	shoe_size VARCHAR(10),
+	height VARCHAR(10),
+	photo_path VARCHAR(500),
+	created_at DATETIME,
+	updated_at DATETIME,
+	PRIMARY KEY (id),
+	FOREIGN KEY(department_id) REFERENCES departments (id),
+	FOREIGN KEY(position_id) REFERENCES positions (id),
+	FOREIGN KEY(city_id) REFERENCES cities (id)
+);
+
+CREATE TABLE vehicles (
+	id INTEGER NOT NULL,
+	vehicle_type_id INTEGER,
+	brand VARCHAR(100) NOT NULL,
+	license_plate VARCHAR(20) NOT NULL,
+	department_id INTEGER,
+	vehicle_category_id INTEGER,
+	manufacture_year INTEGER,
+	pass_number VARCHAR(50),
+	pass_expiry DATE,
+	insurance_expiry DATE,
+	inspection_expiry DATE,
+	created_at DATETIME,
+	updated_at DATETIME,
+	PRIMARY KEY (id),
+	FOREIGN KEY(vehicle_type_id) REFERENCES vehicle_types (id),
+	FOREIGN KEY(department_id) REFERENCES departments (id),
+	FOREIGN KEY(vehicle_category_id) REFERENCES vehicle_categories (id)
+);
+
+CREATE TABLE pass_requests (
+	id INTEGER NOT NULL,
+	request_type VARCHAR(50) NOT NULL,
+	post_ids TEXT,
+	start_date DATE NOT NULL,
+	end_date DATE NOT NULL,
+	contract_id INTEGER,
+	inn_id INTEGER,
+	purpose TEXT,
+	formed_by VARCHAR(200) NOT NULL,
+	agreement_person_id INTEGER,
+	is_one_time BOOLEAN,
+	employee_ids TEXT,
+	vehicle_ids TEXT,
+	status VARCHAR(20),
+	template_path VARCHAR(500),
+	generated_document_path VARCHAR(500),
+	created_at DATETIME,
+	updated_at DATETIME,
+	PRIMARY KEY (id),
+	FOREIGN KEY(contract_id) REFERENCES contracts (id),
+	FOREIGN KEY(inn_id) REFERENCES organization_inns (id),
+	FOREIGN KEY(agreement_person_id) REFERENCES agreement_persons (id)
+);
+
+CREATE TABLE shift_requests (
+	id INTEGER NOT NULL,
+	request_type VARCHAR(20) NOT NULL,
+	flight_date DATE,
+	departure_airport_id INTEGER,
+	arrival_airport_id INTEGER,
+	contract_id INTEGER,
+	flight_number VARCHAR(20),
+	preliminary_cost VARCHAR(100),
+	auto_delivery_from VARCHAR(200),
+	auto_delivery_to VARCHAR(200),
+	formed_by VARCHAR(200),
+	employees TEXT,
+	status VARCHAR(20),
+	created_at DATETIME,
+	updated_at DATETIME,
+	PRIMARY KEY (id),
+	FOREIGN KEY(departure_airport_id) REFERENCES airports (id),
+	FOREIGN KEY(arrival_airport_id) REFERENCES airports (id),
+	FOREIGN KEY(contract_id) REFERENCES contracts (id)
+);
+
+CREATE TABLE test_results (
+	id INTEGER NOT NULL,
+	test_id INTEGER,
+	employee_name VARCHAR(200) NOT NULL,
+	answers TEXT,
+	score INTEGER,
+	max_score INTEGER,
+	passed BOOLEAN,
+	created_at DATETIME,
+	PRIMARY KEY (id),
+	FOREIGN KEY(test_id) REFERENCES tests (id)
+);
+
+CREATE TABLE position_uniforms (
+	id INTEGER NOT NULL,
+	position_id INTEGER,
+	uniform_type_id INTEGER,
+	quantity INTEGER,
+	created_at DATETIME,
+	PRIMARY KEY (id),
+	FOREIGN KEY(position_id) REFERENCES positions (id),
+	FOREIGN KEY(uniform_type_id) REFERENCES uniform_types (id)
+);
+
+CREATE TABLE checklists (
+	id INTEGER NOT NULL,
+	form_id INTEGER,
+	filled_data TEXT,
+	created_by VARCHAR(200),
+	created_at DATETIME,
+	PRIMARY KEY (id),
+	FOREIGN KEY(form_id) REFERENCES checklist_forms (id)
+);
+
+CREATE TABLE acceptance_acts (
+	id INTEGER NOT NULL,
+	form_id INTEGER,
+	filled_data TEXT,
+	created_by VARCHAR(200),
+	created_at DATETIME,
+	PRIMARY KEY (id),
+	FOREIGN KEY(form_id) REFERENCES acceptance_act_forms (id)
+);
+
+CREATE TABLE work_permits (
+	id INTEGER NOT NULL,
+	number VARCHAR(50) NOT NULL,
+	tire_type VARCHAR(100),
+	start_date DATE,
+	end_date DATE,
+	start_time VARCHAR(10),
+	end_time VARCHAR(10),
+	supervisor_id INTEGER,
+	responsible_id INTEGER,
+	executor_id INTEGER,
+	template_path VARCHAR(500),
+	created_at DATETIME,
+	PRIMARY KEY (id),
+	FOREIGN KEY(supervisor_id) REFERENCES employees (id),
+	FOREIGN KEY(responsible_id) REFERENCES employees (id),
+	FOREIGN KEY(executor_id) REFERENCES employees (id)
+);
+
+CREATE TABLE employee_uniforms (
+	id INTEGER NOT NULL,
+	employee_id INTEGER,
+	uniform_type_id INTEGER,
+	issue_date DATE NOT NULL,
+	expiry_date DATE,
+	quantity INTEGER,
+	created_at DATETIME,
+	PRIMARY KEY (id),
+	FOREIGN KEY(employee_id) REFERENCES employees (id),
+	FOREIGN KEY(uniform_type_id) REFERENCES uniform_types (id)
+);
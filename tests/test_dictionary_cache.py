@@ -0,0 +1,46 @@
+from database import db
+from database.dictionary_cache import dictionary_cache
+from database.migrations import reset_history, upgrade
+from database.models import Department
+
+
+def test_etag_changes_with_data(client):
+    response = client.get('/api/departments')
+    etag = response.headers['ETag']
+    assert client.get('/api/departments', headers={'If-None-Match': etag}).status_code == 304
+
+    client.post('/api/departments', json={'name': 'Гараж'})
+    response = client.get('/api/departments', headers={'If-None-Match': etag})
+    assert response.status_code == 200
+    assert 'Гараж' in [row['name'] for row in response.get_json()]
+
+
+def test_change_from_another_process_is_visible(app, client):
+    client.get('/api/departments')
+    # Другой процесс меняет строку и увеличивает версию в той же транзакции
+    with db.engine.begin() as connection:
+        connection.execute(db.text("UPDATE departments SET name = 'Склад №2' WHERE name = 'Склад'"))
+        connection.execute(db.text(
+            "UPDATE dictionary_versions SET version = version + 1 WHERE name = 'departments'"))
+
+    names = [row['name'] for row in client.get('/api/departments').get_json()]
+    assert 'Склад №2' in names
+
+
+def test_etag_differs_after_database_is_recreated(app, client):
+    etag = client.get('/api/departments').headers['ETag']
+    version = dictionary_cache.version('departments')
+
+    # Как init_db.py: схема пересоздается, счетчики начинаются заново
+    db.session.remove()
+    db.drop_all()
+    reset_history()
+    db.create_all()
+    upgrade()
+    db.session.add_all(Department(name=name) for name in ('Склад', 'Гараж', 'Офис'))
+    db.session.commit()
+
+    response = client.get('/api/departments', headers={'If-None-Match': etag})
+    assert dictionary_cache.version('departments') == version
+    assert response.status_code == 200
+    assert response.headers['ETag'] != etag
@@ -0,0 +1,89 @@
+import io
+import pytest
+from database import db
+from database.models import Employee, Vehicle
+from utils.importer import import_file
+
+
+def csv_file(*lines):
+    return io.BytesIO('\n'.join(lines).encode('utf-8'))
+
+
+def import_vehicles(*lines, **options):
+    return import_file('vehicle', csv_file('Марка;Госномер;Тип ТС;Год выпуска', *lines), 'vehicles.csv', **options)
+
+
+def test_plates_are_normalised_and_duplicates_reported(app):
+    report = import_vehicles(
+        'КАМАЗ;а 123 вс 77;Грузовой автомобиль;2020',
+        # Латинские A, B, C - тот же номер, повтор строки выше
+        'ГАЗ;A123BC77;;2019',
+        'ЗИЛ;В456ОР178;;',
+    )
+
+    assert (report.total, report.imported) == (3, 2)
+    assert report.errors == [(3, 'Повтор строки, загруженной выше')]
+    plates = db.session.execute(db.select(Vehicle.license_plate).order_by(Vehicle.id)).scalars().all()
+    assert plates == ['А123ВС77', 'В456ОР178']
+
+    report = import_vehicles('УАЗ;В 456 ор 178;;')
+    assert report.imported == 0
+    assert report.errors == [(2, 'Такая запись уже есть в базе')]
+
+
+def test_manually_added_plate_is_a_duplicate(app, client):
+    response = client.post('/transport/add', data={'brand': 'КАМАЗ', 'license_plate': 'а 123 вс 77'})
+    assert response.status_code == 302
+    assert Vehicle.query.one().license_plate == 'А123ВС77'
+
+    report = import_vehicles('ГАЗ;А123ВС77;;')
+    assert report.errors == [(2, 'Такая запись уже есть в базе')]
+
+    # Тот же номер вручную - ошибка, запись не добавляется
+    client.post('/transport/add', data={'brand': 'ГАЗ', 'license_plate': 'A123BC77'})
+    assert Vehicle.query.count() == 1
+
+
+def test_manual_plate_is_validated(app, client):
+    vehicle = Vehicle(brand='КАМАЗ', license_plate='А123ВС77')
+    db.session.add(vehicle)
+    db.session.commit()
+
+    client.post(f'/transport/{vehicle.id}/edit', data={'brand': 'КАМАЗ', 'license_plate': '12345'})
+    db.session.expire_all()
+    assert vehicle.license_plate == 'А123ВС77'
+
+    client.post(f'/transport/{vehicle.id}/edit', data={'brand': 'КАМАЗ', 'license_plate': 'a123bc 77'})
+    db.session.expire_all()
+    assert vehicle.license_plate == 'А123ВС77'
+
+
+def test_row_errors_are_reported_with_line_numbers(app):
+    report = import_file('employee', csv_file(
+        'Фамилия;Имя;Дата рождения;Должность;Серия паспорта;Номер паспорта',
+        'Иванов;Петр;01.02.1980;Водитель;4512;123456',
+        ';Олег;;;;',
+        'Петров;Иван;31.31.1990;Космонавт;;',
+        'Сидоров;Олег;;;4512;123456',
+    ), 'employees.csv')
+
+    assert (report.total, report.imported, report.error_rows) == (4, 1, 3)
+    errors = dict(report.errors)
+    assert set(errors) == {3, 4, 5}
+    assert 'Фамилия' in errors[3]
+    assert 'Неверный формат даты' in errors[4] and 'Космонавт' in errors[4]
+    assert errors[5] == 'Повтор строки, загруженной выше'
+    assert Employee.query.one().position.name == 'Водитель'
+
+
+def test_error_limit_truncates_report(app):
+    report = import_vehicles(*[f'КАМАЗ;плохой{number};;' for number in range(5)], error_limit=2)
+
+    assert report.error_rows == 5
+    assert len(report.errors) == 2
+    assert report.errors_truncated
+
+
+def test_missing_required_column(app):
+    with pytest.raises(ValueError, match='Госномер'):
+        import_file('vehicle', csv_file('Марка', 'КАМАЗ'), 'vehicles.csv')
@@ -0,0 +1,89 @@
+import os
+import sqlite3
+import pytest
+from app import create_app
+from database import db
+from database.migrations import MIGRATIONS, current_version
+from database.search import search_ids
+
+BASELINE_SCHEMA = os.path.join(os.path.dirname(__file__), 'data', 'baseline_schema.sql')
+
+# Данные в формате исходной схемы: состав заявок и водители - в JSON-колонках
+LEGACY_DATA = '''
+INSERT INTO departments (id, name) VALUES (1, 'Гараж');
+INSERT INTO posts (id, name, is_active) VALUES (1, 'Пост №1', 1), (2, 'Пост №2', 1);
+INSERT INTO employees (id, last_name, first_name, phone, pass_expiry)
+    VALUES (1, 'Иванов', 'Петр', '+7 (999) 123-45-67', '2026-12-31'),
+           (2, 'Петров', 'Иван', NULL, NULL);
+INSERT INTO vehicles (id, brand, license_plate) VALUES (1, 'КАМАЗ', 'a 123 bc 77');
+INSERT INTO pass_requests (id, request_type, post_ids, employee_ids, vehicle_ids,
+                           start_date, end_date, formed_by)
+    VALUES (1, 'internal', '[1, 2, 99, "x"]', '["2", 1]', 'не JSON', '2026-01-01', '2026-02-01', 'Начальник');
+INSERT INTO daily_requests (id, date, shift_type, vehicles_data)
+    VALUES (1, '2026-01-10', 'day', '[{"driver_id": 1, "vehicle_type": "Автобус"}, {"driver_id": 42}]');
+'''
+
+
+@pytest.fixture
+def baseline_app(tmp_path):
+    path = tmp_path / 'baseline.db'
+    connection = sqlite3.connect(path)
+    with open(BASELINE_SCHEMA, encoding='utf-8') as schema:
+        connection.executescript(schema.read())
+    connection.executescript(LEGACY_DATA)
+    connection.close()
+
+    app = create_app({
+        'TESTING': True,
+        'SQLALCHEMY_DATABASE_URI': f'sqlite:///{path}',
+        'UPLOAD_FOLDER': str(tmp_path / 'storage'),
+    })
+    with app.app_context():
+        yield app
+        db.session.remove()
+        for engine in db.engines.values():
+            engine.dispose()
+
+
+def scalars(sql):
+    return db.session.execute(db.text(sql)).scalars().all()
+
+
+def test_upgrade_baseline_database(baseline_app):
+    runner = baseline_app.test_cli_runner()
+    result = runner.invoke(args=['db-upgrade'])
+    assert result.exit_code == 0, result.output
+    versions = [number for number, _, _ in MIGRATIONS]
+    assert f"Применены миграции: {', '.join(map(str, versions))}" in result.output
+
+    with db.engine.connect() as connection:
+        assert current_version(connection) == versions[-1]
+
+    # 1: связи заявки из JSON-колонок, несуществующие id и мусор пропускаются
+    assert scalars('SELECT post_id FROM pass_request_posts ORDER BY post_id') == [1, 2]
+    assert scalars('SELECT employee_id FROM pass_request_employees ORDER BY employee_id') == [1, 2]
+    assert scalars('SELECT vehicle_id FROM pass_request_vehicles') == []
+    # 2, 8: журнал назначений только для существующих водителей
+    assert scalars('SELECT driver_id FROM daily_request_assignments') == [1]
+    # 4: календарь сроков
+    assert scalars("SELECT entity_id FROM document_expiries WHERE doc_kind = 'pass_expiry'") == [1]
+    # 6: индекс поиска заполнен по существующим строкам
+    assert search_ids('employee', '+7 (999) 123') == [1]
+    # 9, 10: версии справочников с меткой базы
+    assert len(scalars('SELECT token FROM dictionary_versions WHERE token IS NOT NULL')) == 11
+    # 11: госномер в едином виде
+    assert scalars('SELECT license_plate FROM vehicles') == ['А123ВС77']
+
+    result = runner.invoke(args=['db-upgrade'])
+    assert 'База данных в актуальном состоянии' in result.output
+
+
+def test_cascade_after_upgrade(baseline_app):
+    baseline_app.test_cli_runner().invoke(args=['db-upgrade'])
+
+    # Таблица назначений пересоздана с ON DELETE CASCADE (миграция 8)
+    with db.engine.begin() as connection:
+        connection.execute(db.text('DELETE FROM pass_request_employees WHERE employee_id = 1'))
+        connection.execute(db.text('DELETE FROM document_expiries WHERE entity_id = 1'))
+        connection.execute(db.text('DELETE FROM employees WHERE id = 1'))
+    assert scalars('SELECT COUNT(*) FROM daily_request_assignments') == [0]
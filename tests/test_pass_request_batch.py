@@ -0,0 +1,102 @@
+import io
+import json
+import os
+import zipfile
+import pytest
+from docx import Document
+from database import db
+from database.models import PassRequest, Post
+
+URL = '/head_of_department/pass_requests/batch'
+
+
+def template():
+    document = Document()
+    document.add_paragraph('Период {{ПЕРИОД ПРОЕЗДА}}')
+    document.add_paragraph('Посты {{ПЕРЕЧЕНЬ ПОСТОВ}}')
+    content = io.BytesIO()
+    document.save(content)
+    content.seek(0)
+    return content
+
+
+@pytest.fixture
+def post(app):
+    post = Post(name='Пост №1')
+    db.session.add(post)
+    db.session.commit()
+    return post
+
+
+def item(post, **fields):
+    return dict({'start_date': '2026-10-01', 'end_date': '2026-11-30',
+                 'formed_by': 'Начальник', 'posts': [post.id]}, **fields)
+
+
+def post_batch(client, items, request_type='internal', **form):
+    data = dict(form, request_type=request_type, requests=json.dumps(items),
+                template=(template(), 'template.docx'))
+    return client.post(URL, data=data, content_type='multipart/form-data')
+
+
+def stored_files(app, folder):
+    path = os.path.join(app.config['UPLOAD_FOLDER'], folder)
+    return sorted(name for _, _, names in os.walk(path) for name in names)
+
+
+def test_unknown_request_type_is_rejected(app, client, post, tmp_path):
+    response = post_batch(client, [item(post)], request_type='/../../../../pwned')
+
+    assert response.status_code == 400
+    assert PassRequest.query.count() == 0
+    assert stored_files(app, 'generated') == []
+    assert not (tmp_path / 'pwned_1.docx').exists()
+
+
+def test_invalid_references_are_listed(app, client, post):
+    items = [item(post, contract_id='abc'), item(post)]
+    response = post_batch(client, items)
+
+    assert response.status_code == 400
+    assert [error['index'] for error in response.get_json()['errors']] == [0]
+
+    items = [item(post), item(post, inn_id=999999, agreement_person_id='7777')]
+    response = post_batch(client, items)
+
+    assert response.status_code == 400
+    errors = response.get_json()['errors']
+    assert [error['index'] for error in errors] == [1]
+    assert 'ИНН 999999' in errors[0]['error']
+    assert 'согласующее лицо 7777' in errors[0]['error']
+    # Неудачный пакет не оставляет ни заявок, ни шаблона в хранилище
+    assert PassRequest.query.count() == 0
+    assert stored_files(app, 'templates') == []
+
+
+def test_documents_are_stored_and_streamed(app, client, post):
+    response = post_batch(client, [item(post), item(post, start_date='2026-10-02')], request_type='border')
+
+    assert response.status_code == 200
+    assert response.headers['Content-Disposition'].startswith('attachment; filename="pass_requests_border_')
+    archive = zipfile.ZipFile(io.BytesIO(response.data))
+    ids = [pass_request.id for pass_request in PassRequest.query.order_by(PassRequest.id)]
+    assert archive.namelist() == [f'pass_request_border_{pass_request_id}.docx' for pass_request_id in ids]
+    document = Document(io.BytesIO(archive.read(archive.namelist()[1])))
+    assert document.paragraphs[0].text == 'Период с 02.10.2026 по 30.11.2026'
+
+    db.session.expire_all()
+    for pass_request in PassRequest.query:
+        path = os.path.join(app.config['UPLOAD_FOLDER'], pass_request.generated_document_path)
+        assert pass_request.generated_document_path.startswith('generated/pass_requests/')
+        assert os.path.isfile(path)
+    assert len(stored_files(app, 'templates')) == 1
+
+
+def test_merged_document_is_shared(app, client, post):
+    response = post_batch(client, [item(post), item(post)], merge='1')
+
+    archive = zipfile.ZipFile(io.BytesIO(response.data))
+    assert len(archive.namelist()) == 1
+    db.session.expire_all()
+    paths = {pass_request.generated_document_path for pass_request in PassRequest.query}
+    assert paths == {'generated/pass_requests/' + archive.namelist()[0]}
@@ -0,0 +1,53 @@
+import pytest
+from database import db
+from database.models import Employee, Vehicle
+from database.search import match_expression, search_ids
+
+
+@pytest.fixture
+def records(app):
+    employee = Employee(last_name='Иванов', first_name='Петр', phone='+7 (999) 123-45-67')
+    vehicle = Vehicle(brand='КАМАЗ', license_plate='А123ВС77')
+    db.session.add_all([employee, vehicle])
+    db.session.commit()
+    return employee, vehicle
+
+
+def test_match_expression_adds_joined_term():
+    assert match_expression('Иванов') == '"Иванов"*'
+    assert match_expression('А 123 ВС') == '("А"* "123"* "ВС"*) OR "А123ВС"*'
+    assert match_expression(' -+() ') is None
+
+
+@pytest.mark.parametrize('text', ['А 123 ВС 77', 'а123вс', 'камаз'])
+def test_vehicle_plate_as_displayed(records, text):
+    assert search_ids('vehicle', text) == [records[1].id]
+
+
+@pytest.mark.parametrize('text', ['+7 (999) 123', '7999123', '+7 999 123-45-67', 'иванов петр'])
+def test_employee_formatted_phone(records, text):
+    assert search_ids('employee', text) == [records[0].id]
+
+
+def test_pages_past_first_thousand(app):
+    db.session.add_all(Vehicle(brand='ГАЗ', license_plate=f'В{number:04d}') for number in range(1205))
+    db.session.add(Vehicle(brand='ГАЗ ГАЗель', license_plate='Е777КХ'))
+    db.session.commit()
+
+    ids = search_ids('vehicle', 'газ', limit=2000)
+    assert len(ids) == 1206
+    assert search_ids('vehicle', 'газ', limit=10, offset=1200) == ids[1200:]
+    # Запись с двумя совпадениями слова в марке ранжируется выше, хотя добавлена последней
+    assert ids[0] == Vehicle.query.filter_by(license_plate='Е777КХ').one().id
+
+
+def test_search_page_without_query_lists_all(client, records):
+    db.session.add(Employee(last_name='Абрамов', first_name='Олег'))
+    db.session.commit()
+
+    page = client.get('/api/employees/search?limit=1').get_json()
+    assert [item['text'] for item in page['items']] == ['Абрамов Олег']
+    assert page['next_offset'] == 1
+    page = client.get('/api/employees/search?offset=1&limit=1').get_json()
+    assert page['items'][0]['id'] == records[0].id
+    assert page['next_offset'] is None
@@ -0,0 +1,80 @@
+import csv
+import io
+from datetime import date, datetime
+from openpyxl import load_workbook
+from database import db
+from database.models import Employee
+from utils.table_export import csv_stream, xlsx_stream
+
+HEADER = ['Фамилия', 'Дата', 'Создан', 'Число', 'Флаг']
+ROWS = [
+    ['Иванов', date(2026, 3, 1), datetime(2026, 3, 1, 14, 30), 42, True],
+    ['<Петров & "сын">\x07', None, None, 1.5, False],
+]
+
+
+def many_rows(count):
+    for number in range(count):
+        yield [f'Строка {number}', date(2026, 1, 1), None, number, None]
+
+
+def test_csv_opens_with_csv_reader():
+    content = b''.join(csv_stream(HEADER, iter(ROWS))).decode('utf-8')
+
+    assert content.startswith('\ufeff')
+    rows = list(csv.reader(io.StringIO(content[1:]), delimiter=';'))
+    assert rows == [
+        HEADER,
+        ['Иванов', '01.03.2026', '01.03.2026 14:30', '42', 'Да'],
+        ['<Петров & "сын">\x07', '', '', '1.5', 'Нет'],
+    ]
+
+
+def test_csv_is_streamed_in_chunks():
+    chunks = list(csv_stream(['Фамилия'], ([f'Строка {number}'] for number in range(1200))))
+
+    assert len(chunks) > 2
+    rows = list(csv.reader(io.StringIO(b''.join(chunks).decode('utf-8-sig')), delimiter=';'))
+    assert len(rows) == 1201 and rows[-1] == ['Строка 1199']
+
+
+def test_xlsx_opens_in_openpyxl():
+    content = b''.join(xlsx_stream('Сотрудники', HEADER, iter(ROWS), widths=[20, 12]))
+
+    sheet = load_workbook(io.BytesIO(content)).active
+    assert sheet.title == 'Сотрудники'
+    values = [list(row) for row in sheet.iter_rows(values_only=True)]
+    assert values[0] == HEADER
+    assert values[1] == ['Иванов', datetime(2026, 3, 1), datetime(2026, 3, 1, 14, 30), 42, True]
+    # Недопустимые в XML символы удаляются, разметка экранируется
+    assert values[2] == ['<Петров & "сын">', None, None, 1.5, False]
+    assert sheet['B2'].number_format == 'mm-dd-yy'
+    assert sheet['A1'].font.b
+    assert sheet.column_dimensions['A'].width == 20
+
+
+def test_xlsx_many_rows():
+    chunks = list(xlsx_stream('Лист', HEADER, many_rows(2000)))
+
+    assert len(chunks) > 3
+    sheet = load_workbook(io.BytesIO(b''.join(chunks)), read_only=True).active
+    rows = list(sheet.iter_rows(values_only=True))
+    assert len(rows) == 2001
+    assert rows[-1][:2] == ('Строка 1999', datetime(2026, 1, 1))
+
+
+def test_employee_export_endpoint(client):
+    db.session.add(Employee(last_name='Иванов', first_name='Петр', pass_expiry=date(2026, 12, 31)))
+    db.session.commit()
+
+    response = client.get('/employees/export?format=csv')
+    assert response.status_code == 200
+    assert response.headers['Content-Disposition'].startswith('attachment; filename=employees_')
+    rows = list(csv.reader(io.StringIO(response.data.decode('utf-8-sig')), delimiter=';'))
+    assert len(rows) == 2 and 'Иванов' in rows[1]
+
+    response = client.get('/employees/export?format=xlsx')
+    sheet = load_workbook(io.BytesIO(response.data)).active
+    assert sheet.max_row == 2
+
+    assert client.get('/employees/export?format=pdf').status_code == 400
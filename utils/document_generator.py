@@ -1,33 +1,41 @@
-from docx import Document
-from docx.shared import Inches
 from openpyxl import load_workbook
-from openpyxl.styles import Font, Alignment
 import os
+import io
+import uuid
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-import re
 import json
+from docx.oxml import OxmlElement
+from docx.oxml.ns import qn
+from utils.template_cache import template_cache
+from utils.docx_tags import replace_tags, replace_tags_in_paragraph, find_marker_row, fill_marker_row
+from utils.xlsx_template import write_sheet
+
+# Теги строки таблицы сотрудников в шаблоне заявки на перевахтовку
+EMPLOYEE_TABLE_TAGS = ('№', 'ФИО', 'ДОЛЖНОСТЬ', 'ПОДРАЗДЕЛЕНИЕ', 'ДАТА РОЖДЕНИЯ', 'ПАСПОРТ', 'ТЕЛЕФОН', 'ГОРОД')
+
+# Теги строк таблиц сотрудников и транспорта в шаблоне заявки на пропуск;
+# строка-образец определяется по тегам, которых нет в другой таблице
+PASS_EMPLOYEE_TAGS = EMPLOYEE_TABLE_TAGS + ('ПРОПУСК',)
+PASS_VEHICLE_TAGS = ('№', 'МАРКА', 'ГОСНОМЕР', 'ТИП ТС', 'КАТЕГОРИЯ', 'ГОД ВЫПУСКА', 'ПРОПУСК ТС')
 
 class DocumentGenerator:
     def __init__(self, template_path, output_dir):
         self.template_path = template_path
         self.output_dir = output_dir
+
+    def _output_path(self, name, extension):
+        """Путь нового файла: к времени добавляется случайный суффикс, так как
+        задания очереди выполняются параллельно и завершаются в одну секунду"""
+        filename = f"{name}_{datetime.now().strftime('%Y%m%d_%H%M%S')}_{uuid.uuid4().hex[:8]}.{extension}"
+        return os.path.join(self.output_dir, filename)
         
     def generate_pass_request(self, data, request_type):
         """Генерация заявки на пропуск"""
         try:
-            doc = Document(self.template_path)
-            
-            # Обработка данных
-            processed_data = self._process_pass_request_data(data, request_type)
-            
-            # Замена тегов
-            self._replace_tags_in_document(doc, processed_data)
+            doc = self._render_pass_request(data, request_type)
             
-            # Обработка таблиц с сотрудниками и транспортом
-            self._process_tables(doc, data)
-            
-            filename = f"pass_request_{request_type}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.docx"
-            output_path = os.path.join(self.output_dir, filename)
+            output_path = self._output_path(f"pass_request_{request_type}", 'docx')
             doc.save(output_path)
             return output_path
             
@@ -35,6 +43,66 @@ class DocumentGenerator:
             print(f"Ошибка генерации документа: {e}")
             return None
     
+    def _render_pass_request(self, data, request_type):
+        """Заполнение копии шаблона данными одной заявки"""
+        # Копия разобранного шаблона из кэша
+        doc, tag_locations = template_cache.get_document(self.template_path)
+        
+        # Обработка данных
+        processed_data = self._process_pass_request_data(data, request_type)
+        
+        # Замена тегов
+        self._replace_tags_in_document(doc, processed_data, tag_locations)
+        
+        # Обработка таблиц с сотрудниками и транспортом
+        self._process_tables(doc, data)
+        return doc
+    
+    def generate_pass_request_batch(self, items, request_type, merge=False, workers=4):
+        """Генерация заявок на пропуск по одному шаблону для списка данных
+        
+        Шаблон разбирается один раз, документы заполняются и сохраняются
+        параллельно. Возвращает итератор пар (номер заявки в списке, байты docx)
+        в исходном порядке; при merge=True - один документ, где каждая заявка
+        начинается с новой страницы.
+        """
+        # Первый вызов разбирает шаблон, остальные получают копии из кэша
+        template_cache.get_document(self.template_path)
+        
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            if merge:
+                documents = pool.map(lambda data: self._render_pass_request(data, request_type), items)
+                yield 0, self._document_bytes(self._merge_documents(list(documents)))
+                return
+            
+            render = lambda data: self._document_bytes(self._render_pass_request(data, request_type))
+            yield from enumerate(pool.map(render, items))
+    
+    def _document_bytes(self, doc):
+        buffer = io.BytesIO()
+        doc.save(buffer)
+        return buffer.getvalue()
+    
+    def _merge_documents(self, documents):
+        """Объединение копий одного шаблона в документ с разрывами страниц"""
+        merged = documents[0]
+        body = merged.element.body
+        sect_pr = body.find(qn('w:sectPr'))
+        insert = sect_pr.addprevious if sect_pr is not None else body.append
+        for doc in documents[1:]:
+            page_break = OxmlElement('w:p')
+            run = OxmlElement('w:r')
+            br = OxmlElement('w:br')
+            br.set(qn('w:type'), 'page')
+            run.append(br)
+            page_break.append(run)
+            insert(page_break)
+            # Связи (картинки, стили) у копий одного шаблона совпадают с исходным
+            for element in list(doc.element.body):
+                if element.tag != qn('w:sectPr'):
+                    insert(element)
+        return merged
+    
     def _process_pass_request_data(self, data, request_type):
         """Обработка данных для заявки на пропуск"""
         processed = data.copy()
@@ -47,40 +115,44 @@ class DocumentGenerator:
         
         # Обработка постов
         if 'posts' in data:
-            posts = json.loads(data['posts'])
+            posts = data['posts'] if isinstance(data['posts'], list) else json.loads(data['posts'])
             processed['ПЕРЕЧЕНЬ ПОСТОВ'] = ', '.join(posts)
         
         return processed
     
     def _process_tables(self, doc, data):
-        """Обработка таблиц с сотрудниками и транспортом"""
-        # Здесь реализуется логика добавления/удаления строк в таблицах
-        # в зависимости от выбранных сотрудников и транспорта
-        pass
+        """Обработка таблиц с сотрудниками и транспортом
+        
+        data['employee_rows'] и data['vehicle_rows'] - заранее загруженные
+        строки (DBUtils.employee_table_row / vehicle_table_row). Строка-образец
+        таблицы копируется для каждой записи и удаляется, если список пуст.
+        """
+        tables = (
+            (PASS_EMPLOYEE_TAGS, data.get('employee_rows') or []),
+            (PASS_VEHICLE_TAGS, data.get('vehicle_rows') or []),
+        )
+        for tags, rows in tables:
+            other_tags = PASS_VEHICLE_TAGS if tags is PASS_EMPLOYEE_TAGS else PASS_EMPLOYEE_TAGS
+            marker = find_marker_row(doc, set(tags) - set(other_tags))
+            if marker is None:
+                continue
+            fill_marker_row(marker, (
+                {**dict.fromkeys(tags, ''), **row, '№': index}
+                for index, row in enumerate(rows, 1)
+            ))
     
-    def _replace_tags_in_document(self, doc, data):
-        """Замена тегов во всем документе"""
-        for paragraph in doc.paragraphs:
-            self._replace_tags_in_paragraph(paragraph, data)
-            
-        for table in doc.tables:
-            for row in table.rows:
-                for cell in row.cells:
-                    for paragraph in cell.paragraphs:
-                        self._replace_tags_in_paragraph(paragraph, data)
+    def _replace_tags_in_document(self, doc, data, tag_locations=None):
+        """Замена тегов во всем документе, включая колонтитулы и вложенные таблицы"""
+        return replace_tags(doc, data, tag_locations)
     
     def _replace_tags_in_paragraph(self, paragraph, data):
         """Замена тегов в параграфе"""
-        for key, value in data.items():
-            tag = f"{{{{{key}}}}}"
-            if tag in paragraph.text:
-                for run in paragraph.runs:
-                    run.text = run.text.replace(tag, str(value))
+        return replace_tags_in_paragraph(paragraph, data)
     
     def generate_ttn(self, data):
         """Генерация ТТН"""
         try:
-            doc = Document(self.template_path)
+            doc, tag_locations = template_cache.get_document(self.template_path)
             
             # Обработка данных ТТН
             processed_data = {
@@ -106,10 +178,9 @@ class DocumentGenerator:
                 cargo_items = json.loads(data['cargo_list'])
                 processed_data['НАИМЕНОВАНИЕГРУЗА'] = ', '.join([item['name'] for item in cargo_items])
             
-            self._replace_tags_in_document(doc, processed_data)
+            self._replace_tags_in_document(doc, processed_data, tag_locations)
             
-            filename = f"ttn_{data['number']}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.docx"
-            output_path = os.path.join(self.output_dir, filename)
+            output_path = self._output_path(f"ttn_{data['number']}", 'docx')
             doc.save(output_path)
             return output_path
             
@@ -120,27 +191,15 @@ class DocumentGenerator:
     def generate_shift_request(self, data, request_type):
         """Генерация заявки на перевахтовку"""
         try:
-            wb = load_workbook(self.template_path)
-            ws = wb.active
+            layout = template_cache.get_workbook_layout(self.template_path, EMPLOYEE_TABLE_TAGS)
             
             # Обработка данных
             processed_data = self._process_shift_request_data(data, request_type)
             
-            # Замена тегов в ячейках
-            for row in ws.iter_rows():
-                for cell in row:
-                    if cell.value and isinstance(cell.value, str):
-                        for key, value in processed_data.items():
-                            tag = f"{{{{{key}}}}}"
-                            if tag in str(cell.value):
-                                cell.value = str(cell.value).replace(tag, str(value))
-            
-            # Обработка таблицы с сотрудниками
-            self._process_employee_table(ws, data)
-            
-            filename = f"shift_request_{request_type}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.xlsx"
-            output_path = os.path.join(self.output_dir, filename)
-            wb.save(output_path)
+            output_path = self._output_path(f"shift_request_{request_type}", 'xlsx')
+            
+            # Лист пишется потоково, строки сотрудников не держатся в памяти
+            write_sheet(layout, output_path, processed_data, self._process_employee_table(data))
             return output_path
             
         except Exception as e:
@@ -167,13 +226,27 @@ class DocumentGenerator:
                 'СТОИМОСТЬ': data.get('preliminary_cost', ''),
                 'НОМЕР РЕЙСА': data.get('flight_number', '')
             })
+        elif request_type == 'auto':
+            processed.update({
+                'ДАТА': datetime.strptime(data['flight_date'], '%Y-%m-%d').strftime('%d.%m.%Y') if data.get('flight_date') else '',
+                'ОТКУДА АВТО': data.get('auto_delivery_from', ''),
+                'КУДА АВТО': data.get('auto_delivery_to', '')
+            })
         
+        processed['СФОРМИРОВАЛ'] = data.get('formed_by', '')
         return processed
     
-    def _process_employee_table(self, ws, data):
-        """Обработка таблицы с сотрудниками в Excel"""
-        # Реализация добавления строк с сотрудниками в таблицу
-        pass
+    def _process_employee_table(self, data):
+        """Строки таблицы сотрудников для шаблона Excel
+        
+        data['employees'] - итератор словарей с полями по тегам строки
+        (ФИО, ДОЛЖНОСТЬ, ...); перебирается один раз, по мере записи листа.
+        """
+        for index, employee in enumerate(data.get('employees') or [], 1):
+            row = {tag: '' for tag in EMPLOYEE_TABLE_TAGS}
+            row.update(employee)
+            row['№'] = index
+            yield row
 
 class ElectricityTracker:
     """Класс для учета электроэнергии"""
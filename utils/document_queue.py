@@ -0,0 +1,141 @@
+import json
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from database import db
+from database.db_utils import DBUtils
+from database.models import DocumentJob, PassRequest
+
+
+class DocumentQueue:
+    """Очередь формирования документов в фоновых потоках
+
+    Задание сохраняется в таблице document_jobs вместе с данными для
+    подстановки, поэтому HTTP-запрос только ставит его в очередь и сразу
+    отвечает. Клиент узнает о готовности документа через
+    /api/document_jobs/<id>. Незавершенные задания подхватываются
+    заново при запуске приложения (resume_pending).
+    """
+
+    def __init__(self, workers=2, stale_after=600):
+        self.workers = workers
+        self.stale_after = stale_after
+        self.app = None
+        self._executor = None
+        self._lock = threading.Lock()
+
+    def init_app(self, app):
+        self.app = app
+        self.workers = app.config.get('DOCUMENT_WORKERS', self.workers)
+        self.stale_after = app.config.get('DOCUMENT_JOB_STALE_SECONDS', self.stale_after)
+
+    def after_fork(self):
+        """Сброс пула в дочернем процессе: потоки родителя после fork не существуют"""
+        self._executor = None
+        self._lock = threading.Lock()
+
+    @property
+    def executor(self):
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.workers, thread_name_prefix='document-worker')
+            return self._executor
+
+    def create_job(self, kind, object_id, template_path, data, request_type=None):
+        """Создание задания в текущей сессии; запуск - submit() после commit"""
+        job = DocumentJob(
+            kind=kind,
+            object_id=object_id,
+            request_type=request_type,
+            template_path=template_path,
+            data=json.dumps(data, ensure_ascii=False),
+            status='queued'
+        )
+        db.session.add(job)
+        return job
+
+    def submit(self, job_id):
+        """Передача сохраненного задания в пул потоков"""
+        return self.executor.submit(self._run, job_id)
+
+    def resume_pending(self):
+        """Повторный запуск заданий, прерванных остановкой приложения
+
+        Задание в статусе running, начатое раньше чем stale_after секунд
+        назад, считается прерванным и возвращается в очередь; более свежие
+        могут еще выполняться другим процессом и не трогаются.
+        """
+        cutoff = datetime.utcnow() - timedelta(seconds=self.stale_after)
+        db.session.execute(
+            db.update(DocumentJob)
+            .where(DocumentJob.status == 'running',
+                   db.or_(DocumentJob.started_at.is_(None), DocumentJob.started_at < cutoff))
+            .values(status='queued', started_at=None)
+        )
+        db.session.commit()
+        job_ids = db.session.execute(
+            db.select(DocumentJob.id).where(DocumentJob.status == 'queued')
+            .order_by(DocumentJob.id)
+        ).scalars().all()
+        for job_id in job_ids:
+            self.submit(job_id)
+        return job_ids
+
+    def _generate(self, job):
+        # python-docx и openpyxl загружаются при первом задании, а не при запуске
+        from utils.document_generator import DocumentGenerator
+        upload_folder = self.app.config['UPLOAD_FOLDER']
+        generator = DocumentGenerator(
+            os.path.join(upload_folder, job.template_path),
+            os.path.join(upload_folder, 'generated')
+        )
+        data = json.loads(job.data) if job.data else {}
+
+        if job.kind == 'pass_request':
+            output_path = generator.generate_pass_request(data, job.request_type)
+        elif job.kind == 'ttn':
+            output_path = generator.generate_ttn(data)
+        elif job.kind == 'shift_request':
+            # Сотрудники читаются из базы порциями по ходу записи таблицы
+            data['employees'] = DBUtils.iter_shift_request_employees(data.pop('employee_ids', []))
+            output_path = generator.generate_shift_request(data, job.request_type)
+        else:
+            raise ValueError(f'Неизвестный тип документа: {job.kind}')
+
+        if not output_path:
+            raise RuntimeError('Не удалось сформировать документ по шаблону')
+        # Путь относительно хранилища, как и template_path
+        return os.path.relpath(output_path, upload_folder).replace(os.sep, '/')
+
+    def _run(self, job_id):
+        with self.app.app_context():
+            # Задание забирает тот, чей UPDATE сработал: повторная отправка
+            # того же задания (resume_pending в другом процессе) его пропустит
+            claimed = db.session.execute(
+                db.update(DocumentJob)
+                .where(DocumentJob.id == job_id, DocumentJob.status == 'queued')
+                .values(status='running', started_at=datetime.utcnow())
+            ).rowcount
+            db.session.commit()
+            if not claimed:
+                return
+            job = db.session.get(DocumentJob, job_id)
+
+            try:
+                job.result_path = self._generate(job)
+                job.status = 'done'
+                if job.kind == 'pass_request':
+                    pass_request = db.session.get(PassRequest, job.object_id)
+                    if pass_request:
+                        pass_request.generated_document_path = job.result_path
+            except Exception as e:
+                print(f"❌ Ошибка формирования документа (задание {job_id}): {e}")
+                job.status = 'failed'
+                job.error = str(e)
+            job.finished_at = datetime.utcnow()
+            db.session.commit()
+
+
+document_queue = DocumentQueue()
@@ -0,0 +1,154 @@
+import re
+from copy import deepcopy
+from bisect import bisect_right
+from docx.oxml.ns import qn
+from docx.text.paragraph import Paragraph
+
+# Тег шаблона: {{ИМЯ}}; имя может содержать пробелы ({{ПЕРИОД ПРОЕЗДА}})
+TAG_PATTERN = re.compile(r'\{\{([^{}]+)\}\}')
+TAG_MARK = '{{'
+
+_HEADER_FOOTERS = ('header', 'footer', 'first_page_header', 'first_page_footer',
+                   'even_page_header', 'even_page_footer')
+
+
+def iter_stories(document):
+    """Корневые элементы текста документа: тело, затем колонтитулы разделов"""
+    yield document.element.body
+    seen = set()
+    for section in document.sections:
+        for name in _HEADER_FOOTERS:
+            header_footer = getattr(section, name)
+            # Связанный колонтитул не читаем: обращение создало бы пустой
+            if header_footer.is_linked_to_previous:
+                continue
+            part = header_footer._definition
+            if id(part) not in seen:
+                seen.add(id(part))
+                yield part.element
+
+
+def iter_paragraphs(document):
+    """Все параграфы документа по порядку, включая вложенные таблицы и колонтитулы
+
+    Возвращает тройки (номер части, номер параграфа в части, параграф).
+    """
+    for story_index, story in enumerate(iter_stories(document)):
+        for paragraph_index, p in enumerate(story.iter(qn('w:p'))):
+            yield story_index, paragraph_index, Paragraph(p, None)
+
+
+def find_tag_locations(document):
+    """Места параграфов, в которых есть теги"""
+    return tuple(
+        (story_index, paragraph_index)
+        for story_index, paragraph_index, paragraph in iter_paragraphs(document)
+        if TAG_MARK in paragraph.text
+    )
+
+
+def resolve_locations(document, locations):
+    """Параграфы документа по местам, найденным find_tag_locations"""
+    stories = [list(story.iter(qn('w:p'))) for story in iter_stories(document)]
+    for story_index, paragraph_index in locations:
+        yield Paragraph(stories[story_index][paragraph_index], None)
+
+
+def replace_tags_in_paragraph(paragraph, data):
+    """Замена тегов в параграфе за один проход; тег может быть разбит на несколько run
+
+    Текст подстановки попадает в run, где начинается тег, и наследует его
+    оформление. Теги без значения в data остаются без изменений.
+    Возвращает число замен.
+    """
+    runs = paragraph.runs
+    texts = [run.text for run in runs]
+    full_text = ''.join(texts)
+    if TAG_MARK not in full_text:
+        return 0
+
+    matches = []
+    for match in TAG_PATTERN.finditer(full_text):
+        key = match.group(1)
+        if key not in data:
+            key = key.strip()
+            if key not in data:
+                continue
+        matches.append((match.start(), match.end(), str(data[key])))
+    if not matches:
+        return 0
+
+    starts = []
+    offset = 0
+    for text in texts:
+        starts.append(offset)
+        offset += len(text)
+
+    new_texts = list(texts)
+    # С конца абзаца, чтобы позиции более ранних тегов не сдвигались
+    for start, end, value in reversed(matches):
+        # Пустые run имеют то же смещение, что и следующий, bisect выбирает последний
+        first = bisect_right(starts, start) - 1
+        last = bisect_right(starts, end - 1) - 1
+        if first == last:
+            text = new_texts[first]
+            new_texts[first] = text[:start - starts[first]] + value + text[end - starts[first]:]
+        else:
+            new_texts[first] = new_texts[first][:start - starts[first]] + value
+            for index in range(first + 1, last):
+                new_texts[index] = ''
+            new_texts[last] = new_texts[last][end - starts[last]:]
+
+    for run, old_text, new_text in zip(runs, texts, new_texts):
+        if new_text != old_text:
+            run.text = new_text
+    return len(matches)
+
+
+def replace_tags(document, data, locations=None):
+    """Замена тегов во всем документе; locations - места тегов из кэша шаблонов"""
+    if locations is None:
+        paragraphs = (paragraph for _, _, paragraph in iter_paragraphs(document))
+    else:
+        paragraphs = resolve_locations(document, locations)
+    return sum(replace_tags_in_paragraph(paragraph, data) for paragraph in paragraphs)
+
+
+def _row_tags(tr):
+    text = ''.join(t.text or '' for t in tr.iter(qn('w:t')))
+    return {match.group(1).strip() for match in TAG_PATTERN.finditer(text)}
+
+
+def find_marker_row(document, row_tags):
+    """Первая строка таблицы (w:tr) в теле документа, где есть один из тегов row_tags"""
+    row_tags = set(row_tags)
+    for tr in document.element.body.iter(qn('w:tr')):
+        if _row_tags(tr) & row_tags:
+            return tr
+    return None
+
+
+def fill_marker_row(tr, rows):
+    """Замена строки-образца копиями, заполненными данными rows
+
+    Параграфы с тегами ищутся в образце один раз, копии вставляются
+    в таблицу одной операцией на месте образца, поэтому время растет
+    линейно с числом строк. Пустой rows удаляет образец.
+    Возвращает число вставленных строк.
+    """
+    tagged = [
+        index for index, p in enumerate(tr.iter(qn('w:p')))
+        if TAG_MARK in ''.join(t.text or '' for t in p.iter(qn('w:t')))
+    ]
+    clones = []
+    for row in rows:
+        clone = deepcopy(tr)
+        paragraphs = list(clone.iter(qn('w:p')))
+        for index in tagged:
+            replace_tags_in_paragraph(Paragraph(paragraphs[index], None), row)
+        clones.append(clone)
+
+    table = tr.getparent()
+    position = table.index(tr)
+    table[position:position + 1] = clones
+    return len(clones)
@@ -1,12 +1,19 @@
 import os
 import uuid
 from werkzeug.utils import secure_filename
-from PIL import Image
 import shutil
 
 class FileHandler:
-    def __init__(self, upload_folder):
+    # Подкаталоги UPLOAD_FOLDER, создаваемые при запуске приложения
+    FOLDERS = ['templates', 'photos', 'documents', 'generated', 'tests']
+
+    def __init__(self, upload_folder=None):
         self.upload_folder = upload_folder
+
+    def init_app(self, app):
+        self.upload_folder = app.config['UPLOAD_FOLDER']
+        for folder in self.FOLDERS:
+            os.makedirs(os.path.join(self.upload_folder, folder), exist_ok=True)
     
     def save_employee_photo(self, photo_file):
         """Сохранение фото сотрудника"""
@@ -64,6 +71,11 @@ class FileHandler:
     
     def save_generated_document(self, document_content, filename, document_type):
         """Сохранение сгенерированного документа"""
+        # Имя и подкаталог могут прийти из запроса - путь не выходит за generated/
+        filename = secure_filename(filename)
+        document_type = secure_filename(document_type)
+        if not filename or not document_type:
+            return None
         filepath = os.path.join(self.upload_folder, 'generated', document_type, filename)
         
         try:
@@ -94,6 +106,7 @@ class FileHandler:
     
     def _optimize_image(self, image_path, max_size=(800, 800), quality=85):
         """Оптимизация изображения"""
+        from PIL import Image
         try:
             with Image.open(image_path) as img:
                 # Изменение размера если нужно
@@ -130,4 +143,7 @@ class FileHandler:
                         os.remove(file_path)
                         print(f"Удален старый файл: {file_path}")
                     except Exception as e:
-                        print(f"Ошибка удаления файла {file_path}: {e}")
\ No newline at end of file
+                        print(f"Ошибка удаления файла {file_path}: {e}")
+
+
+file_handler = FileHandler()
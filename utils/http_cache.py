@@ -0,0 +1,21 @@
+from flask import current_app, jsonify, request
+
+
+def conditional_json(etag, payload):
+    """JSON-ответ с ETag; 304 Not Modified если у клиента актуальная копия
+
+    payload может быть функцией - тогда данные собираются только для ответа 200.
+    """
+    if request.if_none_match.contains(etag):
+        response = current_app.response_class(status=304)
+    else:
+        response = jsonify(payload() if callable(payload) else payload)
+    response.set_etag(etag)
+
+    max_age = current_app.config.get('DICTIONARY_HTTP_MAX_AGE', 0)
+    if max_age:
+        response.headers['Cache-Control'] = f'private, max-age={max_age}'
+    else:
+        # Клиент хранит копию, но каждый раз сверяет ее с сервером
+        response.headers['Cache-Control'] = 'private, no-cache'
+    return response
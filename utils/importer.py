@@ -0,0 +1,380 @@
+import csv
+import codecs
+import io
+from datetime import datetime, date
+from database import db
+from database.dictionary_cache import dictionary_cache
+from database.expiries import rebuild_document_expiries
+from database.models import Employee, Vehicle
+from utils.validators import Validators, ValidationResult
+
+# Массовая загрузка сотрудников и транспорта из XLSX/CSV.
+# Строки файла читаются потоком, проверяются пачками по chunk_size,
+# названия справочников заменяются на id по заранее загруженным словарям,
+# каждая пачка вставляется через bulk_insert_mappings в своей транзакции.
+# Строки с ошибками пропускаются и попадают в отчет с номером строки файла.
+
+IMPORT_EXTENSIONS = ['xlsx', 'csv']
+
+_DATE_FORMATS = ('%d.%m.%Y', '%Y-%m-%d', '%d/%m/%Y')
+
+
+def _text(value):
+    if value is None:
+        return None
+    if isinstance(value, float) and value.is_integer():
+        value = int(value)
+    value = str(value).strip()
+    return value or None
+
+
+def _digits(width):
+    """Число из Excel с восстановлением ведущих нулей (серия 0412, а не 412)"""
+    def convert(value):
+        if isinstance(value, (int, float)) and not isinstance(value, bool):
+            return str(int(value)).zfill(width)
+        return _text(value)
+    return convert
+
+
+def _date(value):
+    if value is None or value == '':
+        return None
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, date):
+        return value
+    value = str(value).strip()
+    for date_format in _DATE_FORMATS:
+        try:
+            return datetime.strptime(value, date_format).date()
+        except ValueError:
+            pass
+    raise ValueError(f"Неверный формат даты «{value}», ожидается ДД.ММ.ГГГГ")
+
+
+def _int(value):
+    value = _text(value)
+    if value is None:
+        return None
+    try:
+        return int(value)
+    except ValueError:
+        raise ValueError(f"«{value}» должно быть целым числом")
+
+
+def _plate(value):
+    return Validators.normalize_license_plate(_text(value))
+
+
+def _dictionary_key(value):
+    return ' '.join(str(value).split()).lower().replace('ё', 'е')
+
+
+class ImportSpec:
+    """Описание загружаемой сущности
+
+    columns - (поле, заголовок, преобразование): колонка файла ищется по
+    заголовку или по имени поля. lookups - (поле, колонка модели, справочник):
+    название из файла заменяется на id строки справочника.
+    """
+
+    def __init__(self, entity_type, model, columns, lookups, required, validate):
+        self.entity_type = entity_type
+        self.model = model
+        self.columns = columns
+        self.lookups = lookups
+        self.required = required
+        self.validate = validate
+        self.labels = {field: label for field, label, _ in columns}
+
+    def header_map(self, header):
+        """Номер колонки файла для каждого известного поля"""
+        aliases = {}
+        for field, label, _ in self.columns:
+            aliases[_dictionary_key(label)] = field
+            aliases[field] = field
+        positions = {}
+        for index, title in enumerate(header):
+            field = aliases.get(_dictionary_key(title)) if title is not None else None
+            if field and field not in positions:
+                positions[field] = index
+        return positions
+
+
+def _validate_employee(record, result):
+    error = Validators.validate_phone(record.get('phone'))
+    if error:
+        result.add_error('phone', error)
+    error = Validators.validate_email(record.get('email'))
+    if error:
+        result.add_error('email', error)
+    series, number = record.get('passport_series'), record.get('passport_number')
+    if bool(series) != bool(number):
+        result.add_error('passport_series', "Укажите и серию, и номер паспорта")
+    error = Validators.validate_passport(series, number)
+    if error:
+        result.add_error('passport_series', error)
+    error = Validators.validate_past_date(record.get('birth_date'), 'Дата рождения')
+    if error:
+        result.add_error('birth_date', error)
+
+
+def _validate_vehicle(record, result):
+    error = Validators.validate_license_plate(record.get('license_plate'))
+    if error:
+        result.add_error('license_plate', error)
+    error = Validators.validate_numeric_range(
+        record.get('manufacture_year'), 1950, date.today().year + 1, 'Год выпуска')
+    if error:
+        result.add_error('manufacture_year', error)
+
+
+IMPORT_SPECS = {
+    'employee': ImportSpec('employee', Employee, (
+        ('last_name', 'Фамилия', _text),
+        ('first_name', 'Имя', _text),
+        ('middle_name', 'Отчество', _text),
+        ('gender', 'Пол', _text),
+        ('birth_date', 'Дата рождения', _date),
+        ('department', 'Подразделение', _text),
+        ('position', 'Должность', _text),
+        ('passport_series', 'Серия паспорта', _digits(4)),
+        ('passport_number', 'Номер паспорта', _digits(6)),
+        ('phone', 'Телефон', _text),
+        ('email', 'Email', _text),
+        ('city', 'Город', _text),
+        ('license_categories', 'Категории прав', _text),
+        ('pass_number', 'Номер допуска', _text),
+        ('pass_expiry', 'Допуск до', _date),
+        ('medical_exam_expiry', 'Медосмотр до', _date),
+        ('psychiatric_exam_expiry', 'Психосвидетельствование до', _date),
+        ('clothing_size', 'Размер одежды', _text),
+        ('shoe_size', 'Размер обуви', _text),
+        ('height', 'Рост', _text),
+    ), lookups=(
+        ('department', 'department_id', 'departments'),
+        ('position', 'position_id', 'positions'),
+        ('city', 'city_id', 'cities'),
+    ), required=('last_name', 'first_name'), validate=_validate_employee),
+    'vehicle': ImportSpec('vehicle', Vehicle, (
+        ('brand', 'Марка', _text),
+        ('license_plate', 'Госномер', _plate),
+        ('vehicle_type', 'Тип ТС', _text),
+        ('vehicle_category', 'Категория', _text),
+        ('department', 'Подразделение', _text),
+        ('manufacture_year', 'Год выпуска', _int),
+        ('pass_number', 'Номер допуска', _text),
+        ('pass_expiry', 'Допуск до', _date),
+        ('insurance_expiry', 'Страховка до', _date),
+        ('inspection_expiry', 'Техосмотр до', _date),
+    ), lookups=(
+        ('vehicle_type', 'vehicle_type_id', 'vehicle_types'),
+        ('vehicle_category', 'vehicle_category_id', 'vehicle_categories'),
+        ('department', 'department_id', 'departments'),
+    ), required=('brand', 'license_plate'), validate=_validate_vehicle),
+}
+
+
+def _open_csv(stream):
+    """Текстовый поток CSV: UTF-8 (в том числе с BOM) или Windows-1251 из Excel"""
+    sample = stream.read(64 * 1024)
+    stream.seek(0)
+    try:
+        codecs.getincrementaldecoder('utf-8')().decode(sample, final=False)
+        encoding = 'utf-8-sig'
+    except UnicodeDecodeError:
+        encoding = 'cp1251'
+    return io.TextIOWrapper(stream, encoding=encoding, newline='')
+
+
+def read_rows(stream, filename):
+    """Строки файла потоком: заголовок, затем пары (номер строки, значения)
+
+    Пустые строки пропускаются. XLSX читается в режиме read_only,
+    поэтому память не зависит от размера листа.
+    """
+    extension = filename.rsplit('.', 1)[-1].lower() if '.' in filename else ''
+    if extension == 'xlsx':
+        from openpyxl import load_workbook
+        workbook = load_workbook(stream, read_only=True, data_only=True)
+        try:
+            rows = workbook.active.iter_rows(values_only=True)
+            yield next(rows, ())
+            for number, values in enumerate(rows, start=2):
+                if any(value is not None and value != '' for value in values):
+                    yield number, values
+        finally:
+            workbook.close()
+        return
+
+    text = _open_csv(stream)
+    try:
+        first_line = text.readline()
+        text.seek(0)
+        delimiter = ';' if first_line.count(';') >= first_line.count(',') else ','
+        rows = csv.reader(text, delimiter=delimiter)
+        yield next(rows, [])
+        for number, values in enumerate(rows, start=2):
+            if any(value.strip() for value in values):
+                yield number, values
+    finally:
+        text.detach()
+
+
+class ImportReport:
+    """Итог загрузки: число строк, загруженные записи и ошибки по строкам"""
+
+    def __init__(self, error_limit=1000):
+        self.total = 0
+        self.imported = 0
+        self.errors = []
+        self.error_rows = 0
+        self.error_limit = error_limit
+
+    def add_error(self, row_number, message):
+        self.error_rows += 1
+        if len(self.errors) < self.error_limit:
+            self.errors.append((row_number, message))
+
+    @property
+    def errors_truncated(self):
+        return self.error_rows > len(self.errors)
+
+
+class Importer:
+    """Проверка и пакетная вставка строк файла"""
+
+    def __init__(self, spec, chunk_size=1000, error_limit=1000):
+        self.spec = spec
+        self.chunk_size = chunk_size
+        self.report = ImportReport(error_limit)
+        # Справочники загружаются один раз: название -> id
+        self.lookup_maps = {
+            dictionary: {_dictionary_key(row['name']): row['id']
+                         for row in dictionary_cache.get_active(dictionary)}
+            for _, _, dictionary in spec.lookups
+        }
+        self.seen_keys = set()
+
+    def run(self, rows):
+        header = next(rows, None)
+        positions = self.spec.header_map(header or ())
+        missing = [self.spec.labels[field] for field in self.spec.required if field not in positions]
+        if missing:
+            raise ValueError(f"В файле нет обязательных колонок: {', '.join(missing)}")
+
+        chunk = []
+        for number, values in rows:
+            self.report.total += 1
+            chunk.append((number, self._convert(positions, values)))
+            if len(chunk) >= self.chunk_size:
+                self._flush(chunk)
+                chunk = []
+        if chunk:
+            self._flush(chunk)
+
+        if self.report.imported:
+            with db.engine.begin() as connection:
+                rebuild_document_expiries(connection, self.spec.entity_type)
+        return self.report
+
+    def _convert(self, positions, values):
+        """Значения полей строки; ошибки преобразования - в ValidationResult"""
+        result = ValidationResult()
+        record = {}
+        for field, _, convert in self.spec.columns:
+            index = positions.get(field)
+            raw = values[index] if index is not None and index < len(values) else None
+            try:
+                record[field] = convert(raw)
+            except ValueError as e:
+                result.add_error(field, f"{self.spec.labels[field]}: {e}")
+                record[field] = None
+        return record, result
+
+    def _validate(self, record, result):
+        for field in self.spec.required:
+            error = Validators.validate_required(record.get(field), self.spec.labels[field])
+            if error:
+                result.add_error(field, error)
+        self.spec.validate(record, result)
+
+        for field, column, dictionary in self.spec.lookups:
+            name = record.pop(field)
+            if name is None:
+                record[column] = None
+                continue
+            record[column] = self.lookup_maps[dictionary].get(_dictionary_key(name))
+            if record[column] is None:
+                result.add_error(field, f"{self.spec.labels[field]} «{name}» нет в справочнике")
+
+    def _duplicate_keys(self, records):
+        """Ключи уникальности пачки, которые уже есть в базе (одним запросом)"""
+        if self.spec.model is Vehicle:
+            plates = {record['license_plate'] for record in records if record.get('license_plate')}
+            if not plates:
+                return set()
+            return set(db.session.execute(
+                db.select(Vehicle.license_plate).where(Vehicle.license_plate.in_(plates))).scalars())
+        passports = {(record['passport_series'], record['passport_number'])
+                     for record in records if record.get('passport_number')}
+        if not passports:
+            return set()
+        numbers = {number for _, number in passports}
+        existing = db.session.execute(
+            db.select(Employee.passport_series, Employee.passport_number)
+            .where(Employee.passport_number.in_(numbers)))
+        return {tuple(row) for row in existing} & passports
+
+    def _unique_key(self, record):
+        if self.spec.model is Vehicle:
+            return record.get('license_plate')
+        if record.get('passport_number'):
+            return record.get('passport_series'), record['passport_number']
+        return None
+
+    def _flush(self, chunk):
+        valid = []
+        for number, (record, result) in chunk:
+            self._validate(record, result)
+            valid.append((number, record, result))
+
+        existing = self._duplicate_keys([record for _, record, result in valid if not result.has_errors()])
+        mappings = []
+        for number, record, result in valid:
+            key = self._unique_key(record)
+            if key is not None and not result.has_errors():
+                if key in existing:
+                    result.add_error('key', "Такая запись уже есть в базе")
+                elif key in self.seen_keys:
+                    result.add_error('key', "Повтор строки, загруженной выше")
+            if result.has_errors():
+                self.report.add_error(number, '; '.join(result.get_errors().values()))
+                continue
+            if key is not None:
+                self.seen_keys.add(key)
+            if self.spec.model is Employee:
+                record['has_driver_license'] = bool(record.get('license_categories'))
+            mappings.append(record)
+
+        if not mappings:
+            return
+        try:
+            db.session.bulk_insert_mappings(self.spec.model, mappings)
+            db.session.commit()
+            self.report.imported += len(mappings)
+        except Exception as e:
+            db.session.rollback()
+            first, last = chunk[0][0], chunk[-1][0]
+            self.report.add_error(f'{first}-{last}', f"Пачка не записана: {e}")
+            self.report.error_rows += len(mappings) - 1
+
+
+def import_file(entity_type, stream, filename, chunk_size=1000, error_limit=1000):
+    """Загрузка файла XLSX/CSV; ValueError, если файл не подходит целиком"""
+    error = Validators.validate_file_extension(filename, IMPORT_EXTENSIONS)
+    if error:
+        raise ValueError(error)
+    importer = Importer(IMPORT_SPECS[entity_type], chunk_size, error_limit)
+    return importer.run(read_rows(stream, filename))
@@ -0,0 +1,33 @@
+from flask.json.provider import DefaultJSONProvider
+
+try:
+    import orjson
+except ImportError:  # без orjson работает стандартный json
+    orjson = None
+
+
+class FastJSONProvider(DefaultJSONProvider):
+    """JSON-ответы через orjson, если он установлен
+
+    Даты и прочие нестандартные типы сериализуются так же, как в Flask
+    (через default). Ключи не сортируются, кириллица пишется в UTF-8,
+    а не escape-последовательностями \\uXXXX - ответы вдвое короче.
+    """
+
+    sort_keys = False
+    ensure_ascii = False
+
+    _OPTIONS = orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_NON_STR_KEYS if orjson else 0
+
+    def dumps(self, obj, **kwargs):
+        if orjson is None or kwargs:
+            return super().dumps(obj, **kwargs)
+        return orjson.dumps(obj, default=self.default, option=self._OPTIONS).decode()
+
+    def response(self, *args, **kwargs):
+        # В режиме отладки - форматированный вывод стандартного провайдера
+        if orjson is None or self.compact is False or (self.compact is None and self._app.debug):
+            return super().response(*args, **kwargs)
+        obj = self._prepare_response_obj(args, kwargs)
+        return self._app.response_class(
+            orjson.dumps(obj, default=self.default, option=self._OPTIONS), mimetype=self.mimetype)
@@ -0,0 +1,170 @@
+import csv
+import io
+import re
+from datetime import datetime, date
+from xml.sax.saxutils import escape, quoteattr
+from utils.zip_stream import zip_stream
+
+# Потоковая выгрузка таблиц в CSV и XLSX. Строки берутся из итератора
+# и сразу уходят клиенту порциями: ни файл, ни список строк в памяти
+# не собираются, первые байты отправляются до чтения последней строки.
+
+_ROWS_PER_CHUNK = 500
+_EXCEL_EPOCH = date(1899, 12, 30)
+# Управляющие символы, недопустимые в XML
+_ILLEGAL_XML = re.compile(r'[\x00-\x08\x0b\x0c\x0e-\x1f]')
+
+
+def _csv_value(value):
+    if isinstance(value, datetime):
+        return value.strftime('%d.%m.%Y %H:%M')
+    if isinstance(value, date):
+        return value.strftime('%d.%m.%Y')
+    if isinstance(value, bool):
+        return 'Да' if value else 'Нет'
+    return '' if value is None else value
+
+
+def csv_stream(header, rows):
+    """CSV для Excel: UTF-8 с BOM, разделитель «;», даты ДД.ММ.ГГГГ"""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer, delimiter=';')
+    buffer.write('\ufeff')
+    writer.writerow(header)
+    count = 0
+    for row in rows:
+        writer.writerow([_csv_value(value) for value in row])
+        count += 1
+        if count % _ROWS_PER_CHUNK == 0:
+            yield buffer.getvalue().encode('utf-8')
+            buffer.seek(0)
+            buffer.truncate()
+    yield buffer.getvalue().encode('utf-8')
+
+
+def _column_letter(index):
+    letters = ''
+    index += 1
+    while index:
+        index, remainder = divmod(index - 1, 26)
+        letters = chr(65 + remainder) + letters
+    return letters
+
+
+# Номера оформления из styles.xml: 1 - дата, 2 - дата и время, 3 - заголовок
+_DATE_STYLE, _DATETIME_STYLE, _HEADER_STYLE = 1, 2, 3
+
+
+def _xlsx_cell(reference, value, style=0):
+    style_attr = f' s="{style}"' if style else ''
+    if value is None or value == '':
+        return ''
+    if isinstance(value, bool):
+        return f'<c r="{reference}" t="b"{style_attr}><v>{int(value)}</v></c>'
+    if isinstance(value, datetime):
+        delta = value - datetime(1899, 12, 30)
+        serial = delta.days + delta.seconds / 86400
+        return f'<c r="{reference}" s="{_DATETIME_STYLE}"><v>{serial}</v></c>'
+    if isinstance(value, date):
+        return f'<c r="{reference}" s="{_DATE_STYLE}"><v>{(value - _EXCEL_EPOCH).days}</v></c>'
+    if isinstance(value, (int, float)):
+        return f'<c r="{reference}"{style_attr}><v>{value}</v></c>'
+    text = escape(_ILLEGAL_XML.sub('', str(value)))
+    return f'<c r="{reference}" t="inlineStr"{style_attr}><is><t xml:space="preserve">{text}</t></is></c>'
+
+
+def _sheet_xml(header, rows, widths):
+    columns = [_column_letter(index) for index in range(len(header))]
+    cols = ''.join(
+        f'<col min="{index}" max="{index}" width="{width}" customWidth="1"/>'
+        for index, width in enumerate(widths, start=1) if width)
+    yield ('<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+           '<worksheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main">'
+           '<sheetViews><sheetView workbookViewId="0">'
+           '<pane ySplit="1" topLeftCell="A2" activePane="bottomLeft" state="frozen"/>'
+           '</sheetView></sheetViews>'
+           + (f'<cols>{cols}</cols>' if cols else '') +
+           '<sheetData>').encode('utf-8')
+
+    cells = ''.join(_xlsx_cell(f'{column}1', title, _HEADER_STYLE) for column, title in zip(columns, header))
+    parts = [f'<row r="1">{cells}</row>']
+    for number, row in enumerate(rows, start=2):
+        cells = ''.join(_xlsx_cell(f'{column}{number}', value) for column, value in zip(columns, row))
+        parts.append(f'<row r="{number}">{cells}</row>')
+        if len(parts) >= _ROWS_PER_CHUNK:
+            yield ''.join(parts).encode('utf-8')
+            parts = []
+    parts.append('</sheetData></worksheet>')
+    yield ''.join(parts).encode('utf-8')
+
+
+_CONTENT_TYPES = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+    '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+    '<Default Extension="xml" ContentType="application/xml"/>'
+    '<Override PartName="/xl/workbook.xml" '
+    'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet.main+xml"/>'
+    '<Override PartName="/xl/worksheets/sheet1.xml" '
+    'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.worksheet+xml"/>'
+    '<Override PartName="/xl/styles.xml" '
+    'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.styles+xml"/>'
+    '</Types>')
+
+_ROOT_RELS = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+    '<Relationship Id="rId1" Target="xl/workbook.xml" '
+    'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument"/>'
+    '</Relationships>')
+
+_WORKBOOK_RELS = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+    '<Relationship Id="rId1" Target="worksheets/sheet1.xml" '
+    'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/worksheet"/>'
+    '<Relationship Id="rId2" Target="styles.xml" '
+    'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/styles"/>'
+    '</Relationships>')
+
+_STYLES = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    '<styleSheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main">'
+    '<numFmts count="1"><numFmt numFmtId="164" formatCode="dd.mm.yyyy hh:mm"/></numFmts>'
+    '<fonts count="2"><font><sz val="11"/><name val="Calibri"/></font>'
+    '<font><b/><sz val="11"/><name val="Calibri"/></font></fonts>'
+    '<fills count="2"><fill><patternFill patternType="none"/></fill>'
+    '<fill><patternFill patternType="gray125"/></fill></fills>'
+    '<borders count="1"><border><left/><right/><top/><bottom/><diagonal/></border></borders>'
+    '<cellStyleXfs count="1"><xf numFmtId="0" fontId="0" fillId="0" borderId="0"/></cellStyleXfs>'
+    '<cellXfs count="4">'
+    '<xf numFmtId="0" fontId="0" fillId="0" borderId="0" xfId="0"/>'
+    '<xf numFmtId="14" fontId="0" fillId="0" borderId="0" xfId="0" applyNumberFormat="1"/>'
+    '<xf numFmtId="164" fontId="0" fillId="0" borderId="0" xfId="0" applyNumberFormat="1"/>'
+    '<xf numFmtId="0" fontId="1" fillId="0" borderId="0" xfId="0" applyFont="1"/>'
+    '</cellXfs>'
+    '<cellStyles count="1"><cellStyle name="Normal" xfId="0" builtinId="0"/></cellStyles>'
+    '</styleSheet>')
+
+
+def xlsx_stream(title, header, rows, widths=()):
+    """Книга XLSX из одного листа, которая пишется потоком через zip_stream
+
+    Лист формируется напрямую в разметке SpreadsheetML: write_only-книга
+    openpyxl отдает файл только после save(), то есть после последней строки.
+    Строки пишутся inline-строками, даты - числами с форматом даты.
+    """
+    workbook = (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+        '<workbook xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main" '
+        'xmlns:r="http://schemas.openxmlformats.org/officeDocument/2006/relationships">'
+        f'<sheets><sheet name={quoteattr(title[:31])} sheetId="1" r:id="rId1"/></sheets></workbook>')
+    entries = (
+        ('[Content_Types].xml', _CONTENT_TYPES.encode('utf-8')),
+        ('_rels/.rels', _ROOT_RELS.encode('utf-8')),
+        ('xl/workbook.xml', workbook.encode('utf-8')),
+        ('xl/_rels/workbook.xml.rels', _WORKBOOK_RELS.encode('utf-8')),
+        ('xl/styles.xml', _STYLES.encode('utf-8')),
+        ('xl/worksheets/sheet1.xml', _sheet_xml(header, rows, widths)),
+    )
+    return zip_stream(entries)
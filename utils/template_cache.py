@@ -0,0 +1,112 @@
+import copy
+import hashlib
+import io
+import os
+import threading
+from collections import OrderedDict
+
+
+class CachedTemplate:
+    """Разобранный шаблон и заранее найденные места тегов"""
+    __slots__ = ('source', 'tag_locations')
+
+    def __init__(self, source, tag_locations):
+        self.source = source
+        self.tag_locations = tag_locations
+
+
+class TemplateCache:
+    """LRU-кэш разобранных шаблонов документов
+
+    Файл опознается по пути, mtime и размеру, содержимое - по sha1, поэтому
+    одинаковые шаблоны, загруженные под разными именами, разбираются один раз.
+    Каждый вызов получает собственную копию: документ Word клонируется
+    deepcopy из разобранного дерева. Для Excel хранится разметка листа
+    (SheetLayout), по которой документ пишется потоково; она не меняется
+    при записи и отдается без копирования.
+    """
+
+    def __init__(self, max_size=16):
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self._digests = OrderedDict()
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def init_app(self, app):
+        self.max_size = app.config.get('TEMPLATE_CACHE_SIZE', self.max_size)
+
+    def stats(self):
+        """Счетчики попаданий и промахов"""
+        with self._lock:
+            return {'hits': self.hits, 'misses': self.misses,
+                    'size': len(self._entries), 'max_size': self.max_size}
+
+    def clear(self):
+        with self._lock:
+            self._digests.clear()
+            self._entries.clear()
+
+    def _digest(self, path):
+        stat = os.stat(path)
+        file_key = (os.path.abspath(path), stat.st_mtime_ns, stat.st_size)
+        with self._lock:
+            digest = self._digests.get(file_key)
+        if digest:
+            return digest, None
+
+        with open(path, 'rb') as f:
+            content = f.read()
+        digest = hashlib.sha1(content).hexdigest()
+        with self._lock:
+            self._digests[file_key] = digest
+            while len(self._digests) > self.max_size * 4:
+                self._digests.popitem(last=False)
+        return digest, content
+
+    def _get(self, kind, path, build):
+        digest, content = self._digest(path)
+        key = (kind, digest)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry
+            self.misses += 1
+
+        if content is None:
+            with open(path, 'rb') as f:
+                content = f.read()
+        entry = build(content)
+        with self._lock:
+            self._entries[key] = entry
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+        return entry
+
+    def get_document(self, path):
+        """Копия документа Word и места тегов в ней"""
+        entry = self._get('docx', path, self._build_document)
+        return copy.deepcopy(entry.source), entry.tag_locations
+
+    def get_workbook_layout(self, path, row_tags=()):
+        """Разметка активного листа книги Excel; row_tags - теги строки таблицы"""
+        from utils.xlsx_template import SheetLayout
+        row_tags = frozenset(row_tags)
+        return self._get(('xlsx', row_tags), path, lambda content: SheetLayout(content, row_tags))
+
+    @staticmethod
+    def _build_document(content):
+        from docx import Document
+        from utils.docx_tags import find_tag_locations
+        document = Document(io.BytesIO(content))
+        # Исходный документ не читается: python-docx запоминает дочерние
+        # элементы (тело документа), и после deepcopy они оказались бы
+        # оторваны от копии дерева. Теги ищутся в отдельной копии.
+        probe = copy.deepcopy(document)
+        return CachedTemplate(document, find_tag_locations(probe))
+
+
+template_cache = TemplateCache()
@@ -2,6 +2,9 @@ import re
 from datetime import datetime, date
 from urllib.parse import urlparse
 
+# Латинские буквы, похожие на кириллические, в госномерах
+_PLATE_LETTERS = str.maketrans('ABEKMHOPCTYX', 'АВЕКМНОРСТУХ')
+
 class Validators:
     
     @staticmethod
@@ -53,6 +56,15 @@ class Validators:
                 return "Номер паспорта должен содержать 6 цифр"
         return None
     
+    @staticmethod
+    def normalize_license_plate(plate):
+        """Госномер в виде для хранения: без пробелов, заглавными буквами,
+        латинские буквы, похожие на кириллические, заменены кириллицей"""
+        if plate is None:
+            return None
+        plate = re.sub(r'\s', '', str(plate)).upper().translate(_PLATE_LETTERS)
+        return plate or None
+
     @staticmethod
     def validate_license_plate(plate):
         """Валидация государственного номера"""
@@ -0,0 +1,152 @@
+import io
+from copy import copy
+from openpyxl import Workbook, load_workbook
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.worksheet.cell_range import CellRange
+from utils.docx_tags import TAG_MARK, TAG_PATTERN
+
+
+def _cell_style(cell):
+    return (copy(cell.font), copy(cell.fill), copy(cell.border),
+            copy(cell.alignment), cell.number_format, copy(cell.protection))
+
+
+class SheetLayout:
+    """Разобранный активный лист шаблона Excel для потоковой записи
+
+    Хранит значения и оформление ячеек, ширину колонок, высоту строк и
+    объединения. Строка, в которой есть один из тегов row_tags, считается
+    строкой таблицы и повторяется для каждой записи.
+    """
+
+    def __init__(self, content, row_tags=()):
+        ws = load_workbook(io.BytesIO(content)).active
+        self.title = ws.title
+        self.freeze_panes = ws.freeze_panes
+        self.column_widths = {
+            letter: dimension.width
+            for letter, dimension in ws.column_dimensions.items()
+            if dimension.width
+        }
+        self.max_column = ws.max_column
+
+        self.rows = []
+        self.table_row = None
+        for row in ws.iter_rows():
+            row_index = row[0].row
+            cells = tuple(
+                (cell.column, cell.value, _cell_style(cell) if cell.has_style else None)
+                for cell in row
+                if cell.value is not None or cell.has_style
+            )
+            height = ws.row_dimensions[row_index].height
+            if not cells and not height:
+                continue
+            self.rows.append((row_index, height, cells))
+
+            if self.table_row is None and row_tags:
+                for _, value, _ in cells:
+                    if isinstance(value, str) and any(
+                            match.group(1).strip() in row_tags for match in TAG_PATTERN.finditer(value)):
+                        self.table_row = row_index
+                        break
+
+        self.merged = tuple(
+            (merged.min_col, merged.min_row, merged.max_col, merged.max_row)
+            for merged in ws.merged_cells.ranges
+        )
+
+
+def _render_value(value, data):
+    if not isinstance(value, str) or TAG_MARK not in value:
+        return value
+    # Ячейка из одного тега получает значение как есть (числа и даты не превращаются в текст)
+    match = TAG_PATTERN.fullmatch(value)
+    if match and match.group(1).strip() in data:
+        return data[match.group(1).strip()]
+
+    def substitute(match):
+        key = match.group(1).strip()
+        return str(data[key]) if key in data else match.group(0)
+    return TAG_PATTERN.sub(substitute, value)
+
+
+def _style_arrays(ws, cells):
+    """Оформление ячеек строки, зарегистрированное в книге один раз"""
+    arrays = []
+    for _, _, style in cells:
+        if style is None:
+            arrays.append(None)
+            continue
+        prototype = WriteOnlyCell(ws)
+        (prototype.font, prototype.fill, prototype.border,
+         prototype.alignment, prototype.number_format, prototype.protection) = style
+        arrays.append(prototype._style)
+    return arrays
+
+
+def _render_row(ws, cells, styles, max_column, data):
+    row = [None] * max_column
+    for (column, value, _), style in zip(cells, styles):
+        cell = WriteOnlyCell(ws, _render_value(value, data))
+        if style is not None:
+            cell._style = copy(style)
+        row[column - 1] = cell
+    return row
+
+
+def write_sheet(layout, output, values, table_rows=()):
+    """Потоковая запись листа по шаблону
+
+    values заполняет теги вне таблицы, table_rows - итератор словарей для
+    строки таблицы. Строки пишутся сразу во временный файл openpyxl,
+    поэтому память не растет с числом строк таблицы. Возвращает число
+    записанных строк таблицы.
+    """
+    wb = Workbook(write_only=True)
+    ws = wb.create_sheet(layout.title)
+    for letter, width in layout.column_widths.items():
+        ws.column_dimensions[letter].width = width
+    if layout.freeze_panes:
+        ws.freeze_panes = layout.freeze_panes
+
+    next_row = 1
+    shift = 0
+    table_count = 0
+    for row_index, height, cells in layout.rows:
+        while next_row < row_index + shift:
+            ws.append([])
+            next_row += 1
+
+        styles = _style_arrays(ws, cells)
+        if row_index != layout.table_row:
+            if height:
+                ws.row_dimensions[next_row].height = height
+            ws.append(_render_row(ws, cells, styles, layout.max_column, values))
+            next_row += 1
+            continue
+
+        for item in table_rows:
+            if height:
+                ws.row_dimensions[next_row].height = height
+            ws.append(_render_row(ws, cells, styles, layout.max_column, dict(values, **item)))
+            # Строка уже записана в поток, ее размеры больше не нужны
+            ws.row_dimensions.pop(next_row, None)
+            next_row += 1
+            table_count += 1
+        shift += table_count - 1
+
+    # Объединения ниже таблицы сдвигаются, объединения строки таблицы повторяются
+    for min_col, min_row, max_col, max_row in layout.merged:
+        if layout.table_row is None or max_row < layout.table_row:
+            ws.merged_cells.add(CellRange(min_col=min_col, min_row=min_row, max_col=max_col, max_row=max_row))
+        elif min_row > layout.table_row:
+            ws.merged_cells.add(CellRange(min_col=min_col, min_row=min_row + shift,
+                                          max_col=max_col, max_row=max_row + shift))
+        elif min_row == max_row == layout.table_row:
+            for offset in range(table_count):
+                ws.merged_cells.add(CellRange(min_col=min_col, min_row=min_row + offset,
+                                              max_col=max_col, max_row=max_row + offset))
+
+    wb.save(output)
+    return table_count
@@ -0,0 +1,44 @@
+import io
+import zipfile
+
+
+class _ChunkWriter(io.RawIOBase):
+    """Приемник данных zipfile без seek: накопленные байты забираются по частям"""
+
+    def __init__(self):
+        self._chunks = []
+
+    def writable(self):
+        return True
+
+    def write(self, data):
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def take(self):
+        data = b''.join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+def zip_stream(entries, compression=zipfile.ZIP_DEFLATED):
+    """Потоковая выдача ZIP-архива из пар (имя файла, содержимое)
+
+    Архив не собирается в памяти целиком: каждый файл отдается клиенту,
+    как только он сформирован. Содержимое - байты или итератор частей
+    байтов; такой файл сжимается и отдается по мере поступления частей.
+    """
+    writer = _ChunkWriter()
+    with zipfile.ZipFile(writer, 'w', compression=compression) as archive:
+        for name, content in entries:
+            if isinstance(content, (bytes, bytearray)):
+                archive.writestr(name, content)
+            else:
+                with archive.open(name, 'w') as entry:
+                    for part in content:
+                        entry.write(part)
+                        data = writer.take()
+                        if data:
+                            yield data
+            yield writer.take()
+    yield writer.take()
@@ -0,0 +1,5 @@
+from app import create_app
+
+# WSGI-приложение для gunicorn и waitress:
+# gunicorn -c gunicorn.conf.py wsgi:app
+app = create_app()